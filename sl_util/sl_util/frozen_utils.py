@@ -0,0 +1,77 @@
+import copy
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f'{type(self).__name__} is read-only')
+
+
+class FrozenDict(dict):
+    """
+    A dict which cannot be modified once built. It is still a dict for every reader, and its copies are new dicts
+    that may be modified
+    """
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+class FrozenList(list):
+    """
+    A list which cannot be modified once built. It is still a list for every reader, and its copies are new lists
+    that may be modified
+    """
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = append = clear = extend = insert = pop = remove = reverse = \
+        sort = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(list(self), memo)
+
+    def __reduce__(self):
+        return FrozenList, (list(self),)
+
+
+def freeze(value):
+    """
+    :return: The value with every dict and list in it replaced by a read-only one, so it can be shared safely
+    """
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """
+    :return: The value with every read-only dict and list in it replaced by a plain one, so it can be handed out to
+    code that may modify it. The dicts and lists with no read-only one in them are not copied
+    """
+    if isinstance(value, dict):
+        thawed = value if type(value) is dict else dict(value)
+        for key, item in value.items():
+            thawed_item = thaw(item)
+            if thawed_item is not item:
+                thawed = dict(thawed) if thawed is value else thawed
+                thawed[key] = thawed_item
+        return thawed
+    if isinstance(value, list):
+        thawed = value if type(value) is list else list(value)
+        for index, item in enumerate(value):
+            thawed_item = thaw(item)
+            if thawed_item is not item:
+                thawed = list(thawed) if thawed is value else thawed
+                thawed[index] = thawed_item
+        return thawed
+    return value
@@ -0,0 +1,80 @@
+import logging
+from typing import Dict
+
+import jmespath
+from jmespath.exceptions import JMESPathError
+from jmespath.parser import ParsedResult
+
+logger = logging.getLogger(__name__)
+
+# Mapping keys whose values are JMESPath expressions, either a single one, a list of them or a $searchParams.searchPath
+JMESPATH_MAPPING_KEYS = ['$root', '$path', '$resolved', '$findFirst', '$ref']
+
+
+class JmespathExpressionCache:
+    """
+    Unbounded table of compiled JMESPath expressions, meant to live as long as a single mapping is applied.
+    Unlike the jmespath module cache, which keeps up to 128 expressions and evicts them at random, every expression
+    is parsed only once, no matter how many expressions the mapping has or how many objects they are evaluated on.
+    """
+
+    def __init__(self, options: jmespath.Options = None, expressions: Dict[str, ParsedResult] = None):
+        self.options = options
+        # Expressions already compiled elsewhere are copied, so the cache they come from is never modified
+        self.expressions: Dict[str, ParsedResult] = dict(expressions) if expressions else {}
+        self.hits = 0
+        self.misses = 0
+
+    def compile_mapping(self, mapping):
+        """
+        Compiles in advance all the expressions in the mapping. Invalid expressions are left to fail when used.
+        """
+        for expression in _get_mapping_expressions(mapping):
+            if expression not in self.expressions:
+                try:
+                    self.expressions[expression] = jmespath.compile(expression)
+                except JMESPathError as e:
+                    logger.debug(f'Unable to compile the expression {expression}: {e}')
+
+    def compile(self, expression: str) -> ParsedResult:
+        if compiled_expression := self.expressions.get(expression):
+            self.hits += 1
+            return compiled_expression
+
+        self.misses += 1
+        compiled_expression = jmespath.compile(expression)
+        self.expressions[expression] = compiled_expression
+        return compiled_expression
+
+    def search(self, expression: str, data):
+        return self.compile(expression).search(data, options=self.options)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_metrics(self) -> dict:
+        return {'expressions': len(self.expressions), 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hit_rate, 4)}
+
+
+def _get_mapping_expressions(node):
+    if isinstance(node, list):
+        for element in node:
+            yield from _get_mapping_expressions(element)
+
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key in JMESPATH_MAPPING_KEYS:
+                yield from _get_expressions(value)
+            yield from _get_mapping_expressions(value)
+
+
+def _get_expressions(value):
+    if isinstance(value, dict) and isinstance(value.get('$searchParams'), dict):
+        value = value['$searchParams'].get('searchPath')
+
+    for expression in value if isinstance(value, list) else [value]:
+        if isinstance(expression, str):
+            yield expression
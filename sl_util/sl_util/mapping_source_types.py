@@ -0,0 +1,77 @@
+import time
+from typing import Collection, Iterable, Optional
+
+
+class MappingSourceTypes:
+    """
+    Resource types a mapping $source can find, either by their whole name or by a prefix of it.
+    A $source whose types cannot be known from the mapping itself is represented by None.
+    """
+
+    def __init__(self, types: Iterable[str] = (), prefixes: Iterable[str] = ()):
+        self.types = set(types)
+        self.prefixes = set(prefixes)
+
+    def union(self, other: 'MappingSourceTypes') -> 'MappingSourceTypes':
+        return MappingSourceTypes(self.types | other.types, self.prefixes | other.prefixes)
+
+    def is_found_in(self, resource_types: Collection[str]) -> bool:
+        if any(resource_type in resource_types for resource_type in self.types):
+            return True
+
+        return any(resource_type.startswith(prefix) for prefix in self.prefixes for resource_type in resource_types)
+
+
+def union_mapping_source_types(all_source_types: Iterable[Optional[MappingSourceTypes]]) \
+        -> Optional[MappingSourceTypes]:
+    """
+    :return: The types any of the given sources can find, or None if the types of any of them are unknown
+    """
+    union = MappingSourceTypes()
+    for source_types in all_source_types:
+        if source_types is None:
+            return None
+        union = union.union(source_types)
+    return union
+
+
+class MappingSkipMetrics:
+    """
+    Instrumentation of the mappings skipped because their resource types are not in the source. The time saved is
+    estimated as the average time of the mappings run that did not find anything, which are the ones skipped mappings
+    would have been otherwise.
+    """
+
+    def __init__(self):
+        self.run = 0
+        self.skipped = 0
+        self.empty = 0
+        self.run_time = 0.0
+        self.empty_run_time = 0.0
+        self.__start = None
+
+    def start(self):
+        self.__start = time.perf_counter()
+
+    def stop(self, results: int):
+        elapsed = time.perf_counter() - self.__start
+        self.run += 1
+        self.run_time += elapsed
+        if not results:
+            self.empty += 1
+            self.empty_run_time += elapsed
+
+    def skip(self):
+        self.skipped += 1
+
+    @property
+    def estimated_time_saved(self) -> float:
+        if self.empty:
+            return self.skipped * self.empty_run_time / self.empty
+        if self.run:
+            return self.skipped * self.run_time / self.run
+        return 0.0
+
+    def get_metrics(self) -> dict:
+        return {'run': self.run, 'skipped': self.skipped, 'run_ms': round(self.run_time * 1000, 3),
+                'estimated_saved_ms': round(self.estimated_time_saved * 1000, 3)}
@@ -0,0 +1,83 @@
+from typing import Iterable, List
+
+
+def merge_all(documents: Iterable):
+    """
+    Merges all the documents in a single pass with the same result as folding them with deepmerge's always_merger:
+    dicts are merged recursively into the first one, lists and sets are concatenated and any other value, or a value
+    whose type conflicts with the accumulated one, overrides what was merged before it.
+    Unlike the fold, every value is only visited once, so the cost is linear in the total size of the documents.
+    """
+    return __merge_values([None, *documents])
+
+
+def merge_into(accumulated, document):
+    """
+    Merges one more document into the accumulated one with the same result as merge_all([accumulated, document]), but
+    extending the lists of the accumulated document in place instead of concatenating them into new lists, so folding
+    many documents one at a time is linear in their total size. The values of the document are moved into the
+    accumulated one, so it must not be used afterwards
+    """
+    if isinstance(accumulated, dict) and isinstance(document, dict):
+        for key, value in document.items():
+            accumulated[key] = merge_into(accumulated[key], value) if key in accumulated else value
+        return accumulated
+
+    if type(accumulated) is list and isinstance(document, list):
+        accumulated.extend(document)
+        return accumulated
+
+    return merge_all([accumulated, document])
+
+
+def __merge_values(values: List):
+    run = __get_last_run(values)
+
+    if len(run) == 1:
+        return run[0]
+
+    if isinstance(run[0], dict):
+        return __merge_dicts(run)
+
+    if isinstance(run[0], list):
+        return [item for value in run for item in value]
+
+    return set().union(*run)
+
+
+def __get_last_run(values: List) -> List:
+    """
+    Returns the trailing values that are merged together. Any value that is not a collection, or whose type conflicts
+    with the accumulated one, discards everything merged before it.
+    """
+    start = 0
+    accumulated_type = type(values[0])
+    for index in range(1, len(values)):
+        value = values[index]
+        if not __are_mergeable(accumulated_type, type(value)):
+            start = index
+            accumulated_type = type(value)
+        elif isinstance(value, list):
+            accumulated_type = list
+
+    return values[start:]
+
+
+def __are_mergeable(accumulated_type: type, value_type: type) -> bool:
+    if not (issubclass(accumulated_type, value_type) or issubclass(value_type, accumulated_type)):
+        return False
+
+    return issubclass(value_type, (dict, list, set))
+
+
+def __merge_dicts(dicts: List[dict]) -> dict:
+    values_by_key = {key: [value] for key, value in dicts[0].items()}
+    for other in dicts[1:]:
+        for key, value in other.items():
+            values_by_key.setdefault(key, []).append(value)
+
+    base = dicts[0]
+    for key, values in values_by_key.items():
+        base[key] = __merge_values(values)
+
+    return base
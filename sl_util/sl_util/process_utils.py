@@ -0,0 +1,56 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROCESS_POOL_MAX_WORKERS = os.cpu_count() or 1
+# The requests are processed in the worker threads of the API, and forking a multithreaded process may copy locks
+# held by other threads into the children, so the workers are started from a clean process instead
+PROCESS_POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Returns the process pool shared by every request, which is created the first time it is needed, so its worker
+    processes are only started once for the whole life of the application
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            logger.debug(f'Starting a pool of {PROCESS_POOL_MAX_WORKERS} worker processes')
+            _process_pool = ProcessPoolExecutor(max_workers=PROCESS_POOL_MAX_WORKERS,
+                                                mp_context=multiprocessing.get_context(PROCESS_POOL_START_METHOD))
+        return _process_pool
+
+
+def shutdown_process_pool(pool: ProcessPoolExecutor = None):
+    """
+    Shuts the shared process pool down, or only the given one if it is still the shared one, so a new pool is created
+    the next time it is needed
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None and pool in (None, _process_pool):
+            _process_pool.shutdown(wait=False)
+            _process_pool = None
+
+
+def submit_all(function: Callable, arguments: List) -> List[Future]:
+    """
+    Submits a call to the function for each argument to the shared process pool. A pool broken by the abrupt end
+    of one of its workers is replaced by a new one for the next calls
+    """
+    pool = get_process_pool()
+    try:
+        return [pool.submit(function, argument) for argument in arguments]
+    except BrokenProcessPool:
+        shutdown_process_pool(pool)
+        raise
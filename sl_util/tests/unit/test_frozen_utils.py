@@ -0,0 +1,90 @@
+import copy
+import json
+import pickle
+
+import pytest
+
+from sl_util.sl_util.frozen_utils import freeze, thaw, FrozenDict, FrozenList
+
+VALUE = {'components': [{'name': {'$path': '_key'}, 'tags': ['a', 'b']}], 'lookup': {'VPC': 'vpc'}}
+
+
+class TestFrozenUtils:
+
+    def test_frozen_value_is_equal(self):
+        # GIVEN a value with nested dicts and lists
+        # WHEN it is frozen
+        frozen = freeze(VALUE)
+
+        # THEN it is still equal to the value, as dicts and lists
+        assert frozen == VALUE
+        assert isinstance(frozen, dict) and isinstance(frozen['components'], list)
+        assert json.dumps(frozen) == json.dumps(VALUE)
+
+    @pytest.mark.parametrize('modify', [
+        pytest.param(lambda value: value.update({'other': 1}), id='update'),
+        pytest.param(lambda value: value.setdefault('other', 1), id='setdefault'),
+        pytest.param(lambda value: value.pop('lookup'), id='pop'),
+        pytest.param(lambda value: value['lookup'].__setitem__('VPC', 'other'), id='nested set item'),
+        pytest.param(lambda value: value['components'].append({}), id='append'),
+        pytest.param(lambda value: value['components'][0]['tags'].sort(), id='nested sort'),
+        pytest.param(lambda value: value['components'].__delitem__(0), id='del item')])
+    def test_frozen_value_cannot_be_modified(self, modify):
+        # GIVEN a frozen value
+        frozen = freeze(VALUE)
+
+        # WHEN it is modified
+        # THEN a TypeError is raised
+        with pytest.raises(TypeError):
+            modify(frozen)
+
+        # AND the value is not modified
+        assert frozen == VALUE
+
+    @pytest.mark.parametrize('copy_function', [
+        pytest.param(copy.copy, id='copy'),
+        pytest.param(copy.deepcopy, id='deepcopy'),
+        pytest.param(lambda value: value.copy(), id='copy method')])
+    def test_copies_may_be_modified(self, copy_function):
+        # GIVEN a frozen value
+        frozen = freeze(VALUE)
+
+        # WHEN it is copied
+        copied = copy_function(frozen)
+
+        # THEN the copy may be modified
+        copied['other'] = 1
+        assert type(copied) is dict
+
+    def test_frozen_value_is_pickled_frozen(self):
+        # GIVEN a frozen value
+        # WHEN it is pickled and unpickled
+        unpickled = pickle.loads(pickle.dumps(freeze(VALUE)))
+
+        # THEN it is the same frozen value
+        assert unpickled == VALUE
+        assert isinstance(unpickled, FrozenDict) and isinstance(unpickled['components'], FrozenList)
+
+    def test_thawed_value_is_plain(self):
+        # GIVEN a plain value holding a frozen one
+        value = {'mapping': freeze(VALUE), 'source': {'Type': 'AWS::EC2::VPC'}}
+
+        # WHEN it is thawed
+        thawed = thaw(value)
+
+        # THEN it is still equal to the value
+        assert thawed == value
+        # AND every dict and list in it is a plain one
+        assert type(thawed['mapping']) is dict and type(thawed['mapping']['components']) is list
+        assert type(thawed['mapping']['components'][0]['tags']) is list
+        # AND neither the value nor the dicts with no frozen one in them are copied
+        assert type(value['mapping']) is FrozenDict
+        assert thawed['source'] is value['source']
+
+    def test_value_without_frozen_ones_is_not_copied(self):
+        # GIVEN a value with no frozen dict or list in it
+        value = copy.deepcopy(VALUE)
+
+        # WHEN it is thawed
+        # THEN the same value is returned
+        assert thaw(value) is value
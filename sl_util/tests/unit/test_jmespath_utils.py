@@ -0,0 +1,93 @@
+from unittest.mock import patch
+
+import jmespath
+import pytest
+
+from sl_util.sl_util.jmespath_utils import JmespathExpressionCache
+
+
+class TestJmespathExpressionCache:
+
+    def test_compile_mapping(self):
+        # GIVEN a mapping with expressions in every supported key
+        mapping = {
+            'components': [
+                {'$source': {'$root': "Resources|squash(@)[?Type=='AWS::EC2::VPC']"},
+                 'name': {'$path': '_key'},
+                 'parent': {'$findFirst': ['Properties.VpcId', 'Properties.SubnetId']},
+                 'tags': [{'$path': {'$searchParams': {'searchPath': 'Properties.Tags', 'defaultValue': []}}}]},
+                {'$source': {'$root': 'Resources'},
+                 'parent': {'$search': {'$type': 'vpc', '$ref': 'Properties.VpcId', '$path': '_key'}},
+                 'name': {'$format': '{_key}'}}
+            ]
+        }
+
+        # WHEN it is compiled
+        cache = JmespathExpressionCache()
+        cache.compile_mapping(mapping)
+
+        # THEN all the expressions are compiled
+        assert set(cache.expressions) == {
+            "Resources|squash(@)[?Type=='AWS::EC2::VPC']", '_key', 'Properties.VpcId', 'Properties.SubnetId',
+            'Properties.Tags', 'Resources'}
+
+        # AND no lookups are counted yet
+        assert cache.get_metrics() == {'expressions': 6, 'hits': 0, 'misses': 0, 'hit_rate': 0.0}
+
+    def test_precompiled_expressions(self):
+        # GIVEN the expressions compiled by another cache
+        compiled_cache = JmespathExpressionCache()
+        compiled_cache.compile_mapping({'name': {'$path': '_key'}})
+
+        # WHEN a cache is created from them and searches a new expression
+        cache = JmespathExpressionCache(expressions=compiled_cache.expressions)
+        cache.search('_key', {'_key': 'vpc'})
+        cache.search('Type', {'Type': 'AWS::EC2::VPC'})
+
+        # THEN the precompiled expression is not compiled again
+        assert cache.get_metrics() == {'expressions': 2, 'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+        # AND the cache they come from is not modified
+        assert set(compiled_cache.expressions) == {'_key'}
+
+    def test_invalid_expressions_fail_when_used(self):
+        # GIVEN a mapping with an invalid expression
+        cache = JmespathExpressionCache()
+
+        # WHEN it is compiled
+        cache.compile_mapping({'$path': 'Properties.['})
+
+        # THEN the expression is not compiled
+        assert not cache.expressions
+
+        # AND the error is raised when it is used
+        with pytest.raises(jmespath.exceptions.ParseError):
+            cache.search('Properties.[', {})
+
+    def test_expressions_are_parsed_once(self):
+        # GIVEN an expression cache with a precompiled expression
+        cache = JmespathExpressionCache()
+        cache.compile_mapping({'$path': 'a.b'})
+
+        # WHEN the precompiled and a new expressions are searched many times
+        with patch('jmespath.compile', wraps=jmespath.compile) as compile_mock:
+            for value in range(10):
+                assert cache.search('a.b', {'a': {'b': value}}) == value
+                assert cache.search('a.c', {'a': {'c': value}}) == value
+
+        # THEN only the new expression is parsed, and just once
+        compile_mock.assert_called_once_with('a.c')
+        assert cache.get_metrics() == {'expressions': 2, 'hits': 19, 'misses': 1, 'hit_rate': 0.95}
+
+    def test_search_with_options(self):
+        # GIVEN an expression cache with custom functions
+        class CustomFunctions(jmespath.functions.Functions):
+            @jmespath.functions.signature({'types': ['string']})
+            def _func_upper(self, string):
+                return string.upper()
+
+        cache = JmespathExpressionCache(jmespath.Options(custom_functions=CustomFunctions()))
+
+        # WHEN a custom function is searched
+        # THEN it is used
+        assert cache.search('upper(name)', {'name': 'vpc'}) == 'VPC'
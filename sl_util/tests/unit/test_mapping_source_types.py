@@ -0,0 +1,54 @@
+import pytest
+
+from sl_util.sl_util.mapping_source_types import MappingSourceTypes, union_mapping_source_types, MappingSkipMetrics
+
+RESOURCE_TYPES = {'aws_vpc': 1, 'aws_subnet': 2}
+
+
+class TestMappingSourceTypes:
+
+    @pytest.mark.parametrize('source_types, expected', [
+        pytest.param(MappingSourceTypes(types=['aws_vpc']), True, id='by type'),
+        pytest.param(MappingSourceTypes(types=['aws_lb', 'aws_subnet']), True, id='by any of the types'),
+        pytest.param(MappingSourceTypes(prefixes=['aws_sub']), True, id='by prefix'),
+        pytest.param(MappingSourceTypes(types=['aws_lb'], prefixes=['aws_s3']), False, id='not found'),
+        pytest.param(MappingSourceTypes(), False, id='no types')])
+    def test_is_found_in(self, source_types, expected):
+        # GIVEN the types a mapping source can find
+
+        # WHEN they are looked up in the resource types of a source
+        # THEN they are found if any type or prefix matches
+        assert source_types.is_found_in(RESOURCE_TYPES) == expected
+
+    def test_union(self):
+        # GIVEN the types of several sources
+        all_source_types = [MappingSourceTypes(types=['aws_vpc']), MappingSourceTypes(prefixes=['aws_s'])]
+
+        # WHEN they are joined
+        union = union_mapping_source_types(all_source_types)
+
+        # THEN all their types and prefixes are kept
+        assert union.types == {'aws_vpc'}
+        assert union.prefixes == {'aws_s'}
+
+        # AND they are unknown if the types of any source are unknown
+        assert union_mapping_source_types(all_source_types + [None]) is None
+
+
+class TestMappingSkipMetrics:
+
+    def test_estimated_time_saved(self):
+        # GIVEN the metrics of two empty mappings and a skipped one
+        metrics = MappingSkipMetrics()
+        for results in [0, 0, 3]:
+            metrics.start()
+            metrics.stop(results)
+        metrics.skip()
+
+        # WHEN the metrics are requested
+        result = metrics.get_metrics()
+
+        # THEN the time saved is estimated from the mappings which did not find anything
+        assert result['run'] == 3
+        assert result['skipped'] == 1
+        assert metrics.estimated_time_saved == pytest.approx(metrics.empty_run_time / 2)
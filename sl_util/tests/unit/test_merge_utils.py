@@ -0,0 +1,121 @@
+import copy
+import random
+from collections import OrderedDict
+
+import pytest
+from deepmerge import always_merger
+
+from sl_util.sl_util.merge_utils import merge_all, merge_into
+
+
+def fold_with_always_merger(documents):
+    merged = None
+    for document in documents:
+        merged = always_merger.merge(merged, document)
+    return merged
+
+
+def random_value(rnd: random.Random, depth: int = 0):
+    kind = rnd.choice(['dict', 'list', 'set', 'str', 'int', 'none'] if depth < 3 else ['str', 'int', 'none'])
+    if kind == 'dict':
+        return {rnd.choice('abcd'): random_value(rnd, depth + 1) for _ in range(rnd.randint(0, 4))}
+    if kind == 'list':
+        return [random_value(rnd, depth + 1) for _ in range(rnd.randint(0, 3))]
+    if kind == 'set':
+        return {rnd.randint(0, 5) for _ in range(rnd.randint(0, 3))}
+    if kind == 'str':
+        return rnd.choice('xyz')
+    if kind == 'int':
+        return rnd.randint(0, 5)
+    return None
+
+
+class TestMergeUtils:
+
+    def test_merge_terraform_documents(self):
+        # GIVEN some parsed Terraform files
+        documents = [
+            {'resource': [{'aws_vpc': {'vpc': {'cidr_block': '10.0.0.0/16'}}}], 'variable': [{'a': {}}]},
+            {'resource': [{'aws_subnet': {'subnet': {'vpc_id': '${aws_vpc.vpc.id}'}}}]},
+            {'resource': [{'aws_instance': {'instance': {}}}], 'variable': [{'b': {}}]},
+        ]
+
+        # WHEN they are merged
+        merged = merge_all(documents)
+
+        # THEN the blocks of each type are concatenated in order
+        assert merged == {
+            'resource': [
+                {'aws_vpc': {'vpc': {'cidr_block': '10.0.0.0/16'}}},
+                {'aws_subnet': {'subnet': {'vpc_id': '${aws_vpc.vpc.id}'}}},
+                {'aws_instance': {'instance': {}}}],
+            'variable': [{'a': {}}, {'b': {}}]
+        }
+
+    @pytest.mark.parametrize('documents', [
+        pytest.param([], id='no documents'),
+        pytest.param([{}], id='empty document'),
+        pytest.param([{'a': 1}, {'a': {'b': 1}}, {'a': {'c': 2}}], id='override by dict'),
+        pytest.param([{'a': {'b': 1}}, {'a': 'x'}, {'a': {'c': 2}}], id='override by string'),
+        pytest.param([{'a': [1]}, {'a': None}, {'a': [2]}, {'a': [3]}], id='override by none'),
+        pytest.param([{'a': {1}}, {'a': {2}}], id='sets'),
+        pytest.param([{'a': 1}, OrderedDict(a=2, b=3)], id='dict subclass'),
+        pytest.param([{'a': True}, {'a': 1}], id='bool and int'),
+    ])
+    def test_same_result_as_always_merger(self, documents):
+        # GIVEN some documents
+        # WHEN they are merged
+        merged = merge_all(copy.deepcopy(documents))
+
+        # THEN the result is the same as merging them one by one
+        assert merged == fold_with_always_merger(copy.deepcopy(documents))
+
+    @pytest.mark.parametrize('seed', range(50))
+    def test_same_result_as_always_merger_on_random_documents(self, seed):
+        # GIVEN some random documents
+        rnd = random.Random(seed)
+        documents = [random_value(rnd) for _ in range(rnd.randint(1, 5))]
+
+        # WHEN they are merged
+        merged = merge_all(copy.deepcopy(documents))
+
+        # THEN the result is the same as merging them one by one
+        assert merged == fold_with_always_merger(copy.deepcopy(documents))
+
+    def test_merge_into_first_document(self):
+        # GIVEN a document with some data
+        document = {'a': [1]}
+
+        # WHEN other document is merged into it
+        merged = merge_all([document, {'a': [2], 'b': 3}])
+
+        # THEN the first document is updated like always_merger does
+        assert merged is document
+        assert document == {'a': [1, 2], 'b': 3}
+
+    @pytest.mark.parametrize('seed', range(50))
+    def test_merge_into_same_result_as_merge_all(self, seed):
+        # GIVEN some random documents
+        rnd = random.Random(seed)
+        documents = [random_value(rnd) for _ in range(rnd.randint(1, 5))]
+
+        # WHEN they are merged one at a time
+        merged = None
+        for document in copy.deepcopy(documents):
+            merged = merge_into(merged, document)
+
+        # THEN the result is the same as merging them all at once
+        assert merged == merge_all(copy.deepcopy(documents))
+
+    def test_merge_into_extends_lists_in_place(self):
+        # GIVEN a document already merged
+        resources = [{'aws_vpc': {}}]
+        accumulated = {'resource': resources}
+
+        # WHEN other document is merged into it
+        merged = merge_into(accumulated, {'resource': [{'aws_subnet': {}}], 'variable': [{'a': {}}]})
+
+        # THEN its lists are extended instead of copied
+        assert merged is accumulated
+        assert merged['resource'] is resources
+        assert merged == {'resource': [{'aws_vpc': {}}, {'aws_subnet': {}}], 'variable': [{'a': {}}]}
@@ -0,0 +1,57 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from sl_util.sl_util.process_utils import get_process_pool, shutdown_process_pool, submit_all
+
+
+def get_pid(_) -> int:
+    return os.getpid()
+
+
+def exit_abruptly(_):
+    os._exit(1)
+
+
+class TestProcessUtils:
+
+    def test_process_pool_is_shared(self):
+        # GIVEN the shared process pool
+        pool = get_process_pool()
+
+        # WHEN some calls are submitted to it
+        pids = {future.result() for future in submit_all(get_pid, range(4))}
+
+        # THEN they run in worker processes which are not forked from this one
+        assert os.getpid() not in pids
+        assert pool._mp_context.get_start_method() in ('forkserver', 'spawn')
+
+        # AND the same pool is used the next time
+        assert get_process_pool() is pool
+
+    def test_broken_process_pool_is_replaced(self):
+        # GIVEN a pool whose worker ends abruptly
+        pool = get_process_pool()
+        with pytest.raises(BrokenProcessPool):
+            submit_all(exit_abruptly, [None])[0].result()
+
+        # WHEN more calls are submitted
+        with pytest.raises(BrokenProcessPool):
+            submit_all(get_pid, [None])
+
+        # THEN the broken pool is replaced by a new one
+        assert get_process_pool() is not pool
+        assert submit_all(get_pid, [None])[0].result() != os.getpid()
+
+    def test_shutdown_of_a_replaced_pool(self):
+        # GIVEN a pool that has already been replaced
+        replaced_pool = get_process_pool()
+        shutdown_process_pool()
+        pool = get_process_pool()
+
+        # WHEN the replaced pool is shut down
+        shutdown_process_pool(replaced_pool)
+
+        # THEN the current pool is kept
+        assert get_process_pool() is pool
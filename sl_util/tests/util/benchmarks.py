@@ -0,0 +1,9 @@
+import os
+
+from pytest import mark
+
+# The benchmarks measure wall-clock time or peak memory, so they only run when they are explicitly asked for, like
+# STARTLEFT_BENCHMARKS=1 pytest slp_tf/tests/performance
+BENCHMARKS_ENABLED = os.getenv('STARTLEFT_BENCHMARKS', '').lower() in ('1', 'true', 'yes')
+
+benchmark = mark.skipif(not BENCHMARKS_ENABLED, reason='Benchmarks only run when STARTLEFT_BENCHMARKS is set')
@@ -47,30 +47,32 @@ class MappingValidator(metaclass=abc.ABCMeta):
 
 
 class MappingFileValidator(MappingValidator):
-    def __init__(self, schema: Schema, mapping_file: bytes):
+    def __init__(self, schema: Schema, mapping_file: bytes, max_size: int = MAX_SIZE):
         self.schema = schema
         self.mapping_file = mapping_file
+        self.max_size = max_size
 
     def validate(self):
         logger.debug('Validating mapping file')
-        validate_mapping_file(self.schema, self.mapping_file)
+        validate_mapping_file(self.schema, self.mapping_file, self.max_size)
 
 
 class MultipleMappingFileValidator(MappingValidator):
-    def __init__(self, schema: Schema, mapping_files: [bytes]):
+    def __init__(self, schema: Schema, mapping_files: [bytes], max_size: int = MAX_SIZE):
         self.schema = schema
         self.mapping_files = mapping_files
+        self.max_size = max_size
 
     def validate(self):
         logger.debug('Validating mapping files')
         for mapping_file in self.mapping_files:
-            validate_mapping_file(self.schema, mapping_file)
+            validate_mapping_file(self.schema, mapping_file, self.max_size)
 
 
-def validate_size(mapping_file_data: bytes):
+def validate_size(mapping_file_data: bytes, max_size: int = MAX_SIZE):
     size = len(mapping_file_data)
 
-    if size > MAX_SIZE or size < MIN_SIZE:
+    if size > max_size or size < MIN_SIZE:
         logger.error('Mapping files are not valid')
         msg = 'Mapping files are not valid. Invalid size'
         raise MappingFileNotValidError('Mapping files are not valid', msg, msg)
@@ -104,8 +106,8 @@ def read_mapping_file(mapping_file: bytes):
                                        e.__class__.__name__, str(e))
 
 
-def validate_mapping_file(schema: Schema, mapping_file: bytes):
-    validate_size(mapping_file)
+def validate_mapping_file(schema: Schema, mapping_file: bytes, max_size: int = MAX_SIZE):
+    validate_size(mapping_file, max_size)
     validate_type(mapping_file)
     validate_schema(schema, mapping_file)
     logger.info('Mapping files are valid')
@@ -4,7 +4,7 @@ import yaml
 from deepmerge import Merger
 
 from slp_base import LoadingMappingFileError
-from slp_base.slp_base.mapping import validate_size, MappingLoader
+from slp_base.slp_base.mapping import validate_size, MappingLoader, MAX_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +18,9 @@ mapping_merger = Merger(
 
 class MappingFileLoader(MappingLoader):
 
-    def __init__(self, mapping_files_data: [bytes]):
+    def __init__(self, mapping_files_data: [bytes], max_size: int = MAX_SIZE):
         self.mapping_files = mapping_files_data
+        self.max_size = max_size
         self.map = {}
 
     def load(self) -> {}:
@@ -27,7 +28,7 @@ class MappingFileLoader(MappingLoader):
             msg = "Mapping file is empty"
             raise LoadingMappingFileError("Mapping file is not valid", msg, msg)
 
-        validate_size(self.mapping_files[0])
+        validate_size(self.mapping_files[0], self.max_size)
 
         try:
             for mapping_file_data in self.mapping_files:
@@ -17,6 +17,14 @@ def _prune_otm(otm: OTM):
     OTMRepresentationsPruner(otm).prune()
 
 
+def release_otm_sources(otm: OTM):
+    """
+    Releases the source data the elements of the threat model were mapped from, which is not needed once it is built
+    """
+    for element in [*otm.trustzones, *otm.components, *otm.dataflows]:
+        element.source = None
+
+
 class OTMProcessor(metaclass=abc.ABCMeta):
     """
     Formal Interface to manage all the flow from the input data to the OTM output
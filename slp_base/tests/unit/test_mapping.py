@@ -56,6 +56,15 @@ class TestMapping(TestCase):
         with self.assertRaises(MappingFileNotValidError):
             MappingFileValidator(mapping_file_schema, mapping_file_data).validate()
 
+    def test_mapping_file_validator_configurable_size(self):
+        mapping_file_schema = Schema(ETM_MAPPING_SCHEMA)
+
+        with open(SAMPLE_MAPPING_FILE) as file:
+            mapping_file_data = file.read()
+
+        with self.assertRaises(MappingFileNotValidError):
+            MappingFileValidator(mapping_file_schema, mapping_file_data, max_size=len(mapping_file_data) - 1).validate()
+
     def test_invalid_mapping_file(self):
         # Given the iac terraform schema
         mapping_file_schema = Schema(IAC_CFT_MAPPING_SCHEMA)
@@ -1,14 +1,17 @@
 from slp_base.slp_base import MappingLoader, MappingValidator
 from slp_base.slp_base import OTMProcessor
 from slp_base.slp_base import ProviderValidator
+from slp_base.slp_base.mapping import MAX_SIZE as MAPPING_MAX_SIZE
+from slp_base.slp_base.otm_processor import release_otm_sources
 from slp_base.slp_base.provider_loader import ProviderLoader
 from slp_base.slp_base.provider_parser import ProviderParser
 from slp_cft.slp_cft.load.cft_loader import CloudformationLoader
 from slp_cft.slp_cft.load.cft_mapping_file_loader import CloudformationMappingFileLoader
 from slp_cft.slp_cft.parse.cft_parser import CloudformationParser
+from slp_cft.slp_cft.parse.mapping.cft_mapping_program_cache import get_mapping_digest
 from slp_cft.slp_cft.validate.cft_mapping_file_validator import \
     CloudformationMappingFileValidator
-from slp_cft.slp_cft.validate.cft_validator import CloudformationValidator
+from slp_cft.slp_cft.validate.cft_validator import CloudformationValidator, MAX_SIZE
 
 
 class CloudformationProcessor(OTMProcessor):
@@ -16,32 +19,58 @@ class CloudformationProcessor(OTMProcessor):
     Cloudformation implementation of OTMProcessor
     """
 
-    def __init__(self, project_id: str, project_name: str, sources: [bytes], mappings: [bytes]):
+    def __init__(self, project_id: str, project_name: str, sources: [bytes], mappings: [bytes],
+                 source_names: [str] = None, nested_stacks: bool = False, max_size: int = MAX_SIZE,
+                 mapping_max_size: int = MAPPING_MAX_SIZE, streaming: bool = False):
         self.project_id = project_id
         self.project_name = project_name
         self.sources = sources
         self.mappings = mappings
+        # File names of the sources, used to find the templates of the nested stacks when they are linked
+        self.source_names = source_names
+        self.nested_stacks = nested_stacks
+        self.max_size = max_size
+        self.mapping_max_size = mapping_max_size
+        # Keeps the memory bounded by releasing the sources as soon as they are parsed and the source data once mapped
+        self.streaming = streaming
 
         self.cloudformation_loader = None
         self.mapping_loader = None
+        self.cloudformation_parser = None
 
     def get_provider_validator(self) -> ProviderValidator:
-        return CloudformationValidator(self.sources)
+        return CloudformationValidator(self.sources, max_size=self.max_size)
 
     def get_provider_loader(self) -> ProviderLoader:
-        self.cloudformation_loader = CloudformationLoader(self.sources)
+        self.cloudformation_loader = CloudformationLoader(
+            self.sources, source_names=self.source_names, nested_stacks=self.nested_stacks, streaming=self.streaming)
         return self.cloudformation_loader
 
     def get_mapping_validator(self) -> MappingValidator:
-        return CloudformationMappingFileValidator(self.mappings)
+        return CloudformationMappingFileValidator(self.mappings, max_size=self.mapping_max_size)
 
     def get_mapping_loader(self) -> MappingLoader:
-        self.mapping_loader = CloudformationMappingFileLoader(self.mappings)
+        self.mapping_loader = CloudformationMappingFileLoader(self.mappings, max_size=self.mapping_max_size)
         return self.mapping_loader
 
     def get_provider_parser(self) -> ProviderParser:
-        return CloudformationParser(
+        self.cloudformation_parser = CloudformationParser(
             self.project_id,
             self.project_name,
             self.cloudformation_loader.get_cloudformation(),
-            self.mapping_loader.get_mappings())
+            self.mapping_loader.get_mappings(),
+            mapping_digest=get_mapping_digest(self.mappings))
+        return self.cloudformation_parser
+
+    def _clean_resources(self):
+        if not self.streaming:
+            return
+
+        self.sources = None
+        if self.cloudformation_loader:
+            self.cloudformation_loader.cloudformation = None
+        if self.cloudformation_parser:
+            self.cloudformation_parser.source = None
+            self.cloudformation_parser.source_model = None
+            self.cloudformation_parser.transformer = None
+            release_otm_sources(self.cloudformation_parser.otm)
@@ -1,25 +1,173 @@
+import json
 import logging
+import os
+from collections import deque
+from typing import Callable, List, Optional, Union
+from urllib.parse import urlparse
 
-from deepmerge import always_merger
-from yaml import BaseLoader, ScalarNode
+import yaml
+from yaml import BaseLoader, MappingNode, Node, ScalarNode, SequenceNode
 
+from sl_util.sl_util.file_utils import read_byte_data
 from sl_util.sl_util.json_utils import read_yaml
+from sl_util.sl_util.merge_utils import merge_all, merge_into
+from sl_util.sl_util.process_utils import PROCESS_POOL_MAX_WORKERS, submit_all
 from slp_base.slp_base.errors import LoadingIacFileError
 from slp_base.slp_base.provider_loader import ProviderLoader
 
 logger = logging.getLogger(__name__)
 
+# Intrinsic functions whose short form is !<name> for Fn::<name>
+INTRINSIC_FUNCTIONS = ['And', 'Base64', 'Cidr', 'Equals', 'FindInMap', 'GetAZs', 'If', 'ImportValue', 'Join',
+                       'Length', 'Not', 'Or', 'Select', 'Split', 'Sub', 'ToJsonString', 'Transform']
+# Intrinsic functions whose short form is !<name> for <name>
+PLAIN_INTRINSIC_FUNCTIONS = ['Condition']
+
+# Below this number of files to parse, handing them to the worker processes costs more than it saves
+PARALLEL_LOADING_MIN_SOURCES = 4
+PARALLEL_LOADING_MAX_WORKERS = PROCESS_POOL_MAX_WORKERS
+
+NESTED_STACK_TYPE = 'AWS::CloudFormation::Stack'
+NESTED_RESOURCES = '_nestedResources'
+PARENT_STACK = '_parentStack'
+
+# Values of the JSON literals as they are read by the YAML BaseLoader, which reads every scalar as a string
+JSON_LITERALS = {True: 'true', False: 'false', None: 'null'}
+
+
+class PythonCloudformationYamlLoader(BaseLoader):
+    """
+    YAML loader for CloudFormation templates which reads every scalar as a string and every intrinsic function in
+    short form as its full form
+    """
+
+
+if yaml.__with_libyaml__:
+    class CloudformationYamlLoader(yaml.CBaseLoader):
+        """
+        The same loader as PythonCloudformationYamlLoader, parsing the YAML with libyaml
+        """
+else:
+    CloudformationYamlLoader = PythonCloudformationYamlLoader
+
 
 def get_loader():
-    loader = BaseLoader
-    loader.add_constructor("!Ref", ref_constructor)
-    return loader
+    return CloudformationYamlLoader
 
 
 def ref_constructor(loader: BaseLoader, node: ScalarNode) -> dict:
     return {'Ref': loader.construct_scalar(node)}
 
 
+def get_att_constructor(loader: BaseLoader, node: Node) -> dict:
+    if isinstance(node, ScalarNode):
+        return {'Fn::GetAtt': loader.construct_scalar(node).split('.', 1)}
+    return {'Fn::GetAtt': construct_node(loader, node)}
+
+
+def intrinsic_function_constructor(function: str):
+    return lambda loader, node: {function: construct_node(loader, node)}
+
+
+def construct_node(loader: BaseLoader, node: Node):
+    if isinstance(node, SequenceNode):
+        return loader.construct_sequence(node, deep=True)
+    if isinstance(node, MappingNode):
+        return loader.construct_mapping(node, deep=True)
+    return loader.construct_scalar(node)
+
+
+def __add_constructors(loader):
+    for function in INTRINSIC_FUNCTIONS:
+        loader.add_constructor(f'!{function}', intrinsic_function_constructor(f'Fn::{function}'))
+    for function in PLAIN_INTRINSIC_FUNCTIONS:
+        loader.add_constructor(f'!{function}', intrinsic_function_constructor(function))
+    loader.add_constructor('!GetAtt', get_att_constructor)
+    loader.add_constructor('!Ref', ref_constructor)
+
+
+for cloudformation_loader in {PythonCloudformationYamlLoader, CloudformationYamlLoader}:
+    __add_constructors(cloudformation_loader)
+
+
+def read_cloudformation_json(data: str) -> Optional[dict]:
+    """
+    Reads a template in JSON the same way the YAML loader does, so every scalar is a string
+    :return: The template, or None if it is not valid JSON
+    """
+    try:
+        cft_data = json.loads(data, parse_int=str, parse_float=str, parse_constant=str)
+    except ValueError:
+        return None
+
+    if not isinstance(cft_data, dict):
+        return None
+
+    pending = [cft_data]
+    while pending:
+        value = pending.pop()
+        elements = value.items() if isinstance(value, dict) else enumerate(value) if isinstance(value, list) else ()
+        for key, element in elements:
+            if isinstance(element, (dict, list)):
+                pending.append(element)
+            elif isinstance(element, bool) or element is None:
+                value[key] = JSON_LITERALS[element]
+
+    return cft_data
+
+
+def read_cloudformation(source: Union[str, bytes]) -> dict:
+    data = source if isinstance(source, str) else read_byte_data(source)
+    if data.lstrip().startswith('{') and (cft_data := read_cloudformation_json(data)) is not None:
+        return cft_data
+
+    try:
+        return read_yaml(data, loader=get_loader())
+    except yaml.YAMLError:
+        if get_loader() is PythonCloudformationYamlLoader:
+            raise
+        # libyaml is stricter with some documents, which are read by the pure Python loader as they always were
+        return read_yaml(data, loader=PythonCloudformationYamlLoader)
+
+
+def get_template_name(template_path: str) -> str:
+    """
+    :return: The file name of a template, either from its path or from the URL of a TemplateURL
+    """
+    return os.path.basename(urlparse(template_path).path)
+
+
+def link_nested_stacks(templates: List[dict], template_names: List[str]):
+    """
+    Links each AWS::CloudFormation::Stack resource to the template in its TemplateURL, when it is one of the given
+    templates. The stack gets the logical ids of the resources of its template in _nestedResources, and each of these
+    resources gets the logical id of the stack in _parentStack
+    """
+    templates_by_name = {get_template_name(name): template for name, template in zip(template_names, templates) if name}
+
+    for template in templates:
+        for logical_id, resource in __get_resources(template).items():
+            if not isinstance(resource, dict) or resource.get('Type') != NESTED_STACK_TYPE:
+                continue
+
+            template_url = (resource.get('Properties') or {}).get('TemplateURL')
+            nested_template = templates_by_name.get(get_template_name(template_url)) \
+                if isinstance(template_url, str) else None
+            if nested_template is None or nested_template is template:
+                continue
+
+            nested_resources = __get_resources(nested_template)
+            resource[NESTED_RESOURCES] = list(nested_resources)
+            for nested_resource in nested_resources.values():
+                if isinstance(nested_resource, dict):
+                    nested_resource.setdefault(PARENT_STACK, logical_id)
+
+
+def __get_resources(template: dict) -> dict:
+    resources = template.get('Resources') if isinstance(template, dict) else None
+    return resources if isinstance(resources, dict) else {}
+
+
 def raise_empty_sources_error():
     msg = "IaC file is empty"
     raise LoadingIacFileError("IaC file is not valid", msg, msg)
@@ -30,9 +178,15 @@ class CloudformationLoader(ProviderLoader):
     Builder for a Cloudformation class from the xml data
     """
 
-    def __init__(self, sources):
+    def __init__(self, sources, max_workers: int = PARALLEL_LOADING_MAX_WORKERS, source_names: List[str] = None,
+                 nested_stacks: bool = False, streaming: bool = False):
         self.sources = sources
-        self.yaml_reader = read_yaml
+        self.cft_reader: Callable = read_cloudformation
+        self.max_workers: int = max_workers
+        self.source_names: List[str] = source_names
+        self.nested_stacks: bool = nested_stacks
+        # Parses the sources one by one, merging each of them once parsed
+        self.streaming: bool = streaming
         self.cloudformation = None
 
     def load(self):
@@ -45,20 +199,60 @@ class CloudformationLoader(ProviderLoader):
         if not self.sources:
             raise_empty_sources_error()
 
-        for source in self.sources:
-            self.__merge_cft_data(self.__load_cft_data(source))
+        # Nested stacks are linked across templates, so they are all needed at the same time
+        if self.streaming and not (self.nested_stacks and self.source_names):
+            self.__stream_source_files()
+            return
+
+        sources_data = self.__load_sources_data()
+        if self.nested_stacks and self.source_names:
+            link_nested_stacks(sources_data, self.source_names)
+
+        # Templates are merged in the order they were given, whatever the order they were parsed in
+        self.cloudformation = merge_all(sources_data)
 
         if not self.cloudformation:
             raise_empty_sources_error()
 
-    def __merge_cft_data(self, cft_data):
-        self.cloudformation = always_merger.merge(self.cloudformation, cft_data)
+    def __stream_source_files(self):
+        """
+        Merges the data of each source into the Cloudformation data as soon as it is parsed, extending what was
+        merged before in place, so the tree of each template is dropped once merged. The sources are taken from a
+        private queue, leaving the list of the caller as it was given
+        """
+        sources = deque(self.sources)
+        cloudformation = None
+        while sources:
+            cloudformation = merge_into(cloudformation, self.__load_cft_data(sources.popleft()))
+
+        if not cloudformation:
+            raise_empty_sources_error()
+
+        self.cloudformation = cloudformation
+
+    def __load_sources_data(self) -> List[dict]:
+        workers = min(len(self.sources), self.max_workers)
+        if self.streaming or len(self.sources) < PARALLEL_LOADING_MIN_SOURCES or workers < 2:
+            return [self.__load_cft_data(source) for source in self.sources]
+
+        logger.debug(f"Parsing {len(self.sources)} source files in the shared worker processes")
+        futures = submit_all(self.cft_reader, self.sources)
+        return [self.__get_parsed_data(future) for future in futures]
+
+    @staticmethod
+    def __get_parsed_data(future) -> dict:
+        try:
+            return future.result()
+        except Exception as e:
+            detail = e.__class__.__name__
+            message = e.__str__()
+            raise LoadingIacFileError("IaC file is not valid", detail, message)
 
     def __load_cft_data(self, source) -> dict:
         try:
             logger.debug("Loading iac data and reading as string")
 
-            cft_data = self.yaml_reader(source, loader=get_loader())
+            cft_data = self.cft_reader(source)
 
             logger.debug("Source data loaded successfully")
 
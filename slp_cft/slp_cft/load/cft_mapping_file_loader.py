@@ -1,5 +1,6 @@
 import logging
 
+from slp_base.slp_base.mapping import MAX_SIZE
 from slp_base.slp_base.mapping_file_loader import MappingFileLoader
 
 logger = logging.getLogger(__name__)
@@ -7,5 +8,5 @@ logger = logging.getLogger(__name__)
 
 class CloudformationMappingFileLoader(MappingFileLoader):
 
-    def __init__(self, mapping_files: [bytes]):
-        super(CloudformationMappingFileLoader, self).__init__(mapping_files)
+    def __init__(self, mapping_files: [bytes], max_size: int = MAX_SIZE):
+        super(CloudformationMappingFileLoader, self).__init__(mapping_files, max_size)
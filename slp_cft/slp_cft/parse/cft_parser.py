@@ -5,6 +5,7 @@ from otm.otm.otm_builder import OTMBuilder
 from slp_base.slp_base.errors import OTMBuildingError
 from slp_base.slp_base.provider_parser import ProviderParser
 from slp_base.slp_base.provider_type import IacType
+from slp_cft.slp_cft.parse.mapping.cft_mapping_program_cache import mapping_program_cache
 from slp_cft.slp_cft.parse.mapping.cft_path_ids_calculator import CloudformationPathIdsCalculator
 from slp_cft.slp_cft.parse.mapping.cft_sourcemodel import CloudformationSourceModel
 from slp_cft.slp_cft.parse.mapping.cft_transformer import CloudformationTransformer
@@ -17,14 +18,17 @@ class CloudformationParser(ProviderParser):
     Parser to build an OTM from CloudFormation
     """
 
-    def __init__(self, project_id: str, project_name: str, source, mapping: [str]):
+    def __init__(self, project_id: str, project_name: str, source, mapping: [str], mapping_digest: str = None):
         self.source = source
-        self.mapping = mapping
+        # The mapping is compiled only once for all the sources it is applied to, given the digest of its files, and
+        # every request applies the same frozen copy kept by its program
+        self.program = mapping_program_cache.get(mapping, mapping_digest)
+        self.mapping = self.program.mapping
         self.project_id = project_id
         self.project_name = project_name
 
         self.otm = self.__initialize_otm()
-        self.source_model = CloudformationSourceModel(self.source, self.otm)
+        self.source_model = CloudformationSourceModel(self.source, self.otm, program=self.program)
         self.transformer = CloudformationTransformer(source_model=self.source_model, threat_model=self.otm)
 
     def build_otm(self) -> OTM:
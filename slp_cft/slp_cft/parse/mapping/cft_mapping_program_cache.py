@@ -0,0 +1,75 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Union
+
+from slp_cft.slp_cft.parse.mapping.cft_sourcemodel import CloudformationMappingProgram
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 16
+
+
+def get_mapping_digest(mapping_files: List[Union[bytes, str]]) -> str:
+    """
+    :return: The content hash of the mapping files, which is much cheaper to work out than the one of the mapping
+    loaded from them
+    """
+    digest = hashlib.sha256()
+    for mapping_file in mapping_files:
+        data = mapping_file.encode() if isinstance(mapping_file, str) else mapping_file or b''
+        # Each file is prefixed with its size, so the same content split in other files gets another digest
+        digest.update(len(data).to_bytes(8, 'big'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class CloudformationMappingProgramCache:
+    """
+    LRU cache of the compiled mapping programs keyed by the content hash of the files of their mapping, so a mapping
+    applied to several sources is only compiled the first time. The mappings of the programs are frozen, so the same
+    program is returned to every thread asking for it.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+
+        self.__entries: OrderedDict = OrderedDict()
+        self.__lock = Lock()
+
+    def get(self, mapping: dict, digest: str = None) -> CloudformationMappingProgram:
+        """
+        :param mapping: The mapping loaded from the mapping files
+        :param digest: The content hash of the mapping files, without which the program is compiled but not cached
+        """
+        if digest is None:
+            return CloudformationMappingProgram(mapping)
+
+        with self.__lock:
+            program = self.__entries.get(digest)
+            if program is not None:
+                self.__entries.move_to_end(digest)
+                return program
+
+        # The program is compiled outside the lock, so other mappings are not kept waiting
+        program = CloudformationMappingProgram(mapping)
+        logger.debug(f'Compiled mapping program for {digest}')
+
+        with self.__lock:
+            program = self.__entries.setdefault(digest, program)
+            self.__entries.move_to_end(digest)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+        return program
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+mapping_program_cache = CloudformationMappingProgramCache()
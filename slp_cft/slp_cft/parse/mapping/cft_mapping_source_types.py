@@ -0,0 +1,48 @@
+from typing import Optional
+
+import sl_util.sl_util.secure_regex as re
+from sl_util.sl_util.mapping_source_types import MappingSourceTypes, union_mapping_source_types
+
+QUOTED_VALUE = r"\s*'([^'\\]*)'\s*"
+
+SQUASH_BY_TYPE_QUERY = re.compile(r"^\s*Resources\s*\|\s*squash\(\s*@\s*\)\s*\[\?\s*Type\s*==" + QUOTED_VALUE + r"\]\s*$")
+SQUASH_BY_TYPE_PREFIX_QUERY = re.compile(
+    r"^\s*Resources\s*\|\s*squash\(\s*@\s*\)\s*\[\?\s*starts_with\(\s*Type\s*," + QUOTED_VALUE + r"\)\s*\]\s*$")
+
+# Keys of the $source checked by the CloudformationSourceModel search, in the same order
+SEARCH_KEYS = ["$lookup", "$skip", "$parent", "$singleton", "$root", "$path", "$resolved", "$format", "$catchall",
+               "$children", "$search", "$findFirst", "$numberOfSources", "$hub", "$ip"]
+NESTED_SOURCE_KEYS = ["$skip", "$singleton", "$catchall"]
+
+
+def get_mapping_source_types(mapping_source) -> Optional[MappingSourceTypes]:
+    """
+    Calculates the CloudFormation resource types a mapping $source can find, following the same order of keys the
+    CloudformationSourceModel search does
+    :param mapping_source: The $source of a mapping
+    :return: The resource types, or None if the $source may find resources of any type
+    """
+    if isinstance(mapping_source, list):
+        return union_mapping_source_types(get_mapping_source_types(element) for element in mapping_source)
+
+    if not isinstance(mapping_source, dict):
+        return None
+
+    key = next((key for key in SEARCH_KEYS if key in mapping_source), None)
+
+    if key == "$root":
+        return __get_root_source_types(mapping_source[key])
+
+    if key in NESTED_SOURCE_KEYS:
+        return get_mapping_source_types(mapping_source[key])
+
+
+def __get_root_source_types(root_query) -> Optional[MappingSourceTypes]:
+    if not isinstance(root_query, str):
+        return None
+
+    if match := SQUASH_BY_TYPE_QUERY.match(root_query):
+        return MappingSourceTypes(types=[match.group(1)])
+
+    if match := SQUASH_BY_TYPE_PREFIX_QUERY.match(root_query):
+        return MappingSourceTypes(prefixes=[match.group(1)])
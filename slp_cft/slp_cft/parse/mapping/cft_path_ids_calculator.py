@@ -1,5 +1,12 @@
+from typing import List, Optional
+
 from otm.otm.entity.component import Component
-from slp_cft.slp_cft.parse.mapping.cft_component_id_generator import CloudformationComponentIdGenerator
+from slp_cft.slp_cft.parse.mapping.cft_component_id_generator import CloudformationComponentIdGenerator, \
+    is_altsource_resource
+
+
+def is_trustzone_parent(component: Component):
+    return component.parent_type == 'trustZone'
 
 
 class CloudformationPathIdsCalculator:
@@ -9,6 +16,18 @@ class CloudformationPathIdsCalculator:
 
         self.path_ids = {}
 
+        # The first component for each id is the one its children hang from
+        self.components_by_id = {}
+        for component in reversed(components):
+            self.components_by_id[component.id] = component
+
+        # Components whose parent chain does not end in a trustzone. When ids are repeated, a chain may be completed
+        # later by another component with the same id, so they are only remembered when ids are unique
+        self.unresolved_components = set() if len(self.components_by_id) == len(components) else None
+
+        # Ids already generated, by the logical id, type and name of their resource along with their parent path id
+        self.generated_ids = {}
+
     def calculate_path_ids(self) -> {}:
         for component in self.components:
             if component.id not in self.path_ids:
@@ -16,25 +35,61 @@ class CloudformationPathIdsCalculator:
 
         return self.path_ids
 
-    def __calculate_path_id(self, component: {}) -> str:
-        path_id = self.__build_component_id(component, self.__get_parent_path_id(component))
+    def __calculate_path_id(self, component: Component) -> Optional[str]:
+        """
+        Walks up the parents of the component until one of them hangs from a trustzone or already has its path id,
+        then generates the path ids of the whole chain from the top down
+        """
+        chain = self.__get_unresolved_parents_chain(component)
+        if not chain:
+            return None
 
-        self.path_ids[component.id] = path_id
+        path_id = self.__get_parent_path_id(chain[-1])
+        if not path_id:
+            self.__set_unresolved(chain)
+            return None
+
+        for chain_component in reversed(chain):
+            path_id = self.__build_component_id(chain_component, path_id)
+            self.path_ids[chain_component.id] = path_id
 
         return path_id
 
-    def __get_parent_path_id(self, component: Component) -> str:
-        if component.parent_type == 'trustZone':
+    def __get_unresolved_parents_chain(self, component: Component) -> Optional[List[Component]]:
+        chain = [component]
+        chain_components = {id(component)}
+
+        while not is_trustzone_parent(chain[-1]) and chain[-1].parent not in self.path_ids:
+            parent_component = self.components_by_id.get(chain[-1].parent)
+            if not parent_component or id(parent_component) in chain_components \
+                    or self.__is_unresolved(parent_component):
+                self.__set_unresolved(chain)
+                return None
+
+            chain.append(parent_component)
+            chain_components.add(id(parent_component))
+
+        return chain
+
+    def __get_parent_path_id(self, component: Component) -> Optional[str]:
+        if is_trustzone_parent(component):
             return component.parent
 
-        if component.parent in self.path_ids:
-            return self.path_ids[component.parent]
+        return self.path_ids[component.parent]
+
+    def __is_unresolved(self, component: Component) -> bool:
+        return self.unresolved_components is not None and id(component) in self.unresolved_components
 
-        return self.__calculate_path_id(self.__find_parent_component(component.parent))
+    def __set_unresolved(self, chain: List[Component]):
+        if self.unresolved_components is not None:
+            self.unresolved_components.update(id(component) for component in chain)
 
-    def __find_parent_component(self, parent_id: str):
-        return next(filter(lambda x: x.id == parent_id, self.components), None)
+    def __build_component_id(self, component: Component, parent_id: str):
+        source = component.source
+        key = (source.get('_key'), source.get('Type'), bool(is_altsource_resource(source)), parent_id,
+               component.name)
+        if key not in self.generated_ids:
+            self.generated_ids[key] = CloudformationComponentIdGenerator.from_component(
+                source, parent_id, component.name).generate_id()
 
-    def __build_component_id(self, component: {}, parent_id: str):
-        return CloudformationComponentIdGenerator.from_component(component.source, parent_id,
-                                                                         component.name).generate_id()
+        return self.generated_ids[key]
@@ -0,0 +1,267 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import jmespath
+
+import sl_util.sl_util.secure_regex as re
+
+logger = logging.getLogger(__name__)
+
+REF = 'Ref'
+GET_ATT = 'Fn::GetAtt'
+SUB = 'Fn::Sub'
+JOIN = 'Fn::Join'
+IMPORT_VALUE = 'Fn::ImportValue'
+DEPENDS_ON = 'DependsOn'
+
+# Keys added to the resolved view of each resource with the logical ids of the resources it references and of the
+# resources referencing it
+REFERENCES = '_references'
+REFERENCED_BY = '_referencedBy'
+
+# Variables of a Fn::Sub, which are escaped as literals when they start with !
+SUB_VARIABLE = re.compile(r'\$\{(!?)([^}]*)\}')
+
+
+class CloudformationResourceGraph:
+    """
+    Graph of the CloudFormation resources of the source data, where each resource is indexed by its logical id along
+    with the resources and parameters it references through Ref, Fn::GetAtt, Fn::Sub and DependsOn.
+    It gives a resolved view of the data, where the parameters, Fn::Sub, Fn::Join and the Fn::ImportValue of the
+    exports of the loaded templates are replaced by their values, which the mappings query with $resolved alongside
+    the raw values. Nothing is worked out until it is first used and everything is remembered, so the mappings which
+    do not use it do not pay for it. The source data is not modified
+    """
+
+    def __init__(self, data: dict):
+        self.data = data
+        resources = data.get('Resources') if isinstance(data, dict) else None
+        parameters = data.get('Parameters') if isinstance(data, dict) else None
+        self.resources: Dict[str, dict] = resources if isinstance(resources, dict) else {}
+        self.parameters: Dict[str, dict] = parameters if isinstance(parameters, dict) else {}
+
+        self.__references: Optional[Dict[str, List[Tuple[str, str]]]] = None
+        self.__referenced_by: Optional[Dict[str, List[str]]] = None
+        self.__exports: Optional[Dict[str, object]] = None
+
+        # Values already resolved, which are kept so their ids are not reused by other objects
+        self.__resolved_refs: Dict[str, object] = {}
+        self.__resolved_values: Dict[int, Tuple[object, object]] = {}
+        self.__resolved_views: Dict[int, Tuple[object, object]] = {}
+
+    @property
+    def references(self) -> Dict[str, List[Tuple[str, str]]]:
+        if self.__references is None:
+            self.__references = self.__index_references()
+        return self.__references
+
+    @property
+    def exports(self) -> Dict[str, object]:
+        """
+        :return: The values exported by the Outputs of the templates, by the name they are imported with
+        """
+        if self.__exports is None:
+            self.__exports = self.__index_exports()
+        return self.__exports
+
+    def get_references(self, logical_id: str) -> List[Tuple[str, str]]:
+        """
+        :return: The (kind, logical id) of the resources and parameters referenced by the resource, in the order they
+        are found in it
+        """
+        return self.references.get(logical_id, [])
+
+    def get_referenced_by(self, logical_id: str) -> List[str]:
+        """
+        :return: The logical ids of the resources referencing the given resource or parameter
+        """
+        if self.__referenced_by is None:
+            self.__referenced_by = {}
+            for source_id, references in self.references.items():
+                for target_id in dict.fromkeys(target_id for _, target_id in references):
+                    self.__referenced_by.setdefault(target_id, []).append(source_id)
+
+        return self.__referenced_by.get(logical_id, [])
+
+    def resolve_ref(self, ref):
+        """
+        Resolves a Ref to the default value of the parameter or, when there is none, to the reference itself
+        :return: The value of the reference, or None if it cannot be resolved
+        """
+        if not isinstance(ref, str):
+            return None
+
+        if ref not in self.__resolved_refs:
+            try:
+                self.__resolved_refs[ref] = jmespath.search(f"Parameters.{ref}.Default || '{ref}'", self.data)
+            except Exception:
+                self.__resolved_refs[ref] = None
+
+        return self.__resolved_refs[ref]
+
+    def resolve(self, value):
+        """
+        Resolves the intrinsic functions in the value whose result is known from the templates. Refs to parameters are
+        replaced by their default values, Fn::Sub and Fn::Join by the strings they build when all their values are
+        known, and Fn::ImportValue by the value exported with its name. Anything else, like the attributes of the
+        resources, is only known once the stack is deployed, so it is kept
+        :return: The resolved value, which must not be modified, since it is shared with any other use of it
+        """
+        if not isinstance(value, (dict, list)):
+            return value
+
+        if (resolved := self.__resolved_values.get(id(value))) is None:
+            resolved = (value, self.__resolve(value))
+            self.__resolved_values[id(value)] = resolved
+
+        return resolved[1]
+
+    def get_resolved_view(self, source):
+        """
+        :return: The resolved value of a source of the mapping. When it is a resource, it also has the logical ids of
+        the resources it references in _references and of the resources referencing it in _referencedBy
+        """
+        if not isinstance(source, dict):
+            return self.resolve(source)
+
+        if (view := self.__resolved_views.get(id(source))) is None:
+            view = (source, self.__get_resolved_view(source))
+            self.__resolved_views[id(source)] = view
+
+        return view[1]
+
+    def __get_resolved_view(self, source: dict) -> dict:
+        resolved = dict(self.resolve(source))
+        logical_id = source.get('_key')
+        if isinstance(logical_id, str) and self.resources.get(logical_id) is source:
+            resolved[REFERENCES] = list(dict.fromkeys(
+                target_id for _, target_id in self.get_references(logical_id) if target_id in self.resources))
+            resolved[REFERENCED_BY] = list(self.get_referenced_by(logical_id))
+        return resolved
+
+    def __resolve(self, value):
+        if isinstance(value, list):
+            return [self.resolve(element) for element in value]
+
+        if len(value) == 1:
+            function, arguments = next(iter(value.items()))
+            if function == REF and isinstance(arguments, str) and arguments in self.parameters:
+                return self.resolve_ref(arguments)
+            if function == SUB:
+                return self.__resolve_sub(value, arguments)
+            if function == JOIN:
+                return self.__resolve_join(value, arguments)
+            if function == IMPORT_VALUE:
+                return self.__resolve_import_value(arguments)
+
+        return {key: self.resolve(element) for key, element in value.items()}
+
+    def __resolve_sub(self, value, arguments):
+        template, variables = arguments, {}
+        if isinstance(arguments, list) and len(arguments) == 2 and isinstance(arguments[1], dict):
+            template, variables = arguments[0], arguments[1]
+        if not isinstance(template, str):
+            return value
+
+        unresolved = False
+
+        def replace(match):
+            nonlocal unresolved
+            literal, name = match.groups()
+            if literal:
+                return '${' + name + '}'
+            replacement = self.resolve(variables[name]) if name in variables else \
+                self.resolve_ref(name) if name in self.parameters else None
+            if not isinstance(replacement, str):
+                unresolved = True
+                return match.group(0)
+            return replacement
+
+        result = SUB_VARIABLE.sub(replace, template)
+        return value if unresolved else result
+
+    def __resolve_join(self, value, arguments):
+        if not isinstance(arguments, list) or len(arguments) != 2 or not isinstance(arguments[0], str):
+            return value
+
+        elements = self.resolve(arguments[1])
+        if not isinstance(elements, list) or not all(isinstance(element, str) for element in elements):
+            return value
+
+        return arguments[0].join(elements)
+
+    def __resolve_import_value(self, arguments):
+        name = self.resolve(arguments)
+        if isinstance(name, str) and name in self.exports:
+            return self.resolve(self.exports[name])
+
+        return {IMPORT_VALUE: name}
+
+    def __index_exports(self) -> Dict[str, object]:
+        outputs = self.data.get('Outputs') if isinstance(self.data, dict) else None
+        exports = {}
+        for output in outputs.values() if isinstance(outputs, dict) else []:
+            export = output.get('Export') if isinstance(output, dict) else None
+            name = self.resolve(export.get('Name')) if isinstance(export, dict) else None
+            if isinstance(name, str) and 'Value' in output:
+                exports[name] = output['Value']
+        return exports
+
+    def __index_references(self) -> Dict[str, List[Tuple[str, str]]]:
+        references_by_id = {}
+        for logical_id, resource in self.resources.items():
+            references = []
+            self.__find_references(resource, references)
+            if isinstance(resource, dict):
+                self.__add_depends_on(resource.get(DEPENDS_ON), references)
+            references_by_id[logical_id] = references
+
+        logger.debug(f"CloudFormation resource graph built with {len(self.resources)} resources and "
+                     f"{sum(len(references) for references in references_by_id.values())} references")
+        return references_by_id
+
+    def __find_references(self, resource, references: List[Tuple[str, str]]):
+        pending = [resource]
+        while pending:
+            value = pending.pop()
+            if isinstance(value, list):
+                pending.extend(reversed(value))
+                continue
+            if not isinstance(value, dict):
+                continue
+
+            for function, arguments in value.items():
+                if function == REF:
+                    self.__add_reference(REF, arguments, references)
+                elif function == GET_ATT:
+                    self.__add_reference(GET_ATT, self.__get_att_logical_id(arguments), references)
+                elif function == SUB:
+                    self.__add_sub_references(arguments, references)
+
+            pending.extend(reversed(list(value.values())))
+
+    def __add_sub_references(self, arguments, references: List[Tuple[str, str]]):
+        template, variables = arguments, {}
+        if isinstance(arguments, list) and len(arguments) == 2 and isinstance(arguments[1], dict):
+            template, variables = arguments[0], arguments[1]
+        if not isinstance(template, str):
+            return
+
+        for literal, name in SUB_VARIABLE.findall(template):
+            if not literal and name not in variables:
+                self.__add_reference(SUB, name.split('.')[0], references)
+
+    def __add_depends_on(self, depends_on, references: List[Tuple[str, str]]):
+        for logical_id in depends_on if isinstance(depends_on, list) else [depends_on]:
+            self.__add_reference(DEPENDS_ON, logical_id, references)
+
+    def __add_reference(self, kind: str, logical_id, references: List[Tuple[str, str]]):
+        if isinstance(logical_id, str) and (logical_id in self.resources or logical_id in self.parameters):
+            references.append((kind, logical_id))
+
+    @staticmethod
+    def __get_att_logical_id(arguments) -> Optional[str]:
+        if isinstance(arguments, list) and arguments:
+            return arguments[0]
+        if isinstance(arguments, str):
+            return arguments.split('.')[0]
@@ -1,9 +1,22 @@
 import json
+from collections import Counter
+from string import Formatter
+from typing import Callable, Dict, Hashable, Optional, Tuple
 
 import jmespath
-from deepmerge import always_merger
 
 import sl_util.sl_util.secure_regex as re
+from sl_util.sl_util.frozen_utils import freeze
+from sl_util.sl_util.jmespath_utils import JmespathExpressionCache
+from sl_util.sl_util.merge_utils import merge_all
+from slp_cft.slp_cft.parse.mapping.cft_mapping_source_types import SEARCH_KEYS
+from slp_cft.slp_cft.parse.mapping.cft_resource_graph import CloudformationResourceGraph
+
+# Returned by the searches which do not find anything, so the search of the following key is tried
+NOT_FOUND = object()
+
+# Keys of the $numberOfSources nodes, in the order they are searched
+NUMBER_OF_SOURCES_KEYS = ["multipleSource", "oneSource"]
 
 
 class CloudformationCustomFunctions(jmespath.functions.Functions):
@@ -67,106 +80,314 @@ class CloudformationCustomFunctions(jmespath.functions.Functions):
         return new_obj
 
 
+class ReferenceIndex:
+    """
+    Index of the OTM objects by the values their source has in a $path, keeping the order of the objects. Objects can
+    be added to the threat model while it is in use, so they are indexed on every update, and the whole index is
+    built again if any of them has been removed
+    """
+
+    def __init__(self, objects: list, path: str, jmespath_expressions: JmespathExpressionCache):
+        self.objects = objects
+        self.path = path
+        self.jmespath_expressions = jmespath_expressions
+        self.indexed_objects = []
+        self.by_value: Dict[Hashable, list] = {}
+
+    def update(self):
+        size = len(self.indexed_objects)
+        if size and (size > len(self.objects) or self.objects[0] is not self.indexed_objects[0]
+                     or self.objects[size - 1] is not self.indexed_objects[-1]):
+            self.indexed_objects, self.by_value, size = [], {}, 0
+
+        for refobj in self.objects[size:]:
+            self.indexed_objects.append(refobj)
+            for value in self.__get_values(refobj):
+                self.by_value.setdefault(value, []).append(refobj)
+
+    def get(self, value: Hashable) -> list:
+        self.update()
+        return self.by_value.get(value, [])
+
+    def __get_values(self, refobj) -> list:
+        search_values = self.jmespath_expressions.search(self.path, refobj.source)
+        if not isinstance(search_values, list):
+            search_values = [search_values]
+
+        # Unhashable values can only be equal to unhashable references, which are not looked up in the index
+        return list(dict.fromkeys(value for value in search_values if isinstance(value, Hashable)))
+
+
+def get_search_keys(obj: dict) -> Tuple[str, ...]:
+    """
+    Chooses the keys of a mapping node to search by, checking them in the same order they have always been. Only
+    $lookup may not find anything, so the following key is also kept
+    """
+    keys = []
+    for key in SEARCH_KEYS:
+        if key in obj:
+            keys.append(key)
+            if key != "$lookup":
+                break
+
+    return tuple(keys)
+
+
+def compile_format(template) -> Optional[Callable[[dict], str]]:
+    """
+    Compiles a $format template whose fields are plain names, which renders it with the values of a source the same
+    way str.format does, without copying the source into keyword arguments for each component
+    :return: The function rendering the template, or None if it has any other kind of field
+    """
+    try:
+        parts = list(Formatter().parse(template))
+    except (TypeError, ValueError):
+        return None
+
+    if any(name is not None and (not name.isidentifier() or spec or conversion)
+           for _, name, spec, conversion in parts):
+        return None
+
+    def render(source: dict) -> str:
+        if not isinstance(source, dict):
+            return template.format(**source)
+        return ''.join(literal + ('' if name is None else str(source[name])) for literal, name, _, _ in parts)
+
+    return render
+
+
+class CloudformationMappingProgram:
+    """
+    Everything that only depends on the mapping, worked out once and shared by the source models of every source it is
+    applied to: the JMESPath expressions, the keys each mapping node is searched by, the $format and $numberOfSources
+    templates and the lookup table. The mapping is frozen, so it can be used from several threads at the same time
+    """
+
+    def __init__(self, mapping: dict):
+        self.mapping = freeze(mapping)
+        self.lookup = self.mapping.get("lookup", {}) if isinstance(self.mapping, dict) else {}
+        self.jmespath_options = jmespath.Options(custom_functions=CloudformationCustomFunctions())
+
+        jmespath_expressions = JmespathExpressionCache(self.jmespath_options)
+        jmespath_expressions.compile_mapping(self.mapping)
+        self.jmespath_expressions = jmespath_expressions.expressions
+
+        # Search keys, rendered $format templates and $numberOfSources nodes of each mapping node by its id, which is
+        # not reused while the program keeps the mapping
+        self.search_keys: Dict[int, Tuple[str, ...]] = {}
+        self.formats: Dict[int, Callable[[dict], str]] = {}
+        self.number_of_sources: Dict[int, Tuple[Tuple[str, object], ...]] = {}
+        self.__compile_mapping(self.mapping)
+
+    def get_search_keys(self, obj: dict) -> Optional[Tuple[str, ...]]:
+        return self.search_keys.get(id(obj))
+
+    def get_format(self, obj: dict) -> Optional[Callable[[dict], str]]:
+        return self.formats.get(id(obj))
+
+    def get_number_of_sources(self, obj: dict) -> Optional[Tuple[Tuple[str, object], ...]]:
+        return self.number_of_sources.get(id(obj))
+
+    def __compile_mapping(self, mapping):
+        pending = [mapping]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, dict):
+                self.search_keys[id(node)] = get_search_keys(node)
+                self.__compile_templates(node)
+                pending.extend(node.values())
+            elif isinstance(node, list):
+                pending.extend(node)
+
+    def __compile_templates(self, node: dict):
+        if isinstance(node.get("$format"), str) and (render := compile_format(node["$format"])) is not None:
+            self.formats[id(node)] = render
+
+        if isinstance(node.get("$numberOfSources"), dict):
+            self.number_of_sources[id(node)] = tuple(
+                (key, node["$numberOfSources"][key]) for key in NUMBER_OF_SOURCES_KEYS
+                if key in node["$numberOfSources"])
+
+
 class CloudformationSourceModel:
-    def __init__(self, data=None, otm=None):
+    def __init__(self, data=None, otm=None, program: CloudformationMappingProgram = None):
         self.data = data or {}
         self.otm = otm
-        self.lookup = {}
-        self.jmespath_options = jmespath.Options(custom_functions=CloudformationCustomFunctions())
+        # The compiled mapping being applied, if any, whose searches do not have to be compiled again
+        self.program = program
+        self.lookup = program.lookup if program else {}
+        self.jmespath_options = program.jmespath_options if program else \
+            jmespath.Options(custom_functions=CloudformationCustomFunctions())
+        self.jmespath_expressions = JmespathExpressionCache(
+            self.jmespath_options, program.jmespath_expressions if program else None)
+        # Search keys of the mapping nodes which are not in the program, which are kept so their ids are not reused
+        self.__compiled_searches: Dict[int, Tuple[object, Tuple[str, ...]]] = {}
+        # Indexes of the OTM objects by the value of a $path, for each $search type and $path
+        self.__reference_indexes: Dict[Tuple[str, str], ReferenceIndex] = {}
+        # Graph of the resources of the data, which resolves the Refs and the $resolved searches, built on first use
+        self.__resource_graph: Optional[CloudformationResourceGraph] = None
+        self.__searches: Dict[str, Callable] = {
+            "$lookup": self.__search_lookup,
+            "$skip": self.__search_nested("$skip"),
+            "$parent": self.__search_nested("$parent"),
+            "$singleton": self.__search_nested("$singleton"),
+            "$root": self.__search_root,
+            "$path": self.__search_path,
+            "$resolved": self.__search_resolved,
+            "$format": self.__search_format,
+            "$catchall": self.__search_nested("$catchall"),
+            "$children": self.__search_nested("$children"),
+            "$search": self.__search_by_reference,
+            "$findFirst": self.__search_find_first,
+            "$numberOfSources": self.__search_number_of_sources,
+            "$hub": self.__search_nested("$hub"),
+            "$ip": self.__search_nested("$ip"),
+        }
 
     def load(self, data):
-        always_merger.merge(self.data, data)
+        merge_all([self.data, data])
+        self.__resource_graph = None
 
     def json(self):
         return json.dumps(self.data, indent=2)
 
     def query(self, query):
-        return jmespath.search(query, self.data, options=self.jmespath_options)
+        return self.jmespath_expressions.search(query, self.data)
+
+    def get_resource_types(self) -> Optional[Counter]:
+        """
+        :return: The number of resources of each type, or None if any resource has no valid type
+        """
+        resources = self.data.get("Resources") if isinstance(self.data, dict) else None
+        if not isinstance(resources, dict) or not all(isinstance(resource, dict) and isinstance(
+                resource.get("Type"), str) for resource in resources.values()):
+            return None
+
+        return Counter(resource["Type"] for resource in resources.values())
+
+    def squash_resources(self):
+        """
+        Sets the _key of every resource, as the first query squashing them does
+        """
+        self.query("Resources|squash(@)")
+
+    def compile_mapping(self, mapping):
+        """
+        Compiles in advance the JMESPath expressions and the search of every node in the mapping, unless it is the
+        mapping of the program, which has already been compiled
+        """
+        if self.program and mapping is self.program.mapping:
+            return
+
+        self.jmespath_expressions.compile_mapping(mapping)
+        pending = [mapping]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, dict):
+                self.__get_search_keys(node)
+                pending.extend(node.values())
+            elif isinstance(node, list):
+                pending.extend(node)
 
     def search(self, obj, source=None):
         if isinstance(obj, str):
             return obj
 
         if isinstance(obj, list):
+            return self.__search_list(obj, source)
+
+        if isinstance(obj, dict):
+            for key in self.__get_search_keys(obj):
+                if (result := self.__searches[key](obj, source)) is not NOT_FOUND:
+                    return result
+            return obj
+
+    def __get_search_keys(self, obj: dict) -> Tuple[str, ...]:
+        if self.program and (search_keys := self.program.get_search_keys(obj)) is not None:
+            return search_keys
+
+        if (compiled_search := self.__compiled_searches.get(id(obj))) is None:
+            compiled_search = (obj, get_search_keys(obj))
+            self.__compiled_searches[id(obj)] = compiled_search
+
+        return compiled_search[1]
+
+    def __search_list(self, obj, source):
+        results = []
+        for element in obj:
+            mapping_path_value = self.search(element, source)
+            if isinstance(mapping_path_value, list):
+                results = results + mapping_path_value
+            else:
+                results = results + [str(mapping_path_value)]
+        return results
+
+    def __search_lookup(self, obj, source):
+        keys = self.search(obj["$lookup"], source)
+
+        if isinstance(keys, str):
+            return self.lookup[keys]
+        elif isinstance(keys, list):
             results = []
-            for element in obj:
-                mapping_path_value = self.search(element, source)
-                if isinstance(mapping_path_value, list):
-                    results = results + mapping_path_value
-                else:
-                    results = results + [str(mapping_path_value)]
+            for key in keys:
+                results.append(self.lookup[key])
             return results
 
-        if isinstance(obj, dict):
-            if "$lookup" in obj:
-                keys = self.search(obj["$lookup"], source)
+        return NOT_FOUND
 
-                if isinstance(keys, str):
-                    return self.lookup[keys]
-                elif isinstance(keys, list):
-                    results = []
-                    for key in keys:
-                        results.append(self.lookup[key])
-                    return results
+    def __search_nested(self, key: str) -> Callable:
+        return lambda obj, source: self.search(obj[key], source)
 
-            if "$skip" in obj:
-                return self.search(obj["$skip"], source)
+    def __search_root(self, obj, source):
+        return self.jmespath_expressions.search(obj["$root"], self.data)
 
-            if "$parent" in obj:
-                return self.search(obj["$parent"], source)
+    def __search_path(self, obj, source):
+        if "$searchParams" in obj["$path"]:
+            return self.__search_with_default(obj, source, "$path")
+        else:
+            return self.__jmespath_search(obj["$path"], source)
 
-            if "$singleton" in obj:
-                return self.search(obj["$singleton"], source)
+    def __search_format(self, obj, source):
+        if self.program and (render := self.program.get_format(obj)) is not None:
+            return render(source)
+        return obj["$format"].format(**source)
 
-            if "$root" in obj:
-                return jmespath.search(obj["$root"], self.data, options=self.jmespath_options)
+    def __search_by_reference(self, obj, source):
+        search_type = obj["$search"]["$type"]
+        ref_value = self.jmespath_expressions.search(obj["$search"]["$ref"], source)
+        objects = self.otm.objects_by_type(search_type)
 
-            if "$path" in obj:
-                if "$searchParams" in obj["$path"]:
-                    return self.__search_with_default(obj, source, "$path")
-                else:
-                    return self.__jmespath_search(obj["$path"], source)
-
-            if "$format" in obj:
-                return obj["$format"].format(**source)
-
-            if "$catchall" in obj:
-                return self.search(obj["$catchall"], source)
-
-            if "$children" in obj:
-                return self.search(obj["$children"], source)
-
-            if "$search" in obj:
-                results = []
-                search_type = obj["$search"]["$type"]
-                ref_value = jmespath.search(obj["$search"]["$ref"], source, options=self.jmespath_options)
-                for refobj in self.otm.objects_by_type(search_type):
-                    search_values = jmespath.search(obj["$search"]["$path"], refobj.source,
-                                                    options=self.jmespath_options)
-                    if isinstance(search_values, list):
-                        if ref_value in search_values:
-                            results.append(refobj.id)
-                    else:
-                        if ref_value == search_values:
-                            results.append(refobj.id)
-                return results
+        if not isinstance(ref_value, Hashable):
+            return self.__scan_by_reference(objects, obj["$search"]["$path"], ref_value)
 
-            if "$findFirst" in obj:
-                if "$searchParams" in obj["$findFirst"]:
-                    return self.__search_with_default(obj, source, "$findFirst")
-                else:
-                    return self.__find_first_search(obj["$findFirst"], source)
+        key = (search_type, obj["$search"]["$path"])
+        index = self.__reference_indexes.get(key)
+        if index is None or index.objects is not objects:
+            index = ReferenceIndex(objects, obj["$search"]["$path"], self.jmespath_expressions)
+            self.__reference_indexes[key] = index
 
-            if "$numberOfSources" in obj:
-                return self.__multiple_source_search(source, obj)
+        return [refobj.id for refobj in index.get(ref_value)]
 
-            if "$hub" in obj:
-                return self.search(obj["$hub"], source)
+    def __scan_by_reference(self, objects, path, ref_value):
+        results = []
+        for refobj in objects:
+            search_values = self.jmespath_expressions.search(path, refobj.source)
+            if isinstance(search_values, list):
+                if ref_value in search_values:
+                    results.append(refobj.id)
+            else:
+                if ref_value == search_values:
+                    results.append(refobj.id)
+        return results
 
-            if "$ip" in obj:
-                return self.search(obj["$ip"], source)
+    def __search_find_first(self, obj, source):
+        if "$searchParams" in obj["$findFirst"]:
+            return self.__search_with_default(obj, source, "$findFirst")
+        else:
+            return self.__find_first_search(obj["$findFirst"], source)
 
-            return obj
+    def __search_number_of_sources(self, obj, source):
+        return self.__multiple_source_search(source, obj)
 
     def __search_with_default(self, obj, source, action):
         try:
@@ -197,16 +418,29 @@ class CloudformationSourceModel:
 
     def __jmespath_search(self, search_path, source):
         try:
-            source_objects = jmespath.search(search_path, source, options=self.jmespath_options)
+            source_objects = self.jmespath_expressions.search(search_path, source)
             if 'Ref' in source_objects:
-                ref = source_objects['Ref']
-                return jmespath.search("Parameters." + ref + ".Default || '" + ref + "'", self.data,
-                                       options=self.jmespath_options)
+                return self.__get_resource_graph().resolve_ref(source_objects['Ref'])
             else:
                 return source_objects
         except:
             return None
 
+    def __search_resolved(self, obj, source):
+        try:
+            resolved_source = self.__get_resource_graph().get_resolved_view(source)
+            return self.jmespath_expressions.search(obj["$resolved"], resolved_source)
+        except Exception:
+            return None
+
+    def __get_resource_graph(self) -> CloudformationResourceGraph:
+        """
+        :return: The graph of the resources of the current data, which is built again if the data has been replaced
+        """
+        if self.__resource_graph is None or self.__resource_graph.data is not self.data:
+            self.__resource_graph = CloudformationResourceGraph(self.data)
+        return self.__resource_graph
+
     def __find_first_search(self, search_path_root, source):
         for search_path in search_path_root:
             search_result = self.__jmespath_search(search_path, source)
@@ -214,6 +448,9 @@ class CloudformationSourceModel:
                 return search_result
 
     def __multiple_source_search(self, source, object):
+        if self.program and (number_of_sources := self.program.get_number_of_sources(object)) is not None:
+            values = {key: self.search(node, source) for key, node in number_of_sources}
+            return values.get("oneSource"), values.get("multipleSource")
 
         single_value = None
         multiple_value = None
@@ -1,6 +1,10 @@
 import logging
 import uuid
+from typing import Dict, List
 
+from sl_util.sl_util.frozen_utils import thaw
+from sl_util.sl_util.mapping_source_types import MappingSkipMetrics
+from slp_cft.slp_cft.parse.mapping.cft_mapping_source_types import get_mapping_source_types
 from slp_cft.slp_cft.parse.mapping.mappers.cft_component_mapper import CloudformationComponentMapper
 from slp_cft.slp_cft.parse.mapping.mappers.cft_dataflow_mapper import CloudformationDataflowMapper
 from slp_cft.slp_cft.parse.mapping.mappers.cft_trustzone_mapper import CloudformationTrustzoneMapper
@@ -25,6 +29,17 @@ class ComponentLists:
         self.singleton = []
 
 
+def _get_ids(elements) -> set:
+    return {element["id"] for element in elements}
+
+
+def _group_by_type(components) -> Dict[str, List[dict]]:
+    components_by_type = {}
+    for component in components:
+        components_by_type.setdefault(component["type"], []).append(component)
+    return components_by_type
+
+
 class CloudformationTransformer:
     def __init__(self, source_model=None, threat_model=None):
         self.source_model = source_model
@@ -38,14 +53,19 @@ class CloudformationTransformer:
     def run(self, iac_mapping):
         self.iac_mapping = iac_mapping
         self.build_lookup()
+        self.compile_expressions()
         self.transform_trustzones()
         self.transform_components()
         self.transform_dataflows()
+        logger.debug(f"JMESPath expressions usage: {self.source_model.jmespath_expressions.get_metrics()}")
 
     def build_lookup(self):
         if "lookup" in self.iac_mapping:
             self.source_model.lookup = self.iac_mapping["lookup"]
 
+    def compile_expressions(self):
+        self.source_model.compile_mapping(self.iac_mapping)
+
     def transform_trustzones(self):
         logger.info("Adding trustzones")
 
@@ -58,7 +78,7 @@ class CloudformationTransformer:
                 if "$source" in mapping and isinstance(mapping["$source"], dict):
                     if "$singleton" in mapping["$source"] and trustzone_number > 0:
                         continue
-                self.threat_model.add_trustzone(**trustzone_element)
+                self.threat_model.add_trustzone(**thaw(trustzone_element))
                 num_trustzones += 1
                 logger.debug(f"Added trustzone: [{trustzone_element['name']}][{trustzone_element['id']}]")
         logger.info(f"Added {num_trustzones} trustzones successfully")
@@ -77,11 +97,24 @@ class CloudformationTransformer:
         logger.debug("Finding components")
 
         found_components = ComponentLists()
+        resource_types = self.source_model.get_resource_types()
+        metrics = MappingSkipMetrics()
 
         for mapping in self.iac_mapping["components"]:
             mapper = CloudformationComponentMapper(mapping, self.__find_default_trustzone_id())
             mapper.id_map = self.id_map
-            for component in mapper.run(self.source_model, self.id_parents):
+            if not self.__may_find_components(mapping, resource_types):
+                if not metrics.skipped:
+                    # Skipped mappings would have set the _key of the resources while squashing them
+                    self.source_model.squash_resources()
+                metrics.skip()
+                continue
+
+            metrics.start()
+            mapping_components = mapper.run(self.source_model, self.id_parents)
+            metrics.stop(len(mapping_components))
+
+            for component in mapping_components:
                 if isinstance(mapping["$source"], dict):
                     if "$skip" in mapping["$source"]:
                         found_components.skip.append(component)
@@ -94,8 +127,22 @@ class CloudformationTransformer:
                         continue
 
                 found_components.components.append(component)
+
+        logger.debug(f"Component mappings skipped by resource type: {metrics.get_metrics()}")
         return found_components
 
+    @staticmethod
+    def __may_find_components(mapping, resource_types) -> bool:
+        """
+        Mappings whose $source can only find resource types which are not in the source are not run, unless they
+        have an $altsource
+        """
+        if resource_types is None or "$altsource" in mapping:
+            return True
+
+        source_types = get_mapping_source_types(mapping.get("$source"))
+        return source_types is None or source_types.is_found_in(resource_types)
+
     def __remove_aux_data(self, components):
         for component in components:
             if "singleton_multiple_name" in component:
@@ -104,97 +151,89 @@ class CloudformationTransformer:
                 del component["singleton_multiple_tags"]
 
     def __calculate_singletons(self, components):
+        skip_ids = _get_ids(components.skip)
         results_without_singleton = \
-            self.__get_components(components.components, components.skip) + \
-            self.__get_catchall(components.catchall, components.skip)
+            self.__get_components(components.components, skip_ids) + \
+            self.__get_catchall(components.catchall, skip_ids)
 
-        return self.__get_singleton(components.singleton, components.skip, results_without_singleton)
+        return self.__get_singleton(components.singleton, skip_ids, results_without_singleton)
 
     def __add_components_to_otm(self, components):
+        trustzone_ids = _get_ids(self.iac_mapping["trustzones"])
+        component_ids = _get_ids(components)
         for component in components:
-            parent_type = self.__get_parent_type(component, components)
+            parent_type = self.__get_parent_type(component, trustzone_ids, component_ids)
             if not parent_type:
                 continue
 
             component['parent_type'] = parent_type
 
-            self.threat_model.add_component(**component)
+            self.threat_model.add_component(**thaw(component))
             logger.debug(f"Added component: [{component['name']}][{component['id']}]"
                          f"{component['tags']}" if 'tags' in component else "")
 
-    def __get_parent_type(self, component, components):
-        if component['parent'] in [trustzone["id"] for trustzone in self.iac_mapping["trustzones"]]:
+    def __get_parent_type(self, component, trustzone_ids, component_ids):
+        if component['parent'] in trustzone_ids:
             return 'trustZone'
 
-        parent_component = next(filter(lambda x: x["id"] == component['parent'], components), None)
-        if parent_component:
+        if component['parent'] in component_ids:
             return 'component'
 
-    def __get_components(self, components, skip):
+    def __get_components(self, components, skip_ids):
         results = []
         for component in components:
-            skip_this = False
-            for skip_component in skip:
-                if component["id"] == skip_component["id"]:
-                    logger.debug("Skipping component '{}'".format(component["id"]))
-                    skip_this = True
-                    break
-            if not skip_this:
+            if component["id"] in skip_ids:
+                logger.debug("Skipping component '{}'".format(component["id"]))
+            else:
                 results.append(component)
         return results
 
-    def __get_catchall(self, catchall, skip):
+    def __get_catchall(self, catchall, skip_ids):
         results = []
+        result_ids = set()
         for component in catchall:
             skip_this = False
-            for skip_component in skip:
-                if component["id"] == skip_component["id"]:
-                    logger.debug("Skipping catchall component '{}'".format(component["id"]))
-                    skip_this = True
-                    break
-            for current_component in results:
-                if component["id"] == current_component["id"]:
-                    logger.debug("Catchall component already added '{}'".format(component["id"]))
-                    skip_this = True
-                    break
+            if component["id"] in skip_ids:
+                logger.debug("Skipping catchall component '{}'".format(component["id"]))
+                skip_this = True
+            if component["id"] in result_ids:
+                logger.debug("Catchall component already added '{}'".format(component["id"]))
+                skip_this = True
             if not skip_this:
                 results.append(component)
+                result_ids.add(component["id"])
         return results
 
-    def __get_singleton(self, singleton, skip, results):
-        singleton_types_added = []
+    def __get_singleton(self, singleton, skip_ids, results):
+        results_by_type = _group_by_type(results)
+        singleton_types_added = set()
         for component in singleton:
-            skip_this = False
-            for skip_component in skip:
-                if component["id"] == skip_component["id"]:
-                    logger.debug("Skipping singleton component '{}'".format(component["id"]))
-                    skip_this = True
-                    break
-            if not skip_this:
-                if component["type"] not in singleton_types_added:
-                    results.append(component)
-                    singleton_types_added.append(component["type"])
-                else:
-                    # if the component is singleton and it already exists in otm (from a previous mapping)
-                    # no new component is generated but the existing component is updated
-                    # a)with the group name (even more if had a component name)
-                    # b)with a new tag with data from this source component
-                    for result in results:
-                        if result["type"] == component["type"]:
-                            if "singleton_multiple_name" in component:
-                                result["name"] = component["singleton_multiple_name"]
-                                self.id_map[component["name"]] = result["id"]
-
-                            # update "result" component with its multiple tags before adding tags from "component"
-                            if "singleton_multiple_tags" in result:
-                                if len(result["tags"]) <= len(result["singleton_multiple_tags"]) \
-                                        and result["tags"] is not result["singleton_multiple_tags"]:
-                                    result["tags"] = result["singleton_multiple_tags"]
-
-                            if "singleton_multiple_tags" in component:
-                                for tag in component["singleton_multiple_tags"]:
-                                    if tag not in result["tags"]:
-                                        result["tags"].append(tag)
+            if component["id"] in skip_ids:
+                logger.debug("Skipping singleton component '{}'".format(component["id"]))
+            elif component["type"] not in singleton_types_added:
+                results.append(component)
+                results_by_type.setdefault(component["type"], []).append(component)
+                singleton_types_added.add(component["type"])
+            else:
+                # if the component is singleton and it already exists in otm (from a previous mapping)
+                # no new component is generated but the existing component is updated
+                # a)with the group name (even more if had a component name)
+                # b)with a new tag with data from this source component
+                for result in results_by_type[component["type"]]:
+                    if "singleton_multiple_name" in component:
+                        result["name"] = component["singleton_multiple_name"]
+                        self.id_map[component["name"]] = result["id"]
+
+                    # update "result" component with its multiple tags before adding tags from "component"
+                    if "singleton_multiple_tags" in result:
+                        if len(result["tags"]) <= len(result["singleton_multiple_tags"]) \
+                                and result["tags"] is not result["singleton_multiple_tags"]:
+                            result["tags"] = result["singleton_multiple_tags"]
+
+                    if "singleton_multiple_tags" in component:
+                        for tag in component["singleton_multiple_tags"]:
+                            if tag not in result["tags"]:
+                                result["tags"].append(tag)
         return results
 
     def transform_dataflows(self):
@@ -204,7 +243,7 @@ class CloudformationTransformer:
             mapper = CloudformationDataflowMapper(mapping)
             mapper.id_map = self.id_map
             for dataflow in mapper.run(self.source_model, self.id_dataflows):
-                self.threat_model.add_dataflow(**dataflow)
+                self.threat_model.add_dataflow(**thaw(dataflow))
 
         self.__generate_dataflows_from_hubs()
         self.__clean_hub_dataflows()
@@ -298,7 +337,7 @@ class CloudformationTransformer:
                 return
 
         dataflow["tags"] = tags
-        self.threat_model.add_dataflow(**dataflow)
+        self.threat_model.add_dataflow(**thaw(dataflow))
 
     def __separate_hub_type_and_hub_dataflow(self, node_id):
         hub_type = None
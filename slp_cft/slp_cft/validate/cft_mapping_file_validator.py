@@ -1,10 +1,11 @@
 from slp_base.slp_base import MultipleMappingFileValidator
+from slp_base.slp_base.mapping import MAX_SIZE
 from slp_base.slp_base.schema import Schema
 
 
 class CloudformationMappingFileValidator(MultipleMappingFileValidator):
     schema_filename = 'iac_cft_mapping_schema.json'
 
-    def __init__(self, mapping_files: [bytes]):
+    def __init__(self, mapping_files: [bytes], max_size: int = MAX_SIZE):
         super(CloudformationMappingFileValidator, self).__init__(
-            Schema.from_package('slp_cft', self.schema_filename), mapping_files)
+            Schema.from_package('slp_cft', self.schema_filename), mapping_files, max_size)
@@ -1,4 +1,6 @@
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 from sl_util.sl_util.file_utils import get_file_type_by_content
 from slp_base import IacType
@@ -11,12 +13,19 @@ logger = logging.getLogger(__name__)
 MAX_SIZE = 1 * 1024 * 1024
 MIN_SIZE = 13
 
+# libmagic runs outside of the GIL, so the content types of several files are checked by threads
+PARALLEL_VALIDATION_MIN_SOURCES = 4
+PARALLEL_VALIDATION_MAX_WORKERS = os.cpu_count() or 1
+
 
 class CloudformationValidator(ProviderValidator):
 
-    def __init__(self, cloudformation_data_list: [bytes]):
+    def __init__(self, cloudformation_data_list: [bytes], max_workers: int = PARALLEL_VALIDATION_MAX_WORKERS,
+                 max_size: int = MAX_SIZE):
         super(CloudformationValidator, self).__init__()
         self.cloudformation_data_list = cloudformation_data_list
+        self.max_workers = max_workers
+        self.max_size = max_size
 
     def validate(self):
         logger.info('Validating CloudFormation file')
@@ -26,10 +35,18 @@ class CloudformationValidator(ProviderValidator):
     def __validate_size(self):
         for cft_data in self.cloudformation_data_list:
             size = len(cft_data)
-            if size > MAX_SIZE or size < MIN_SIZE:
+            if size > self.max_size or size < MIN_SIZE:
                 raise generate_size_error(IacType.CLOUDFORMATION, 'iac_file', IacFileNotValidError)
 
     def validate_content_type(self):
-        for cft_data in self.cloudformation_data_list:
-            if get_file_type_by_content(cft_data) not in IacType.CLOUDFORMATION.valid_mime:
+        for file_type in self.__get_file_types():
+            if file_type not in IacType.CLOUDFORMATION.valid_mime:
                 raise generate_content_type_error(IacType.CLOUDFORMATION, 'iac_file', IacFileNotValidError)
+
+    def __get_file_types(self):
+        workers = min(len(self.cloudformation_data_list), self.max_workers)
+        if len(self.cloudformation_data_list) < PARALLEL_VALIDATION_MIN_SOURCES or workers < 2:
+            return map(get_file_type_by_content, self.cloudformation_data_list)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(get_file_type_by_content, self.cloudformation_data_list))
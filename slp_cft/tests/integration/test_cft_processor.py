@@ -1,6 +1,7 @@
 import pytest
 
 from sl_util.sl_util.file_utils import get_byte_data
+from sl_util.sl_util.frozen_utils import FrozenDict, FrozenList
 from slp_base.slp_base.errors import OTMBuildingError, MappingFileNotValidError, IacFileNotValidError, \
     LoadingIacFileError
 from slp_base.tests.util.otm import validate_and_compare_otm, validate_and_compare
@@ -687,3 +688,95 @@ class TestCloudformationProcessor:
         # THEN the result should be the expected
         result, expected = validate_and_compare(otm, cft_components_with_trustzones_of_same_type_otm, None)
         assert result == expected
+
+    def test_streaming_processing(self):
+        # GIVEN a valid CFT file
+        cloudformation_file = get_byte_data(SAMPLE_SINGLE_VALID_CFT_FILE)
+        # AND a valid mapping file
+        mapping_file = get_byte_data(SAMPLE_VALID_MAPPING_FILE_IR)
+
+        # WHEN the method CloudformationProcessor::process is invoked in streaming mode
+        otm = CloudformationProcessor('multiple-files', 'multiple-files', [cloudformation_file],
+                                      [mapping_file], streaming=True).process()
+
+        # THEN a file with the expected otm is returned
+        result, expected = validate_and_compare_otm(otm.json(), OTM_EXPECTED_RESULT, excluded_regex)
+        assert result == expected
+
+        # AND the source data of the components is released
+        assert all(component.source is None for component in otm.components)
+
+    def test_no_frozen_values_in_otm(self):
+        # GIVEN a valid CFT file
+        cloudformation_file = get_byte_data(SAMPLE_SINGLE_VALID_CFT_FILE)
+        # AND a valid mapping file, which is kept frozen in the cache of the mappings
+        mapping_file = get_byte_data(SAMPLE_VALID_MAPPING_FILE_IR)
+
+        # WHEN the method CloudformationProcessor::process is invoked
+        otm = CloudformationProcessor(SAMPLE_ID, SAMPLE_NAME, [cloudformation_file], [mapping_file]).process()
+
+        # THEN no value of the mapping is left frozen in the elements of the OTM
+        for element in otm.trustzones + otm.components + otm.dataflows:
+            assert not _find_frozen_values(vars(element))
+
+    def test_resolved_values(self):
+        # GIVEN a CFT file whose resources are named after its parameters and reference each other
+        cloudformation_file = get_byte_data(test_resource_paths.cloudformation_resolved_values)
+        # AND a mapping file tagging the components with their resolved names and mapping their references as dataflows
+        mapping_file = get_byte_data(test_resource_paths.cloudformation_resolved_values_mapping)
+
+        # WHEN the method CloudformationProcessor::process is invoked
+        otm = CloudformationProcessor(SAMPLE_ID, SAMPLE_NAME, [cloudformation_file], [mapping_file]).process()
+
+        # THEN the components are tagged with the values of the intrinsic functions
+        tags = {component.name: component.tags for component in otm.components}
+        assert tags == {'Bucket': ['prod-data'], 'Function': ['prod-reader']}
+
+        # AND the references between the resources are mapped as dataflows
+        assert [(dataflow.source_node, dataflow.destination_node) for dataflow in otm.dataflows] == [
+            ('b61d6911-338d-46a8-9f39-8dcd24abfe91.function', 'b61d6911-338d-46a8-9f39-8dcd24abfe91.bucket')]
+
+    def test_configurable_max_size(self):
+        # GIVEN a valid CFT file bigger than the default max size
+        cloudformation_file = get_byte_data(SAMPLE_SINGLE_VALID_CFT_FILE) + b' ' * 1024 * 1024
+        # AND a valid mapping file
+        mapping_file = get_byte_data(SAMPLE_VALID_MAPPING_FILE_IR)
+
+        # WHEN the method CloudformationProcessor::process is invoked with a bigger max size
+        otm = CloudformationProcessor('multiple-files', 'multiple-files', [cloudformation_file],
+                                      [mapping_file], max_size=2 * 1024 * 1024).process()
+
+        # THEN a file with the expected otm is returned
+        result, expected = validate_and_compare_otm(otm.json(), OTM_EXPECTED_RESULT, excluded_regex)
+        assert result == expected
+
+    @pytest.mark.parametrize('nested_stacks,expected_parent', [
+        pytest.param(True, {'component': 'b61d6911-338d-46a8-9f39-8dcd24abfe91.networkstack'}, id='linked'),
+        pytest.param(False, {'trustZone': 'b61d6911-338d-46a8-9f39-8dcd24abfe91'}, id='not linked')])
+    def test_nested_stacks(self, nested_stacks, expected_parent):
+        # GIVEN a main CFT file with a nested stack whose template is another CFT file
+        main_file = get_byte_data(test_resource_paths.cloudformation_nested_stacks_main)
+        network_file = get_byte_data(test_resource_paths.cloudformation_nested_stacks_network)
+        # AND a mapping file whose components are placed inside the stack that created them
+        mapping_file = get_byte_data(test_resource_paths.cloudformation_nested_stacks_mapping)
+
+        # WHEN the method CloudformationProcessor::process is invoked with the file names of the sources
+        otm = CloudformationProcessor(
+            SAMPLE_ID, SAMPLE_NAME, [main_file, network_file], [mapping_file],
+            source_names=['cloudformation_nested_stacks_main.yaml', 'cloudformation_nested_stacks_network.yaml'],
+            nested_stacks=nested_stacks).process()
+
+        # THEN the components of the nested template are inside the stack only when the nested stacks are linked
+        parents = {component['name']: component['parent'] for component in otm.json()['components']}
+        assert parents['VPC'] == expected_parent
+        assert parents['Bucket'] == expected_parent
+
+
+def _find_frozen_values(value) -> list:
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return [value]
+    if isinstance(value, dict):
+        return [frozen for item in value.values() for frozen in _find_frozen_values(item)]
+    if isinstance(value, list):
+        return [frozen for item in value for frozen in _find_frozen_values(item)]
+    return []
@@ -0,0 +1,118 @@
+import json
+import logging
+import math
+import os
+import resource
+import subprocess
+import sys
+from io import BytesIO
+from pathlib import Path
+
+from sl_util.tests.util.benchmarks import benchmark
+from slp_cft.slp_cft.cft_processor import CloudformationProcessor
+
+logger = logging.getLogger(__name__)
+
+# Size of the CloudFormation sources processed both with and without streaming, in MB, split in files of FILE_SIZE_MB
+COMPARED_SIZE_MB = float(os.getenv('STREAMING_BENCHMARK_COMPARED_SIZE_MB', '10'))
+# Size of the CloudFormation sources whose memory is bounded in streaming mode, in MB, split in files of FILE_SIZE_MB
+BOUNDED_SIZE_MB = float(os.getenv('STREAMING_BENCHMARK_BOUNDED_SIZE_MB', '50'))
+FILE_SIZE_MB = 1
+# Growth of the peak memory allowed over growing linearly with the size of the sources
+MAX_LINEAR_GROWTH_RATIO = 1.1
+# Peak memory taken by each MB of source in streaming mode, which is around 10 MB for the sources generated here
+MAX_RSS_MB_PER_SOURCE_MB = 12
+
+ROOT_PATH = Path(__file__).parents[3]
+
+BUCKET = '"Bucket{index}": {{"Type": "AWS::S3::Bucket", "Properties": {{"BucketName": "bucket-{index}", ' \
+         '"Tags": [{{"Key": "team", "Value": "platform"}}], "VersioningConfiguration": {{"Status": "Enabled"}}}}}}'
+
+MAPPING = b"""
+trustzones:
+  - id: b61d6911-338d-46a8-9f39-8dcd24abfe91
+    name: Public Cloud
+components:
+  - id: {$path: "_key"}
+    type: s3
+    name: {$path: "_key"}
+    $source: {$root: "Resources|squash(@)[?Type=='AWS::S3::Bucket']"}
+    parent: b61d6911-338d-46a8-9f39-8dcd24abfe91
+dataflows: []
+"""
+
+
+def generate_cloudformation(size: int, first_index: int = 0) -> bytes:
+    source = BytesIO()
+    index = first_index
+    while source.tell() < size:
+        source.write(b',' if index > first_index else b'{"Resources": {')
+        source.write(BUCKET.format(index=index).encode())
+        index += 1
+    source.write(b'}}')
+    return source.getvalue()
+
+
+def get_peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def process(size_mb: float, files: int, streaming: bool) -> dict:
+    file_size = int(size_mb * 1024 * 1024 / files)
+    sources = [generate_cloudformation(file_size, first_index=index * file_size) for index in range(files)]
+    sources_rss_mb = get_peak_rss_mb()
+
+    otm = CloudformationProcessor('id', 'name', sources, [MAPPING], max_size=max(len(source) for source in sources),
+                                  streaming=streaming).process()
+
+    return {'components': len(otm.components), 'rss_mb': get_peak_rss_mb() - sources_rss_mb}
+
+
+def measure(size_mb: float, files: int = 1, streaming: bool = True) -> dict:
+    """
+    Processes the sources in a new interpreter, so the peak memory of each run is measured on its own. The memory
+    taken by the generated sources is left out
+    """
+    output = subprocess.run([sys.executable, '-m', __name__, str(size_mb), str(files), str(streaming)],
+                            cwd=ROOT_PATH, check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.splitlines()[-1])
+    logger.info(f'{size_mb} MB in {files} files, {"" if streaming else "not "}streaming: '
+                f'{result["components"]} components, peak RSS {result["rss_mb"]:.0f} MB')
+    return result
+
+
+@benchmark
+class TestStreamingMemoryBenchmark:
+
+    def test_streaming_takes_less_memory(self):
+        # GIVEN CloudFormation sources split in several files
+        files = math.ceil(COMPARED_SIZE_MB / FILE_SIZE_MB)
+
+        # WHEN they are processed with and without streaming
+        streaming = measure(COMPARED_SIZE_MB, files=files, streaming=True)
+        not_streaming = measure(COMPARED_SIZE_MB, files=files, streaming=False)
+
+        # THEN the same components are mapped
+        assert streaming['components'] == not_streaming['components']
+
+        # AND the streaming mode takes less memory
+        assert streaming['rss_mb'] < not_streaming['rss_mb']
+
+    def test_streaming_memory_is_bounded(self):
+        # GIVEN CloudFormation sources of 50 MB, split in several files, and a fifth of them
+        smaller_size_mb = BOUNDED_SIZE_MB / 5
+
+        # WHEN they are processed in streaming mode
+        smaller = measure(smaller_size_mb, files=math.ceil(smaller_size_mb / FILE_SIZE_MB))
+        result = measure(BOUNDED_SIZE_MB, files=math.ceil(BOUNDED_SIZE_MB / FILE_SIZE_MB))
+
+        # THEN the peak memory grows linearly with the size of the sources
+        assert result['rss_mb'] < MAX_LINEAR_GROWTH_RATIO * BOUNDED_SIZE_MB / smaller_size_mb * smaller['rss_mb']
+
+        # AND it is bounded by the size of the sources
+        assert result['rss_mb'] < MAX_RSS_MB_PER_SOURCE_MB * BOUNDED_SIZE_MB
+
+
+if __name__ == '__main__':
+    logging.disable(logging.CRITICAL)
+    print(json.dumps(process(float(sys.argv[1]), int(sys.argv[2]), sys.argv[3] == 'True')))
@@ -13,6 +13,8 @@ cloudformation_for_security_groups_mapping = path + \
                                              '/mapping/cloudformation_for_security_group_tests_mapping_definitions.yaml'
 cloudformation_malformed_mapping_wrong_id = path + '/mapping/cloudformation_malformed_mapping_wrong_id.yaml'
 cloudformation_mapping_iriusrisk = path + '/mapping/iriusrisk-cft-mapping.yaml'
+cloudformation_nested_stacks_mapping = path + '/mapping/cloudformation_nested_stacks_mapping.yaml'
+cloudformation_resolved_values_mapping = path + '/mapping/cloudformation_resolved_values_mapping.yaml'
 cloudformation_mapping_without_ref = path + '/mapping/iriusrisk-cft-mapping_without_ref.yaml'
 
 empty_cloudformation_mapping = path + '/mapping/empty_cloudformation_mapping.yaml'
@@ -48,6 +50,9 @@ cloudformation_with_ref_function_and_default_property_yaml = path + '/cft/cloudf
 cloudformation_with_ref_function_and_without_parameters = path + \
                                                        '/cft/cloudformation_with_ref_and_without_parameters.json'
 cloudformation_components_from_same_resource = path + '/cft/cloudformation_components_from_same_resource.json'
+cloudformation_nested_stacks_main = path + '/cft/cloudformation_nested_stacks_main.yaml'
+cloudformation_nested_stacks_network = path + '/cft/cloudformation_nested_stacks_network.yaml'
+cloudformation_resolved_values = path + '/cft/cloudformation_resolved_values.yaml'
 cloudformation_components_with_trustzones_of_same_type = \
     path + '/cft/cloudformation_components_with_trustzones_of_same_type.json'
 
@@ -1,8 +1,40 @@
 from unittest import TestCase
 from unittest.mock import patch
 
+import pytest
+import yaml
+
+from sl_util.sl_util.file_utils import get_byte_data
+from sl_util.sl_util.process_utils import submit_all
 from slp_base.slp_base.errors import LoadingIacFileError
-from slp_cft.slp_cft.load.cft_loader import CloudformationLoader
+from slp_cft.slp_cft.load.cft_loader import CloudformationLoader, CloudformationYamlLoader, \
+    PythonCloudformationYamlLoader, read_cloudformation_json, PARALLEL_LOADING_MIN_SOURCES
+from slp_cft.tests.resources import test_resource_paths
+
+SHORT_FORM_TEMPLATE = """
+Resources:
+  Instance:
+    Type: AWS::EC2::Instance
+    Condition: !Condition IsProd
+    Properties:
+      VpcId: !Ref VPC
+      SubnetId: !GetAtt Subnet.Outputs.SubnetId
+      GroupIds: [!GetAtt [SecurityGroup, GroupId]]
+      Name: !Sub '${Environment}-instance'
+      Tags: !Join ['-', [!Ref Environment, !ImportValue tags]]
+      Size: !If [IsProd, large, !FindInMap [Sizes, !Ref Environment, small]]
+      Port: 80
+"""
+
+JSON_TEMPLATE = """ {
+  "Resources": {
+    "Instance": {
+      "Type": "AWS::EC2::Instance",
+      "Properties": {"Port": 80, "Ratio": -1.5e3, "Public": true, "Private": false, "Key": null,
+                     "Tags": [{"Ref": "Environment"}, 1, ["nested", true]], "Name": "caf\\u00e9 \\/ \\"instance\\""}
+    }
+  }
+}"""
 
 
 class TestCloudformationLoader(TestCase):
@@ -24,6 +56,85 @@ class TestCloudformationLoader(TestCase):
         yaml_mock.assert_called()
         assert cft_loader.get_cloudformation() == yaml_load_result
 
+    def test_parallel_loading(self):
+        # GIVEN enough sources to be loaded in parallel
+        sources = [f'Resources:\n  VPC{index}:\n    Type: AWS::EC2::VPC\n'.encode()
+                   for index in range(PARALLEL_LOADING_MIN_SOURCES)]
+
+        # WHEN they are loaded in parallel and sequentially
+        parallel_loader = CloudformationLoader(sources, max_workers=2)
+        with patch('slp_cft.slp_cft.load.cft_loader.submit_all', wraps=submit_all) as submit_all_mock:
+            parallel_loader.load()
+        sequential_loader = CloudformationLoader(sources, max_workers=1)
+        sequential_loader.load()
+
+        # THEN the parallel loader parses them in the shared worker processes
+        submit_all_mock.assert_called_once()
+
+        # AND the Cloudformation data is the same and keeps the sources order
+        assert parallel_loader.get_cloudformation() == sequential_loader.get_cloudformation()
+        assert list(parallel_loader.get_cloudformation()['Resources']) == \
+               [f'VPC{index}' for index in range(PARALLEL_LOADING_MIN_SOURCES)]
+
+    def test_streaming_loading(self):
+        # GIVEN some sources
+        sources = [f'Resources:\n  VPC{index}:\n    Type: AWS::EC2::VPC\n'.encode()
+                   for index in range(PARALLEL_LOADING_MIN_SOURCES)]
+        expected_loader = CloudformationLoader(list(sources), max_workers=1)
+        expected_loader.load()
+
+        # WHEN they are loaded in streaming mode
+        streaming_loader = CloudformationLoader(sources, max_workers=2, streaming=True)
+        streaming_loader.load()
+
+        # THEN the Cloudformation data is the same
+        assert streaming_loader.get_cloudformation() == expected_loader.get_cloudformation()
+
+        # AND the sources of the caller are left as they were given
+        assert sources == expected_loader.sources
+
+    def test_invalid_cft_loaded_in_parallel(self):
+        # GIVEN enough sources to be loaded in parallel, one of them invalid
+        sources = [b'Resources: {}'] * (PARALLEL_LOADING_MIN_SOURCES - 1) + [b'Resources: [invalid']
+
+        # WHEN load function is called
+        # THEN a LoadingIacFileError is raised
+        with self.assertRaises(LoadingIacFileError) as loading_error:
+            CloudformationLoader(sources, max_workers=2).load()
+
+        assert str(loading_error.exception.title) == 'IaC file is not valid'
+
+    def test_nested_stacks(self):
+        # GIVEN a template with nested stacks and the template of one of them
+        sources = [PARENT_TEMPLATE, NETWORK_TEMPLATE]
+
+        # WHEN they are loaded linking the nested stacks
+        cft_loader = CloudformationLoader(sources, source_names=['stacks/main.yaml', 'stacks/network.yaml'],
+                                          nested_stacks=True)
+        cft_loader.load()
+
+        # THEN the stack is linked to the resources of its template
+        resources = cft_loader.get_cloudformation()['Resources']
+        assert resources['NetworkStack']['_nestedResources'] == ['VPC', 'Subnet']
+        assert resources['VPC']['_parentStack'] == 'NetworkStack'
+        assert resources['Subnet']['_parentStack'] == 'NetworkStack'
+
+        # AND the stacks whose template is not given are kept as they are
+        assert '_nestedResources' not in resources['UnknownStack']
+
+    def test_nested_stacks_not_linked_by_default(self):
+        # GIVEN a template with nested stacks and the template of one of them
+        sources = [PARENT_TEMPLATE, NETWORK_TEMPLATE]
+
+        # WHEN they are loaded
+        cft_loader = CloudformationLoader(sources, source_names=['main.yaml', 'network.yaml'])
+        cft_loader.load()
+
+        # THEN the stacks are not linked
+        resources = cft_loader.get_cloudformation()['Resources']
+        assert '_nestedResources' not in resources['NetworkStack']
+        assert '_parentStack' not in resources['VPC']
+
     @patch('yaml.load')
     def test_invalid_cft(self, yaml_mock):
         # GIVEN an invalid yaml source
@@ -57,3 +168,110 @@ class TestCloudformationLoader(TestCase):
         # AND an empty IaC file message is on the exception
         assert str(loading_error.exception.title) == 'IaC file is not valid'
         assert str(loading_error.exception.message) == 'IaC file is empty'
+
+PARENT_TEMPLATE = b"""
+Resources:
+  NetworkStack:
+    Type: AWS::CloudFormation::Stack
+    Properties:
+      TemplateURL: https://s3.amazonaws.com/bucket/network.yaml?versionId=1
+  UnknownStack:
+    Type: AWS::CloudFormation::Stack
+    Properties:
+      TemplateURL: https://s3.amazonaws.com/bucket/unknown.yaml
+"""
+
+NETWORK_TEMPLATE = b"""
+Resources:
+  VPC:
+    Type: AWS::EC2::VPC
+  Subnet:
+    Type: AWS::EC2::Subnet
+"""
+
+
+def load_cft_data(source) -> dict:
+    cft_loader = CloudformationLoader([source])
+    cft_loader.load()
+    return cft_loader.get_cloudformation()
+
+
+class TestCloudformationTemplateReading:
+
+    def test_short_form_intrinsic_functions(self):
+        # GIVEN a template with intrinsic functions in short form
+
+        # WHEN it is loaded
+        cft_data = load_cft_data(SHORT_FORM_TEMPLATE.encode())
+
+        # THEN the functions are read in their full form
+        # AND any other scalar is read as a string
+        assert cft_data['Resources']['Instance']['Condition'] == {'Condition': 'IsProd'}
+        assert cft_data['Resources']['Instance']['Properties'] == {
+            'VpcId': {'Ref': 'VPC'},
+            'SubnetId': {'Fn::GetAtt': ['Subnet', 'Outputs.SubnetId']},
+            'GroupIds': [{'Fn::GetAtt': ['SecurityGroup', 'GroupId']}],
+            'Name': {'Fn::Sub': '${Environment}-instance'},
+            'Tags': {'Fn::Join': ['-', [{'Ref': 'Environment'}, {'Fn::ImportValue': 'tags'}]]},
+            'Size': {'Fn::If': ['IsProd', 'large', {'Fn::FindInMap': ['Sizes', {'Ref': 'Environment'}, 'small']}]},
+            'Port': '80'
+        }
+
+    @pytest.mark.parametrize('source', [
+        pytest.param(SHORT_FORM_TEMPLATE, id='short form'),
+        pytest.param(get_byte_data(test_resource_paths.multiple_stack_plus_s3_ec2), id='multiple stack'),
+        pytest.param(get_byte_data(test_resource_paths.cloudformation_with_ref_function_and_default_property_yaml),
+                     id='ref and default')])
+    def test_libyaml_and_python_loaders_read_the_same(self, source):
+        # GIVEN a YAML template
+
+        # WHEN it is read with libyaml and with the pure Python loader
+        # THEN the results are equal
+        assert yaml.load(source, Loader=CloudformationYamlLoader) == \
+               yaml.load(source, Loader=PythonCloudformationYamlLoader)
+
+    @pytest.mark.parametrize('source', [
+        pytest.param(JSON_TEMPLATE, id='all kinds of scalars'),
+        pytest.param(get_byte_data(test_resource_paths.cloudformation_for_mappings_tests_json).decode(),
+                     id='mappings tests'),
+        pytest.param(get_byte_data(test_resource_paths.cloudformation_with_ref_function_and_default_property_json)
+                     .decode(), id='ref and default')])
+    def test_json_templates_are_read_as_yaml(self, source):
+        # GIVEN a JSON template
+
+        # WHEN it is read as JSON
+        cft_data = read_cloudformation_json(source)
+
+        # THEN it is the same as reading it as YAML
+        assert cft_data == yaml.load(source, Loader=PythonCloudformationYamlLoader)
+
+    def test_yaml_templates_starting_as_json(self):
+        # GIVEN a YAML template which looks like JSON
+        source = '{Resources: {VPC: {Type: AWS::EC2::VPC}}}'
+
+        # WHEN it is loaded
+        # THEN it is read as YAML
+        assert read_cloudformation_json(source) is None
+        assert load_cft_data(source) == {'Resources': {'VPC': {'Type': 'AWS::EC2::VPC'}}}
+
+    def test_invalid_templates_starting_as_json(self):
+        # GIVEN a template which is neither valid JSON nor valid YAML
+        source = '{"Resources": {}} trailing'
+
+        # WHEN it is loaded
+        # THEN a LoadingIacFileError is raised
+        assert read_cloudformation_json(source) is None
+        with pytest.raises(LoadingIacFileError):
+            load_cft_data(source)
+
+    def test_libyaml_errors_fall_back_to_python_loader(self):
+        # GIVEN a template with a flow mapping that libyaml does not accept
+        source = 'Resources:\n  VPC:\n    Type: AWS::EC2::VPC\n    Properties: {Tags:{Name: vpc}}\n'
+        with pytest.raises(yaml.YAMLError):
+            yaml.load(source, Loader=CloudformationYamlLoader)
+
+        # WHEN it is loaded
+        cft_data = load_cft_data(source)
+
+        # THEN it is read by the pure Python loader
+        assert cft_data == {'Resources': {'VPC': {'Type': 'AWS::EC2::VPC', 'Properties': {'Tags': {'Name': 'vpc'}}}}}
@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import yaml
+
+from slp_cft.slp_cft.parse.mapping.cft_mapping_program_cache import CloudformationMappingProgramCache, \
+    get_mapping_digest
+
+
+def create_mapping_file(name: str) -> bytes:
+    return f"components:\n  - $source: {{$root: \"Resources|squash(@)[?Type=='{name}']\"}}\n" \
+           f"    name: {{$path: _key}}\n".encode()
+
+
+def get_program(cache: CloudformationMappingProgramCache, name: str):
+    mapping_file = create_mapping_file(name)
+    return cache.get(yaml.safe_load(mapping_file), get_mapping_digest([mapping_file]))
+
+
+class TestCloudformationMappingProgramCache:
+
+    def test_same_mapping_is_compiled_once(self):
+        # GIVEN a mapping already compiled
+        cache = CloudformationMappingProgramCache()
+        program = get_program(cache, 'AWS::EC2::VPC')
+
+        # WHEN a mapping with the same content is compiled
+        # THEN the same program is returned
+        assert get_program(cache, 'AWS::EC2::VPC') is program
+
+        # AND a mapping with a different content gets its own program
+        assert get_program(cache, 'AWS::EC2::Subnet') is not program
+        assert len(cache) == 2
+
+    def test_least_recently_used_programs_are_evicted(self):
+        # GIVEN a cache with room for two programs
+        cache = CloudformationMappingProgramCache(max_entries=2)
+        first_program = get_program(cache, 'first')
+        get_program(cache, 'second')
+
+        # WHEN the first program is used again and a third one is compiled
+        get_program(cache, 'first')
+        get_program(cache, 'third')
+
+        # THEN the second program is evicted
+        assert len(cache) == 2
+        assert get_program(cache, 'first') is first_program
+
+    def test_mappings_without_digest_are_not_cached(self):
+        # GIVEN a mapping whose files are not known
+        mapping = yaml.safe_load(create_mapping_file('AWS::EC2::VPC'))
+
+        # WHEN it is compiled
+        cache = CloudformationMappingProgramCache()
+        program = cache.get(mapping)
+
+        # THEN it gets a program anyway, which is not cached
+        assert program.mapping == mapping
+        assert len(cache) == 0
+
+    def test_digest_depends_on_how_the_files_are_split(self):
+        # GIVEN the same content split in different mapping files
+        # WHEN their digests are worked out
+        # THEN they are different
+        assert get_mapping_digest([b'ab', b'c']) != get_mapping_digest([b'a', b'bc'])
+
+        # AND the same files always get the same digest, whether they are bytes or text
+        assert get_mapping_digest([b'ab', b'c']) == get_mapping_digest(['ab', 'c'])
+
+    def test_program_mapping_is_frozen(self):
+        # GIVEN a program shared by every request applying its mapping
+        program = get_program(CloudformationMappingProgramCache(), 'AWS::EC2::VPC')
+
+        # WHEN any request tries to modify the mapping
+        # THEN it is not allowed
+        with pytest.raises(TypeError):
+            program.mapping['components'].append({})
+        with pytest.raises(TypeError):
+            program.mapping['components'][0]['name'] = 'modified'
+
+    def test_programs_are_shared_across_threads(self):
+        # GIVEN a cache
+        cache = CloudformationMappingProgramCache()
+
+        # WHEN the same mapping is compiled from several threads at once
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            programs = list(executor.map(lambda _: get_program(cache, 'AWS::EC2::VPC'), range(32)))
+
+        # THEN all of them get the same program
+        assert all(program is programs[0] for program in programs)
+        assert len(cache) == 1
@@ -0,0 +1,37 @@
+import pytest
+
+from slp_cft.slp_cft.parse.mapping.cft_mapping_source_types import get_mapping_source_types
+
+
+class TestCloudformationMappingSourceTypes:
+
+    @pytest.mark.parametrize('mapping_source, types, prefixes', [
+        pytest.param({'$root': "Resources|squash(@)[?Type=='AWS::EC2::VPC']"}, {'AWS::EC2::VPC'}, set(), id='type'),
+        pytest.param({'$root': "Resources|squash(@)[?starts_with(Type, 'AWS::S3::')]"}, set(), {'AWS::S3::'},
+                     id='type prefix'),
+        pytest.param({'$singleton': {'$root': "Resources|squash(@)[?Type == 'AWS::KMS::Key']"}}, {'AWS::KMS::Key'},
+                     set(), id='singleton'),
+        pytest.param({'$catchall': {'$root': "Resources|squash(@)[?starts_with(Type, 'AWS::')]"}}, set(),
+                     {'AWS::'}, id='catchall')])
+    def test_known_types(self, mapping_source, types, prefixes):
+        # GIVEN a mapping source which can only find some resource types
+
+        # WHEN its types are calculated
+        source_types = get_mapping_source_types(mapping_source)
+
+        # THEN they are the ones in the mapping
+        assert source_types.types == types
+        assert source_types.prefixes == prefixes
+
+    @pytest.mark.parametrize('mapping_source', [
+        pytest.param({'$root': "Resources|squash(@)[?Properties.SecurityGroups]"}, id='any other query'),
+        pytest.param({'$lookup': {'$root': "Resources|squash(@)[?Type=='AWS::EC2::VPC']"}}, id='lookup'),
+        pytest.param({'$catchall': {'$root': "Resources|squash(@)[?Type=='AWS::EC2::VPC']"}, '$path': 'Resources'},
+                     id='search order is kept'),
+        pytest.param({'$type': 'AWS::EC2::VPC'}, id='unsupported function')])
+    def test_unknown_types(self, mapping_source):
+        # GIVEN a mapping source which may find resources of any type
+
+        # WHEN its types are calculated
+        # THEN they are unknown
+        assert get_mapping_source_types(mapping_source) is None
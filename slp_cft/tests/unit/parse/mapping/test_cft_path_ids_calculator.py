@@ -870,3 +870,72 @@ class TestCloudformationPathIdsCalculator:
                    '11dd4b56-7033-4a94-875a-4180a0164865'] == 'f0ba7722-39b6-4c81-8290-a30a248bb8d9.vpcssmsecuritygroup.0_0_0_0_0'
         assert path_ids[
                    'a0985c4f-4ce3-4cf5-8ac2-5da8027fc2c2'] == 'f0ba7722-39b6-4c81-8290-a30a248bb8d9.outboundsecuritygroup.255_255_255_255_32'
+
+    def test_nonexistent_parent(self):
+        # GIVEN a component with a non-existing parent
+        # AND a child of it
+        components = to_otm_components([{
+            'name': name,
+            'component_type': 'empty-component',
+            'parent_type': 'component',
+            'source': {'Type': 'AWS::EC2::Subnet', '_key': name},
+            'parent': parent,
+            'tags': [],
+            'component_id': name
+        } for name, parent in [('Subnet', 'NonExistingVPC'), ('Instance', 'Subnet')]])
+
+        # WHEN calling calculate_path_ids
+        path_ids = CloudformationPathIdsCalculator(components).calculate_path_ids()
+
+        # THEN no path_ids are returned
+        assert len(path_ids) == 0
+
+    def test_circular_parents(self):
+        # GIVEN two components which are parents of each other
+        # AND a child of one of them
+        components = to_otm_components([{
+            'name': name,
+            'component_type': 'empty-component',
+            'parent_type': 'component',
+            'source': {'Type': 'AWS::EC2::Subnet', '_key': name},
+            'parent': parent,
+            'tags': [],
+            'component_id': name
+        } for name, parent in [('a', 'b'), ('b', 'a'), ('child', 'a')]])
+
+        # WHEN calling calculate_path_ids
+        path_ids = CloudformationPathIdsCalculator(components).calculate_path_ids()
+
+        # THEN no path_ids are returned
+        assert len(path_ids) == 0
+
+    def test_deeply_nested_components(self):
+        # GIVEN a chain of components deeper than the recursion limit, from the leaf to the trustzone
+        depth = 5000
+        components = to_otm_components([{
+            'name': f'Component{level}',
+            'component_type': 'empty-component',
+            'parent_type': 'trustZone' if level == 0 else 'component',
+            'source': {'Type': 'AWS::EC2::Subnet', '_key': f'C{level}'},
+            'parent': 'tz-1' if level == 0 else f'c{level - 1}',
+            'tags': [],
+            'component_id': f'c{level}'
+        } for level in reversed(range(depth))])
+
+        # WHEN calling calculate_path_ids
+        path_ids = CloudformationPathIdsCalculator(components).calculate_path_ids()
+
+        # THEN every component has its whole path
+        assert len(path_ids) == depth
+        assert path_ids['c2'] == 'tz-1.c0.c1.c2'
+        assert path_ids[f'c{depth - 1}'].count('.') == depth
+
+    def test_same_path_ids_in_any_order(self):
+        # GIVEN the components in reverse order, so children come before their parents
+        components = list(reversed(SGS_COMPONENTS))
+
+        # WHEN calling calculate_path_ids
+        path_ids = CloudformationPathIdsCalculator(components).calculate_path_ids()
+
+        # THEN the path ids are the same as in the original order
+        assert path_ids == CloudformationPathIdsCalculator(SGS_COMPONENTS).calculate_path_ids()
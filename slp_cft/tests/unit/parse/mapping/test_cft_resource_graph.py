@@ -0,0 +1,129 @@
+import pytest
+
+from slp_cft.slp_cft.parse.mapping.cft_resource_graph import CloudformationResourceGraph
+
+TEMPLATE = {
+    'Parameters': {
+        'Environment': {'Type': 'String', 'Default': 'prod'},
+        'Port': {'Type': 'String'}
+    },
+    'Outputs': {
+        'SubnetId': {'Value': 'subnet-1234', 'Export': {'Name': {'Fn::Sub': '${Environment}-subnet'}}}
+    },
+    'Resources': {
+        'VPC': {'Type': 'AWS::EC2::VPC', 'Properties': {'Tags': [{'Key': 'env', 'Value': {'Ref': 'Environment'}}]}},
+        'SecurityGroup': {
+            'Type': 'AWS::EC2::SecurityGroup',
+            'Properties': {
+                'VpcId': {'Ref': 'VPC'},
+                'GroupName': {'Fn::Sub': '${Environment}-sg-${!Literal}'},
+                'SecurityGroupIngress': [{'FromPort': {'Ref': 'Port'}, 'CidrIp': {'Ref': 'AWS::NoValue'}}]
+            }
+        },
+        'Instance': {
+            'Type': 'AWS::EC2::Instance',
+            'DependsOn': 'VPC',
+            'Properties': {
+                'SecurityGroupIds': [{'Fn::GetAtt': ['SecurityGroup', 'GroupId']}],
+                'SubnetId': {'Fn::ImportValue': {'Fn::Join': ['-', [{'Ref': 'Environment'}, 'subnet']]}},
+                'UserData': {'Fn::Sub': ['${Name} on ${Url}', {'Name': 'app', 'Url': {'Fn::GetAtt': 'VPC.CidrBlock'}}]}
+            }
+        }
+    }
+}
+
+
+class TestCloudformationResourceGraph:
+
+    def test_references(self):
+        # GIVEN a CloudFormation template
+
+        # WHEN its resource graph is built
+        graph = CloudformationResourceGraph(TEMPLATE)
+
+        # THEN the references to resources and parameters of each resource are indexed in order
+        assert graph.get_references('VPC') == [('Ref', 'Environment')]
+        assert graph.get_references('SecurityGroup') == [('Ref', 'VPC'), ('Fn::Sub', 'Environment'), ('Ref', 'Port')]
+        assert graph.get_references('Instance') == [('Fn::GetAtt', 'SecurityGroup'), ('Ref', 'Environment'),
+                                                    ('Fn::GetAtt', 'VPC'), ('DependsOn', 'VPC')]
+        assert graph.get_references('Unknown') == []
+
+        # AND the resources referencing each one are known
+        assert graph.get_referenced_by('VPC') == ['SecurityGroup', 'Instance']
+        assert graph.get_referenced_by('Environment') == ['VPC', 'SecurityGroup', 'Instance']
+
+        # AND the exports of the templates are indexed by their resolved names
+        assert graph.exports == {'prod-subnet': 'subnet-1234'}
+
+    @pytest.mark.parametrize('ref,value', [
+        pytest.param('Environment', 'prod', id='parameter with default'),
+        pytest.param('Port', 'Port', id='parameter without default'),
+        pytest.param('VPC', 'VPC', id='resource'),
+        pytest.param('AWS::Region', None, id='pseudo parameter'),
+        pytest.param(['Environment'], None, id='not a name')])
+    def test_resolve_ref(self, ref, value):
+        # GIVEN the resource graph of a CloudFormation template
+        graph = CloudformationResourceGraph(TEMPLATE)
+
+        # WHEN a reference is resolved
+        # THEN its value is the default of the parameter or the reference itself
+        assert graph.resolve_ref(ref) == value
+
+    def test_resolve(self):
+        # GIVEN the resource graph of a CloudFormation template
+        graph = CloudformationResourceGraph(TEMPLATE)
+        properties = TEMPLATE['Resources']['Instance']['Properties']
+
+        # WHEN the intrinsic functions of the resources are resolved
+        # THEN the parameters are replaced by their values
+        assert graph.resolve(TEMPLATE['Resources']['VPC']['Properties']) == {
+            'Tags': [{'Key': 'env', 'Value': 'prod'}]}
+        assert graph.resolve({'Fn::Sub': '${Environment}-sg-${!Literal}'}) == 'prod-sg-${Literal}'
+        assert graph.resolve(properties['SubnetId']) == 'subnet-1234'
+        assert graph.resolve({'Fn::ImportValue': {'Fn::Sub': '${VPC.CidrBlock}-subnet'}}) == \
+               {'Fn::ImportValue': {'Fn::Sub': '${VPC.CidrBlock}-subnet'}}
+
+        # AND the values which are not known until the stack is deployed are kept
+        assert graph.resolve(properties['UserData']) == properties['UserData']
+        assert graph.resolve({'Ref': 'VPC'}) == {'Ref': 'VPC'}
+        assert graph.resolve({'Fn::Join': [',', [{'Ref': 'Port'}, {'Ref': 'AWS::Region'}]]}) == \
+               {'Fn::Join': [',', [{'Ref': 'Port'}, {'Ref': 'AWS::Region'}]]}
+
+        # AND the same value is resolved just once
+        assert graph.resolve(properties) is graph.resolve(properties)
+
+        # AND the template is not modified
+        assert properties['SubnetId'] == {'Fn::ImportValue': {'Fn::Join': ['-', [{'Ref': 'Environment'}, 'subnet']]}}
+
+    def test_invalid_template(self):
+        # GIVEN a template without valid resources nor parameters
+
+        # WHEN its resource graph is built
+        graph = CloudformationResourceGraph({'Resources': 'invalid', 'Parameters': ['invalid']})
+
+        # THEN it has no references nor exports
+        assert graph.references == {}
+        assert graph.exports == {}
+        assert graph.resolve_ref('Environment') == 'Environment'
+
+    def test_resolved_view(self):
+        # GIVEN the resource graph of a CloudFormation template whose resources have their logical ids in _key
+        template = {**TEMPLATE, 'Resources': {logical_id: {**resource, '_key': logical_id}
+                                              for logical_id, resource in TEMPLATE['Resources'].items()}}
+        graph = CloudformationResourceGraph(template)
+
+        # WHEN the resolved view of a resource is got
+        view = graph.get_resolved_view(template['Resources']['SecurityGroup'])
+
+        # THEN its intrinsic functions are resolved
+        assert view['Properties']['GroupName'] == 'prod-sg-${Literal}'
+        assert view['Properties']['VpcId'] == {'Ref': 'VPC'}
+        # AND it has the resources it references and the ones referencing it
+        assert view['_references'] == ['VPC']
+        assert view['_referencedBy'] == ['Instance']
+        # AND the view is only built once
+        assert graph.get_resolved_view(template['Resources']['SecurityGroup']) is view
+
+        # AND the views of other sources are only resolved
+        assert graph.get_resolved_view({'Name': {'Ref': 'Environment'}}) == {'Name': 'prod'}
+        assert graph.get_resolved_view('Environment') == 'Environment'
@@ -0,0 +1,221 @@
+from unittest.mock import patch
+
+import jmespath
+import pytest
+
+from otm.otm.otm_builder import OTMBuilder
+from slp_base.slp_base.provider_type import IacType
+from slp_cft.slp_cft.parse.mapping.cft_sourcemodel import CloudformationSourceModel, CloudformationMappingProgram
+
+SOURCE = {'_key': 'VPC', 'Type': 'AWS::EC2::VPC', 'Properties': {'CidrBlock': '10.0.0.0/16'}}
+SEARCH_BY_GROUP = {'$search': {'$type': 'component', '$ref': 'group', '$path': 'groups'}}
+PARAMETERS = {'Parameters': {'Environment': {'Type': 'String', 'Default': 'prod'}, 'Port': {'Type': 'String'}}}
+
+
+def add_component(otm, component_id, groups):
+    otm.add_component(component_id, component_id, 'empty-component', 'tz', 'trustZone', source={'groups': groups})
+
+
+def scan_by_reference(otm, ref_value):
+    return [component.id for component in otm.components
+            if (ref_value in component.source['groups'] if isinstance(component.source['groups'], list)
+                else ref_value == component.source['groups'])]
+
+
+class TestCloudformationSourceModel:
+
+    def test_search_mapping_nodes(self):
+        # GIVEN a source model
+        source_model = CloudformationSourceModel({'Resources': {'VPC': {'Type': 'AWS::EC2::VPC'}}})
+
+        # WHEN mapping nodes of every kind are searched
+        # THEN the results are the same as interpreting them
+        assert source_model.search('literal', SOURCE) == 'literal'
+        assert source_model.search({'$path': '_key'}, SOURCE) == 'VPC'
+        assert source_model.search([{'$path': '_key'}, 'literal'], SOURCE) == ['VPC', 'literal']
+        assert source_model.search({'$format': '{_key}-{Type}'}, SOURCE) == 'VPC-AWS::EC2::VPC'
+        assert source_model.search({'$skip': {'$path': 'Type'}}, SOURCE) == 'AWS::EC2::VPC'
+        assert source_model.search({'$unknown': 'value'}, SOURCE) == {'$unknown': 'value'}
+        assert source_model.search(5, SOURCE) is None
+        assert source_model.search({'$root': "Resources|squash(@)"})[0]['_key'] == 'VPC'
+
+    def test_search_keys_order(self):
+        # GIVEN a source model
+        source_model = CloudformationSourceModel()
+        source_model.lookup = {'VPC': 'vpc'}
+
+        # WHEN mapping nodes with several keys are searched
+        # THEN the first key of the search order is used
+        assert source_model.search({'$format': '{Type}', '$path': '_key'}, SOURCE) == 'VPC'
+        assert source_model.search({'$lookup': {'$path': '_key'}, '$format': '{Type}'}, SOURCE) == 'vpc'
+
+        # AND the following key is used when $lookup does not find any key
+        assert source_model.search({'$lookup': {'$path': 'Properties'}, '$format': '{Type}'}, SOURCE) \
+            == 'AWS::EC2::VPC'
+        assert source_model.search({'$lookup': {'$path': 'Properties'}}, SOURCE) == {'$lookup': {'$path': 'Properties'}}
+
+    def test_compile_mapping(self):
+        # GIVEN a mapping compiled in advance
+        source_model = CloudformationSourceModel()
+        mapping = {'components': [{'$source': {'$skip': {'$path': 'Type'}}, 'name': {'$path': '_key'}}]}
+        source_model.compile_mapping(mapping)
+
+        # WHEN its nodes are searched
+        # THEN the results are the same as searching them directly
+        assert source_model.search(mapping['components'][0]['$source'], SOURCE) == 'AWS::EC2::VPC'
+        assert source_model.search(mapping['components'][0]['name'], SOURCE) == 'VPC'
+
+    def test_search_with_mapping_program(self):
+        # GIVEN a mapping program
+        mapping = {'lookup': {'VPC': 'vpc', 'OtherVPC': 'other-vpc'},
+                   'components': [{'$source': {'$root': "Resources|squash(@)"}, 'name': {'$path': '_key'},
+                                   'type': {'$lookup': {'$path': '_key'}}}]}
+        program = CloudformationMappingProgram(mapping)
+
+        # AND two source models sharing it
+        source_models = [CloudformationSourceModel({'Resources': {name: {'Type': 'AWS::EC2::VPC'}}}, program=program)
+                         for name in ['VPC', 'OtherVPC']]
+
+        # WHEN the nodes of the mapping applied by the program are searched
+        # THEN each source model searches its own data with the lookup of the mapping
+        component = program.mapping['components'][0]
+        for source_model, name, component_type in zip(source_models, ['VPC', 'OtherVPC'], ['vpc', 'other-vpc']):
+            source = source_model.search(component['$source'])[0]
+            assert source_model.search(component['name'], source) == name
+            assert source_model.search(component['type'], source) == component_type
+
+        # AND the expressions of the program are not compiled again nor modified
+        assert all(source_model.jmespath_expressions.misses == 0 for source_model in source_models)
+        assert set(program.jmespath_expressions) == {'Resources|squash(@)', '_key'}
+
+    @pytest.mark.parametrize('template', [
+        pytest.param('{_key}-{Type}', id='names'),
+        pytest.param('{{literal}} {_key}', id='escaped braces'),
+        pytest.param('{Properties}', id='not a string'),
+        pytest.param('no fields', id='no fields'),
+        pytest.param('{_key!r}', id='conversion'),
+        pytest.param('{_key:>8}', id='format spec'),
+        pytest.param('{Properties[Name]}', id='index')])
+    def test_search_format_with_mapping_program(self, template):
+        # GIVEN a mapping program with a $format template
+        program = CloudformationMappingProgram({'components': [{'name': {'$format': template}}]})
+        node = program.mapping['components'][0]['name']
+        source = {'_key': 'VPC', 'Type': 'AWS::EC2::VPC', 'Properties': {'Name': 'vpc'}}
+
+        # WHEN it is searched with and without the program
+        # THEN the result is the same as the one of str.format
+        assert CloudformationSourceModel(program=program).search(node, source) == template.format(**source)
+        assert CloudformationSourceModel().search(node, source) == template.format(**source)
+
+    @pytest.mark.parametrize('number_of_sources', [
+        pytest.param({'oneSource': {'$path': '_key'}, 'multipleSource': {'$format': '{_key}s'}}, id='both'),
+        pytest.param({'multipleSource': {'$path': '_key'}}, id='multiple source'),
+        pytest.param({}, id='none')])
+    def test_search_number_of_sources_with_mapping_program(self, number_of_sources):
+        # GIVEN a mapping program with a $numberOfSources node
+        program = CloudformationMappingProgram({'components': [{'name': {'$numberOfSources': number_of_sources}}]})
+        node = program.mapping['components'][0]['name']
+
+        # WHEN it is searched with and without the program
+        # THEN the values for one and multiple sources are the same
+        assert CloudformationSourceModel(program=program).search(node, SOURCE) == \
+               CloudformationSourceModel().search(node, SOURCE)
+
+    @pytest.mark.parametrize('ref_value', [
+        pytest.param('web', id='in lists'),
+        pytest.param('db', id='in lists and values'),
+        pytest.param(None, id='no value'),
+        pytest.param(1, id='number'),
+        pytest.param({'name': 'web'}, id='unhashable'),
+        pytest.param('unknown', id='not found')])
+    def test_search_by_reference(self, ref_value):
+        # GIVEN a threat model whose components have all kinds of values in the searched path
+        otm = OTMBuilder('id', 'name', IacType.CLOUDFORMATION).build()
+        for component_id, groups in [('c1', ['web', 'db', 'web']), ('c2', 'db'), ('c3', None), ('c4', [1, 'web']),
+                                     ('c5', {'name': 'web'}), ('c6', [{'name': 'web'}, 'db'])]:
+            add_component(otm, component_id, groups)
+        source_model = CloudformationSourceModel(otm=otm)
+
+        # WHEN the components are searched by reference
+        # THEN the ids found are the ones comparing every component, in the same order
+        assert source_model.search(SEARCH_BY_GROUP, {'group': ref_value}) == scan_by_reference(otm, ref_value)
+
+    def test_search_by_reference_after_updating_objects(self):
+        # GIVEN a threat model already searched by reference
+        otm = OTMBuilder('id', 'name', IacType.CLOUDFORMATION).build()
+        add_component(otm, 'c1', ['web'])
+        add_component(otm, 'c2', 'web')
+        source_model = CloudformationSourceModel(otm=otm)
+        assert source_model.search(SEARCH_BY_GROUP, {'group': 'web'}) == ['c1', 'c2']
+
+        # WHEN components are added
+        add_component(otm, 'c3', ['web'])
+        # THEN they are also found
+        assert source_model.search(SEARCH_BY_GROUP, {'group': 'web'}) == ['c1', 'c2', 'c3']
+
+        # WHEN components are removed
+        otm.components.pop(1)
+        add_component(otm, 'c4', ['db'])
+        # THEN they are not found anymore
+        assert source_model.search(SEARCH_BY_GROUP, {'group': 'web'}) == ['c1', 'c3']
+
+        # WHEN the id of a component changes
+        otm.components[0].id = 'path-c1'
+        # THEN the current id is found
+        assert source_model.search(SEARCH_BY_GROUP, {'group': 'web'}) == ['path-c1', 'c3']
+
+    @pytest.mark.parametrize('ref,value', [
+        pytest.param('Environment', 'prod', id='parameter with default'),
+        pytest.param('Port', 'Port', id='parameter without default'),
+        pytest.param('VPC', 'VPC', id='resource'),
+        pytest.param('AWS::Region', None, id='pseudo parameter'),
+        pytest.param(['Environment'], None, id='not a name')])
+    def test_search_ref(self, ref, value):
+        # GIVEN a source model of a template with parameters
+        source_model = CloudformationSourceModel(PARAMETERS)
+
+        # WHEN a path to a Ref is searched
+        # THEN its value is the default of the parameter or the reference itself
+        assert source_model.search({'$path': 'Properties.VpcId'}, {'Properties': {'VpcId': {'Ref': ref}}}) == value
+        assert source_model.search({'$findFirst': ['Properties.Missing', 'Properties.VpcId']},
+                                   {'Properties': {'VpcId': {'Ref': ref}}}) == value
+
+    def test_ref_is_resolved_once(self):
+        # GIVEN a source model of a template with parameters
+        source_model = CloudformationSourceModel(PARAMETERS)
+        source = {'Properties': {'Tag': {'Ref': 'Environment'}}}
+
+        with patch('slp_cft.slp_cft.parse.mapping.cft_resource_graph.jmespath.search', wraps=jmespath.search) as search:
+            # WHEN the same Ref is searched several times
+            for _ in range(3):
+                assert source_model.search({'$path': 'Properties.Tag'}, source) == 'prod'
+
+            # THEN it is only resolved once
+            assert search.call_count == 1
+
+            # AND it is resolved again once the data is replaced
+            source_model.data = {'Parameters': {'Environment': {'Default': 'dev'}}}
+            assert source_model.search({'$path': 'Properties.Tag'}, source) == 'dev'
+            assert search.call_count == 2
+
+    def test_search_resolved(self):
+        # GIVEN a source model of a template with parameters and resources referencing each other
+        source_model = CloudformationSourceModel({
+            **PARAMETERS,
+            'Resources': {
+                'VPC': {'Type': 'AWS::EC2::VPC'},
+                'SecurityGroup': {'Type': 'AWS::EC2::SecurityGroup', 'Properties': {
+                    'VpcId': {'Ref': 'VPC'}, 'GroupName': {'Fn::Sub': '${Environment}-sg'}}}}})
+        source_model.squash_resources()
+        source = source_model.data['Resources']['SecurityGroup']
+
+        # WHEN a path of the resource is searched in its resolved view
+        # THEN the intrinsic functions are resolved
+        assert source_model.search({'$resolved': 'Properties.GroupName'}, source) == 'prod-sg'
+        # AND the resources it references and the ones referencing it are known
+        assert source_model.search({'$resolved': '_references'}, source) == ['VPC']
+        assert source_model.search({'$resolved': '_referencedBy'}, source_model.data['Resources']['VPC']) == \
+               ['SecurityGroup']
+
+        # AND the raw values are still searched with $path
+        assert source_model.search({'$path': 'Properties.GroupName'}, source) == {'Fn::Sub': '${Environment}-sg'}
@@ -2,7 +2,7 @@ from unittest import TestCase
 from unittest.mock import patch
 
 from slp_base.slp_base.errors import IacFileNotValidError
-from slp_cft.slp_cft.validate.cft_validator import CloudformationValidator
+from slp_cft.slp_cft.validate.cft_validator import CloudformationValidator, PARALLEL_VALIDATION_MIN_SOURCES
 
 VALID_MIME = 'text/plain'
 MIN_SIZE = 13
@@ -42,6 +42,20 @@ class TestCloudformationValidator(TestCase):
         assert validation_error.exception.title == 'CloudFormation file is not valid'
         assert validation_error.exception.message == 'Provided iac_file is not valid. Invalid size'
 
+    @patch('magic.Magic.from_buffer')
+    def test_configurable_max_size(self, mime_checker_mock):
+        # GIVEN a source bigger than the default max size
+        source = create_cloudformation_file_data(size=MAX_SIZE + 1)
+
+        # AND a mock for the mime checker returning a valid MIME
+        mime_checker_mock.side_effect = [VALID_MIME]
+
+        # WHEN the validate method with a bigger max size
+        CloudformationValidator([source], max_size=2 * MAX_SIZE).validate()
+
+        # THEN file is checked and no exception raised
+        mime_checker_mock.assert_called()
+
     @patch('magic.Magic.from_buffer')
     def test_invalid_mime_type_file(self, mime_checker_mock):
         # GIVEN a TF source with right size
@@ -58,3 +72,19 @@ class TestCloudformationValidator(TestCase):
         # AND the right info is in the exception
         assert validation_error.exception.title == 'CloudFormation file is not valid'
         assert validation_error.exception.message == 'Invalid content type for iac_file'
+
+    @patch('magic.Magic.from_buffer')
+    def test_parallel_validation(self, mime_checker_mock):
+        # GIVEN enough sources to be validated in parallel, one of them with an invalid MIME
+        sources = [create_cloudformation_file_data(size=100 + index)
+                   for index in range(PARALLEL_VALIDATION_MIN_SOURCES)]
+        mime_checker_mock.side_effect = lambda data: 'Invalid MIME' if len(data) == 102 else VALID_MIME
+
+        # WHEN the validate method
+        # THEN an IacFileNotValidError is raised
+        with self.assertRaises(IacFileNotValidError) as validation_error:
+            CloudformationValidator(sources, max_workers=2).validate()
+
+        # AND every file is checked
+        assert mime_checker_mock.call_count == PARALLEL_VALIDATION_MIN_SOURCES
+        assert validation_error.exception.message == 'Invalid content type for iac_file'
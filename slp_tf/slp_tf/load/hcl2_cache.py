@@ -0,0 +1,120 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024  # 64MB of pickled parsed data
+CACHE_FILE_EXTENSION = '.hcl2.pickle'
+
+
+def get_source_digest(source: Union[str, bytes]) -> str:
+    data = source.encode() if isinstance(source, str) else source
+    return hashlib.sha256(data).hexdigest()
+
+
+class Hcl2Cache:
+    """
+    Size-bounded LRU cache of parsed HCL2 data keyed by the content hash of the source file.
+    Entries are stored pickled, so every hit returns a fresh copy that the loader is free to modify.
+    When a cache_dir is given, entries are also persisted there and reused across processes.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, cache_dir: str = None):
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+
+        self.__entries: OrderedDict = OrderedDict()
+        self.__size = 0
+        self.__lock = Lock()
+
+    def get(self, digest: str) -> Optional[dict]:
+        with self.__lock:
+            pickled_data = self.__entries.get(digest)
+            if pickled_data is not None:
+                self.__entries.move_to_end(digest)
+
+        if pickled_data is None:
+            pickled_data = self.__read_from_disk(digest)
+            if pickled_data is None:
+                return None
+            self.__store(digest, pickled_data)
+
+        try:
+            return pickle.loads(pickled_data)
+        except Exception as e:
+            logger.warning(f'Discarding unreadable cached data for {digest}: {e}')
+            self.__discard(digest)
+            return None
+
+    def put(self, digest: str, data: dict):
+        pickled_data = self.__dumps(data)
+        self.__store(digest, pickled_data)
+        self.__write_to_disk(digest, pickled_data)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, digest: str):
+        return digest in self.__entries
+
+    def __store(self, digest: str, pickled_data: bytes):
+        if len(pickled_data) > self.max_size:
+            logger.debug(f'Parsed data for {digest} exceeds the cache size and will not be cached in memory')
+            return
+
+        with self.__lock:
+            self.__remove(digest)
+            self.__entries[digest] = pickled_data
+            self.__size += len(pickled_data)
+
+            while self.__size > self.max_size:
+                _, evicted = self.__entries.popitem(last=False)
+                self.__size -= len(evicted)
+
+    @staticmethod
+    def __dumps(data: dict) -> bytes:
+        return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __discard(self, digest: str):
+        with self.__lock:
+            self.__remove(digest)
+
+    def __remove(self, digest: str):
+        if digest in self.__entries:
+            self.__size -= len(self.__entries.pop(digest))
+
+    def __get_cache_file(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, digest + CACHE_FILE_EXTENSION)
+
+    def __read_from_disk(self, digest: str) -> Optional[bytes]:
+        if not self.cache_dir:
+            return None
+
+        try:
+            with open(self.__get_cache_file(digest), 'rb') as cache_file:
+                return cache_file.read()
+        except OSError:
+            return None
+
+    def __write_to_disk(self, digest: str, pickled_data: bytes):
+        if not self.cache_dir:
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, delete=False) as tmp_file:
+                tmp_file.write(pickled_data)
+            os.replace(tmp_file.name, self.__get_cache_file(digest))
+        except OSError as e:
+            logger.warning(f'Unable to persist parsed data for {digest} in {self.cache_dir}: {e}')
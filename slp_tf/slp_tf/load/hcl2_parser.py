@@ -0,0 +1,434 @@
+import re
+import sys
+from typing import Any, Dict, List, Tuple
+
+# Only linear-time patterns are matched with regular expressions.
+# Strings, heredocs and comments are scanned by hand to avoid backtracking on malformed input.
+SIMPLE_TOKEN_REGEX = re.compile(
+    r'(?P<WS>[ \t]+)'
+    r'|(?P<NUMBER>[0-9]+)'
+    r'|(?P<IDENTIFIER>[a-zA-Z_][a-zA-Z0-9_-]*)'
+    r'|(?P<PUNCTUATION>\[\*\]|\.\.\.|\.\*|=>|==|!=|<=|>=|&&|\|\||[-+*/%<>!=?:,.(){}\[\]])'
+)
+HEREDOC_TAG_REGEX = re.compile(r'<<(-?)([a-zA-Z][a-zA-Z0-9._-]+)\n')
+
+NL = 'NL'
+EOF = 'EOF'
+STRING = 'STRING'
+HEREDOC = 'HEREDOC'
+NUMBER = 'NUMBER'
+IDENTIFIER = 'IDENTIFIER'
+
+BINARY_OPERATORS = {'==', '!=', '<', '>', '<=', '>=', '-', '*', '/', '%', '&&', '||', '+'}
+UNARY_OPERATORS = {'-', '!'}
+HEREDOC_TRIM_CHARS = '\n\t '
+
+Token = Tuple[str, str, int]
+
+
+class HclSyntaxError(ValueError):
+    def __init__(self, message: str, line: int):
+        super().__init__(f'{message} at line {line}')
+        self.line = line
+
+
+def loads(text: str) -> dict:
+    """
+    Parses the given HCL2 text into the same dict python-hcl2 builds for it.
+    Expressions are kept as strings the way python-hcl2 does: attribute values, tuple items and object values
+    that are not literals are wrapped in ${}, and strings keep their escape sequences unprocessed.
+    """
+    return Hcl2Parser(tokenize(text + '\n')).parse()
+
+
+def tokenize(text: str) -> List[Token]:
+    tokens = []
+    pos, line, length = 0, 1, len(text)
+
+    while pos < length:
+        char = text[pos]
+
+        if char == '\n' or char == '#' or text.startswith('//', pos):
+            # Comments are new lines, and consecutive new lines are a single token
+            end = text.find('\n', pos) + 1
+            if end == 0:
+                raise HclSyntaxError('Unterminated comment', line)
+            if not tokens or tokens[-1][0] != NL:
+                tokens.append((NL, '\n', line))
+            line += 1
+            pos = end
+        elif text.startswith('/*', pos):
+            end = text.find('*/', pos + 2)
+            if end == -1:
+                raise HclSyntaxError('Unterminated comment', line)
+            line += text.count('\n', pos, end)
+            pos = end + 2
+        elif char == '"':
+            end = _scan_string(text, pos, line)
+            tokens.append((STRING, text[pos:end], line))
+            line += text.count('\n', pos, end)
+            pos = end
+        elif text.startswith('<<', pos) and (heredoc := HEREDOC_TAG_REGEX.match(text, pos)):
+            end = text.find(heredoc.group(2), heredoc.end())
+            if end == -1:
+                raise HclSyntaxError('Unterminated heredoc', line)
+            content = text[heredoc.end():end].rstrip(HEREDOC_TRIM_CHARS)
+            if heredoc.group(1):
+                content = _trim_heredoc(content)
+            tokens.append((HEREDOC, f'"{content}"', line))
+            line += text.count('\n', pos, end)
+            pos = end + len(heredoc.group(2))
+        else:
+            match = SIMPLE_TOKEN_REGEX.match(text, pos)
+            if not match:
+                raise HclSyntaxError(f'Unexpected character {char!r}', line)
+            kind = match.lastgroup
+            if kind == 'PUNCTUATION':
+                tokens.append((match.group(), match.group(), line))
+            elif kind != 'WS':
+                tokens.append((kind, match.group(), line))
+            pos = match.end()
+
+    tokens.append((EOF, '', line))
+    return tokens
+
+
+def _scan_string(text: str, pos: int, line: int) -> int:
+    """Returns the position after the closing quote of the string starting at pos"""
+    pos += 1
+    length = len(text)
+    while pos < length:
+        char = text[pos]
+        if char == '"':
+            return pos + 1
+        if char == '\\':
+            if pos + 1 >= length or text[pos + 1] == '\n':
+                break
+            pos += 2
+        elif text.startswith('${', pos):
+            pos = _scan_interpolation(text, pos, line)
+        else:
+            pos += 1
+    raise HclSyntaxError('Unterminated string', line)
+
+
+def _scan_interpolation(text: str, pos: int, line: int) -> int:
+    """Returns the position after the closing brace of the interpolation starting at pos"""
+    start = pos
+    pos += 2
+    length = len(text)
+    while pos < length:
+        if text[pos] == '}' and pos > start + 2:
+            return pos + 1
+        if text.startswith('${', pos):
+            end = text.find('}', pos + 2)
+            if end == -1 or end == pos + 2:
+                break
+            pos = end + 1
+        elif text[pos] == '}':
+            break
+        else:
+            pos += 1
+    raise HclSyntaxError('Invalid interpolation', line)
+
+
+def _trim_heredoc(content: str) -> str:
+    lines = content.split('\n')
+    min_spaces = sys.maxsize
+    for line in lines:
+        min_spaces = min(min_spaces, len(line) - len(line.lstrip(' ')))
+    return '\n'.join(line[min_spaces:] for line in lines)
+
+
+def to_string_dollar(value: Any) -> Any:
+    if isinstance(value, str):
+        if value.startswith('"') and value.endswith('"'):
+            return value[1:-1]
+        return f'${{{value}}}'
+    return value
+
+
+def strip_quotes(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith('"') and value.endswith('"'):
+        return value[1:-1]
+    return value
+
+
+class Hcl2Parser:
+    """
+    Recursive descent parser for the HCL2 subset used by Terraform.
+    It follows the python-hcl2 grammar, building every value the same way its transformer does.
+    """
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def parse(self) -> dict:
+        return self.__body(EOF)
+
+    def __peek(self, offset: int = 0) -> str:
+        return self.tokens[self.pos + offset][0]
+
+    def __next(self) -> str:
+        value = self.tokens[self.pos][1]
+        self.pos += 1
+        return value
+
+    def __expect(self, kind: str) -> str:
+        if self.__peek() != kind:
+            self.__fail(f'Expected {kind!r}')
+        return self.__next()
+
+    def __skip_new_lines(self):
+        if self.__peek() == NL:
+            self.pos += 1
+
+    def __fail(self, message: str):
+        kind, value, line = self.tokens[self.pos]
+        raise HclSyntaxError(f'{message}, found {value or kind!r}', line)
+
+    def __body(self, closing: str) -> Dict[str, Any]:
+        result = {}
+        attributes = set()
+
+        while True:
+            self.__skip_new_lines()
+            if self.__peek() == closing:
+                self.__next()
+                return result
+
+            key = self.__expect(IDENTIFIER)
+            if self.__peek() == '=':
+                self.__next()
+                if key in result:
+                    raise RuntimeError(f'{key} already defined')
+                result[key] = to_string_dollar(self.__expression())
+                attributes.add(key)
+            else:
+                block = self.__block()
+                if key in result:
+                    if key in attributes:
+                        raise RuntimeError(f'{key} already defined')
+                    result[key].append(block)
+                else:
+                    result[key] = [block]
+
+    def __block(self) -> Dict[str, Any]:
+        labels = []
+        while self.__peek() in (IDENTIFIER, STRING):
+            labels.append(strip_quotes(self.__next()))
+        self.__skip_new_lines()
+        self.__expect('{')
+
+        block = self.__body('}')
+        for label in reversed(labels):
+            block = {label: block}
+        return block
+
+    def __expression(self) -> Any:
+        condition = self.__binary_operation()
+        if self.__peek() != '?':
+            return condition
+
+        self.__next()
+        self.__skip_new_lines()
+        true_value = self.__expression()
+        self.__skip_new_lines()
+        self.__expect(':')
+        self.__skip_new_lines()
+        false_value = self.__expression()
+        return f'{condition} ? {true_value} : {false_value}'
+
+    def __binary_operation(self) -> Any:
+        operand = self.__unary_operation()
+        if self.__peek() not in BINARY_OPERATORS:
+            return operand
+
+        parts = [str(operand)]
+        while self.__peek() in BINARY_OPERATORS:
+            parts.append(self.__next())
+            self.__skip_new_lines()
+            parts.append(str(self.__unary_operation()))
+        return ' '.join(parts)
+
+    def __unary_operation(self) -> Any:
+        if self.__peek() in UNARY_OPERATORS:
+            operator = self.__next()
+            return f'{operator}{self.__expr_term()}'
+        return self.__expr_term()
+
+    def __expr_term(self) -> Any:
+        kind = self.__peek()
+
+        if kind == '(':
+            self.__next()
+            self.__skip_new_lines()
+            value = self.__expression()
+            self.__skip_new_lines()
+            self.__expect(')')
+        elif kind == NUMBER:
+            value = self.__number()
+        elif kind == STRING or kind == HEREDOC:
+            value = self.__next()
+        elif kind == '[':
+            value = self.__tuple()
+        elif kind == '{':
+            value = self.__object()
+        elif kind == IDENTIFIER:
+            value = self.__identifier_term()
+        else:
+            self.__fail('Expected an expression')
+
+        return self.__postfix_operations(value)
+
+    def __number(self) -> Any:
+        digits = self.__next()
+        if self.__peek() == '.' and self.__peek(1) == NUMBER:
+            self.__next()
+            return float(f'{digits}.{self.__next()}')
+        return int(digits)
+
+    def __identifier_term(self) -> Any:
+        name = self.__next()
+        if self.__peek() == '(':
+            return self.__function_call(name)
+        if name == 'true':
+            return True
+        if name == 'false':
+            return False
+        if name == 'null':
+            return None
+        return name
+
+    def __postfix_operations(self, value: Any) -> Any:
+        while True:
+            kind = self.__peek()
+            if kind == '.':
+                self.__next()
+                if self.__peek() == IDENTIFIER:
+                    value = f'{value}.{self.__next()}'
+                else:
+                    # python-hcl2 keeps only the first digit of legacy index notation like list.10
+                    value = f'{value}[{self.__expect(NUMBER)[0]}]'
+            elif kind == '.*' or kind == '[*]':
+                value = f'{value}{self.__next()}'
+            elif kind == '[':
+                self.__next()
+                self.__skip_new_lines()
+                index = self.__expression()
+                self.__skip_new_lines()
+                self.__expect(']')
+                value = f'{value}[{index}]'
+            else:
+                return value
+
+    def __function_call(self, name: str) -> str:
+        self.__expect('(')
+        self.__skip_new_lines()
+
+        arguments = []
+        while self.__peek() != ')':
+            arguments.append(str(self.__expression()))
+            self.__skip_new_lines()
+            if self.__peek() == ',':
+                self.__next()
+                self.__skip_new_lines()
+            elif self.__peek() == '...':
+                self.__next()
+                self.__skip_new_lines()
+                break
+            else:
+                break
+        self.__expect(')')
+
+        return f'{name}({", ".join(arguments)})'
+
+    def __tuple(self) -> Any:
+        self.__expect('[')
+        self.__skip_new_lines()
+        if self.__is_for_expression():
+            return f'[{self.__for_expression(is_object=False)}]'
+
+        elements = []
+        while self.__peek() != ']':
+            elements.append(to_string_dollar(self.__expression()))
+            self.__skip_new_lines()
+            if self.__peek() != ',':
+                break
+            self.__next()
+            self.__skip_new_lines()
+        self.__expect(']')
+
+        return elements
+
+    def __object(self) -> Any:
+        self.__expect('{')
+        self.__skip_new_lines()
+        if self.__is_for_expression():
+            return f'{{{self.__for_expression(is_object=True)}}}'
+
+        result = {}
+        while self.__peek() != '}':
+            if self.__peek() == IDENTIFIER and self.__peek(1) in ('=', ':'):
+                key = self.__next()
+            else:
+                key = strip_quotes(self.__expression())
+            if self.__peek() not in ('=', ':'):
+                self.__fail("Expected '=' or ':'")
+            self.__next()
+            result[key] = to_string_dollar(self.__expression())
+
+            if self.__peek() == ',':
+                self.__next()
+                self.__skip_new_lines()
+            elif self.__peek() == NL:
+                self.__skip_new_lines()
+            else:
+                break
+        self.__expect('}')
+
+        return result
+
+    def __is_for_expression(self) -> bool:
+        return self.__peek() == IDENTIFIER and self.tokens[self.pos][1] == 'for'
+
+    def __for_expression(self, is_object: bool) -> str:
+        parts = [self.__next()]
+        self.__skip_new_lines()
+        parts.append(self.__expect(IDENTIFIER))
+        if self.__peek() == ',':
+            parts.append(self.__next())
+            parts.append(self.__expect(IDENTIFIER))
+            self.__skip_new_lines()
+        self.__skip_new_lines()
+        self.__expect_keyword('in')
+        parts.append('in')
+        self.__skip_new_lines()
+        parts.append(str(self.__expression()))
+        self.__skip_new_lines()
+        parts.append(self.__expect(':'))
+        self.__skip_new_lines()
+
+        parts = [' '.join(parts), str(self.__expression())]
+        if is_object:
+            parts.append(self.__expect('=>'))
+            self.__skip_new_lines()
+            parts.append(str(self.__expression()))
+            if self.__peek() == '...':
+                parts.append(self.__next())
+        self.__skip_new_lines()
+
+        if self.__peek() == IDENTIFIER and self.tokens[self.pos][1] == 'if':
+            self.__next()
+            self.__skip_new_lines()
+            parts.append(f'if {self.__expression()}')
+            self.__skip_new_lines()
+        self.__expect('}' if is_object else ']')
+
+        return ' '.join(parts)
+
+    def __expect_keyword(self, keyword: str):
+        if self.__peek() != IDENTIFIER or self.tokens[self.pos][1] != keyword:
+            self.__fail(f'Expected {keyword!r}')
+        self.__next()
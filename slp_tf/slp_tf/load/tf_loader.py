@@ -1,25 +1,117 @@
+import abc
 import logging
+from collections import deque
+from functools import partial
 from io import StringIO
-from typing import Callable
+from typing import Callable, List, Optional, Union
 
 import hcl2
-from deepmerge import always_merger
 
+from sl_util.sl_util.merge_utils import merge_all
+from sl_util.sl_util.process_utils import PROCESS_POOL_MAX_WORKERS, submit_all
 from slp_base import LoadingIacFileError
 from slp_base import ProviderLoader
+from slp_tf.slp_tf.load import hcl2_parser
+from slp_tf.slp_tf.load.hcl2_cache import Hcl2Cache, get_source_digest
 from slp_tf.slp_tf.parse.mapping.mappers.tf_base_mapper import generate_resource_identifier
+from slp_tf.slp_tf.parse.mapping.tf_resource_index import TerraformResourceIndex
 
 logger = logging.getLogger(__name__)
 
+# Below this number of files to parse, handing them to the worker processes costs more than it saves
+PARALLEL_PARSING_MIN_SOURCES = 4
+PARALLEL_PARSING_MAX_WORKERS = PROCESS_POOL_MAX_WORKERS
 
-def hcl2_reader(data):
-    return hcl2.load(StringIO(initial_value=hcl2_data_as_str(data), newline=None))
+# Parsed data is shared across requests, so unchanged files are never parsed twice in the same process
+hcl2_cache = Hcl2Cache()
+
+
+class Hcl2ParsingBackend(metaclass=abc.ABCMeta):
+    """
+    Formal Interface to parse the content of a Terraform file into a dict
+    """
+
+    name: str = None
+
+    @classmethod
+    def __subclasshook__(cls, subclass):
+        return (
+                hasattr(subclass, 'parse') and callable(subclass.parse)
+                or NotImplemented)
+
+    @abc.abstractmethod
+    def parse(self, text: str) -> dict:
+        """Parse the HCL2 text"""
+        raise NotImplementedError
+
+
+class PythonHcl2Backend(Hcl2ParsingBackend):
+    """
+    Parsing backend based on the Lark grammar of the python-hcl2 library
+    """
+
+    name = 'python-hcl2'
+
+    def parse(self, text: str) -> dict:
+        return hcl2.load(StringIO(initial_value=text, newline=None))
+
+
+class NativeHcl2Backend(Hcl2ParsingBackend):
+    """
+    Parsing backend based on a purpose-built recursive descent parser that builds the same dict as python-hcl2
+    """
+
+    name = 'native'
+
+    def parse(self, text: str) -> dict:
+        return hcl2_parser.loads(StringIO(initial_value=text, newline=None).read())
+
+
+HCL2_PARSING_BACKENDS = {backend.name: backend for backend in [PythonHcl2Backend(), NativeHcl2Backend()]}
+DEFAULT_HCL2_PARSING_BACKEND = PythonHcl2Backend.name
+
+
+def get_hcl2_parsing_backend(backend: Union[str, Hcl2ParsingBackend]) -> Hcl2ParsingBackend:
+    if isinstance(backend, Hcl2ParsingBackend):
+        return backend
+    if backend not in HCL2_PARSING_BACKENDS:
+        raise ValueError(f'Unknown HCL2 parsing backend: {backend}')
+    return HCL2_PARSING_BACKENDS[backend]
+
+
+def hcl2_reader(data, backend: Hcl2ParsingBackend = None):
+    backend = backend or HCL2_PARSING_BACKENDS[DEFAULT_HCL2_PARSING_BACKEND]
+    return backend.parse(hcl2_data_as_str(data))
 
 
 def hcl2_data_as_str(data) -> str:
     return data if isinstance(data, str) else data.decode()
 
 
+def squash_terraform(terraform: dict):
+    """
+    Adds to each resource its identifier, type, name and properties, so they can be found by the mappings
+    """
+    if terraform is not None and 'resource' in terraform:
+        for component_type_obj in terraform['resource']:
+            if isinstance(component_type_obj, dict):
+                resource_type, resource_key, resource_properties = (None,) * 3
+                for component_type, component_name_obj in component_type_obj.items():
+                    resource_type = component_type
+                    if isinstance(component_name_obj, dict):
+                        component_name, properties = list(component_name_obj.items())[0]
+                        resource_key = component_name
+                        resource_properties = properties
+                component_type_obj["resource_id"] = generate_resource_identifier(resource_type, resource_key)
+                component_type_obj["resource_type"] = resource_type
+                component_type_obj["resource_name"] = resource_key
+                component_type_obj["resource_properties"] = resource_properties
+                # Deprecated, but included for the seek to maximize compatibility between mappings
+                component_type_obj["Type"] = resource_type
+                component_type_obj["_key"] = resource_key
+                component_type_obj["Properties"] = resource_properties
+
+
 def raise_empty_sources_error():
     msg = "IaC file is empty"
     raise LoadingIacFileError("IaC file is not valid", msg, msg)
@@ -30,10 +122,18 @@ class TerraformLoader(ProviderLoader):
     Builder for a Terraform class from the xml data
     """
 
-    def __init__(self, sources):
+    def __init__(self, sources, cache: Hcl2Cache = None, max_workers: int = PARALLEL_PARSING_MAX_WORKERS,
+                 backend: Union[str, Hcl2ParsingBackend] = DEFAULT_HCL2_PARSING_BACKEND, streaming: bool = False):
         self.sources: [bytes] = sources
-        self.hcl2_reader: Callable = hcl2_reader
+        self.hcl2_backend: Hcl2ParsingBackend = get_hcl2_parsing_backend(backend)
+        self.hcl2_reader: Callable = partial(hcl2_reader, backend=self.hcl2_backend)
+        self.hcl2_cache: Hcl2Cache = cache if cache is not None else hcl2_cache
+        self.max_workers: int = max_workers
+        # Parses the sources one by one, merging and indexing each of them once parsed, and keeps nothing in the cache
+        self.streaming: bool = streaming
         self.terraform: dict = {}
+        # Index of the resources, built file by file in streaming mode, whose data is the Terraform data
+        self.resource_index: Optional[TerraformResourceIndex] = None
 
     def load(self):
         try:
@@ -47,40 +147,78 @@ class TerraformLoader(ProviderLoader):
     def get_terraform(self):
         return self.terraform
 
+    def get_resource_index(self) -> Optional[TerraformResourceIndex]:
+        return self.resource_index
+
     def __load_source_files(self):
         if not self.sources:
             raise_empty_sources_error()
 
-        for source in self.sources:
-            self.__merge_hcl2_data(self.__load_hcl2_data(source))
+        if self.streaming:
+            self.__stream_source_files()
+            return
+
+        self.terraform = merge_all(self.__load_sources_data())
 
         if not self.terraform:
             raise_empty_sources_error()
 
         self._func_squash_terraform()
 
+    def __stream_source_files(self):
+        """
+        Adds the data of each source to the resource index as soon as it is parsed, which indexes its resources and
+        appends it to the data of the index, so the tree of each file is dropped once added. The mapping reads both
+        the index and its data. The sources are taken from a private queue, leaving the list of the caller as it was
+        given
+        """
+        sources = deque(self.sources)
+        resource_index = TerraformResourceIndex()
+        while sources:
+            tf_data = self.__load_hcl2_data(sources.popleft())
+            squash_terraform(tf_data)
+            resource_index.add(tf_data)
+
+        if not resource_index.data:
+            raise_empty_sources_error()
+
+        self.terraform = resource_index.data
+        self.resource_index = resource_index
+
     def _func_squash_terraform(self):
-        if self.terraform is not None and 'resource' in self.terraform:
-            for component_type_obj in self.terraform['resource']:
-                if isinstance(component_type_obj, dict):
-                    resource_type, resource_key, resource_properties = (None,) * 3
-                    for component_type, component_name_obj in component_type_obj.items():
-                        resource_type = component_type
-                        if isinstance(component_name_obj, dict):
-                            component_name, properties = list(component_name_obj.items())[0]
-                            resource_key = component_name
-                            resource_properties = properties
-                    component_type_obj["resource_id"] = generate_resource_identifier(resource_type, resource_key)
-                    component_type_obj["resource_type"] = resource_type
-                    component_type_obj["resource_name"] = resource_key
-                    component_type_obj["resource_properties"] = resource_properties
-                    # Deprecated, but included for the seek to maximize compatibility between mappings
-                    component_type_obj["Type"] = resource_type
-                    component_type_obj["_key"] = resource_key
-                    component_type_obj["Properties"] = resource_properties
-
-    def __merge_hcl2_data(self, tf_data):
-        self.terraform = always_merger.merge(self.terraform, tf_data)
+        squash_terraform(self.terraform)
+
+    def __load_sources_data(self) -> List[dict]:
+        # The same source may be parsed differently by each backend, so they do not share cache entries
+        digests = [f'{self.hcl2_backend.name}-{get_source_digest(source)}' for source in self.sources]
+        sources_data = [self.hcl2_cache.get(digest) for digest in digests]
+
+        pending = [index for index, tf_data in enumerate(sources_data) if tf_data is None]
+        logger.debug(f"{len(self.sources) - len(pending)} source files found in cache, {len(pending)} to be parsed")
+
+        for index, tf_data in zip(pending, self.__parse_sources([self.sources[index] for index in pending])):
+            self.hcl2_cache.put(digests[index], tf_data)
+            sources_data[index] = tf_data
+
+        return sources_data
+
+    def __parse_sources(self, sources: list) -> List[dict]:
+        workers = min(len(sources), self.max_workers)
+        if len(sources) < PARALLEL_PARSING_MIN_SOURCES or workers < 2:
+            return [self.__load_hcl2_data(source) for source in sources]
+
+        logger.debug(f"Parsing {len(sources)} source files in the shared worker processes")
+        futures = submit_all(self.hcl2_reader, sources)
+        return [self.__get_parsed_data(future) for future in futures]
+
+    @staticmethod
+    def __get_parsed_data(future) -> dict:
+        try:
+            return future.result()
+        except Exception as e:
+            detail = e.__class__.__name__
+            message = e.__str__()
+            raise LoadingIacFileError("IaC file is not valid", detail, message)
 
     def __load_hcl2_data(self, source):
         try:
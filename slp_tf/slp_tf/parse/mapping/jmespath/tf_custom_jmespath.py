@@ -4,6 +4,7 @@ from copy import deepcopy
 import jmespath
 
 import sl_util.sl_util.secure_regex as re
+from sl_util.sl_util.jmespath_utils import JmespathExpressionCache
 from slp_tf.slp_tf.parse.mapping.mappers.tf_base_mapper import generate_resource_identifier
 
 logger = logging.getLogger(__name__)
@@ -149,6 +150,8 @@ class TerraformCustomFunctions(jmespath.functions.Functions):
 jmespath_options = jmespath.Options(custom_functions=TerraformCustomFunctions())
 
 
-def jmespath_search(search_path, source):
+def jmespath_search(search_path, source, expressions: JmespathExpressionCache = None):
     logger.debug(f"jmespath search with expression {search_path}")
+    if expressions:
+        return expressions.search(search_path, source)
     return jmespath.search(search_path, source, options=jmespath_options)
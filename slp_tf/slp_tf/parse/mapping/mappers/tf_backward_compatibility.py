@@ -1,34 +1,83 @@
 from collections.abc import MutableMapping
+from functools import lru_cache
+from typing import Optional
 
 import sl_util.sl_util.secure_regex as re
 
+TYPE_AND_NAME_CACHE_SIZE = 8192
+
 
 def is_type_and_name_string(key):
-    return re.match(rf"^aws_[\w-]+\.[\w-]+$", key)
+    return return_name_from_type_and_name_string(key) is not None
 
 
 def return_name_from_type_and_name_string(key):
-    if is_type_and_name_string(key):
-        return re.match(rf"^aws_[\w-]+\.([\w-]+)$", key).group(1)
+    # The same keys are checked over and over, so the result for each string is kept
+    if isinstance(key, str):
+        return _get_cached_name_from_type_and_name_string(str(key))
+    return _get_name_from_type_and_name_string(key)
+
+
+@lru_cache(maxsize=TYPE_AND_NAME_CACHE_SIZE)
+def _get_cached_name_from_type_and_name_string(key: str) -> Optional[str]:
+    return _get_name_from_type_and_name_string(key)
+
+
+def _get_name_from_type_and_name_string(key) -> Optional[str]:
+    match = re.match(rf"^aws_[\w-]+\.([\w-]+)$", key)
+    return match.group(1) if match else None
+
+
+def get_dataflow_node_key(node_id):
+    """
+    Returns a hashable key shared by all the node ids that may be equal to the given one, even when compared as
+    TfDataflowNodeId, where type.name is equal to name. Equality still has to be checked among the ones sharing a key
+    """
+    if not isinstance(node_id, str):
+        return None
+    return return_name_from_type_and_name_string(node_id) or str(node_id)
+
+
+def _get_aws_key_name(key) -> Optional[str]:
+    """
+    Returns what follows the aws_type. prefix of the key, which is the part the backward compatibility name matches
+    """
+    if not isinstance(key, str) or not key.startswith('aws_'):
+        return None
+
+    separator = key.find('.', 4)
+    if separator == -1 or not re.match(r"^[\w-]+$", key[4:separator]):
+        return None
+
+    return key[separator + 1:]
 
 
 class TfIdMapDictionary(MutableMapping):
     """
     Add backward compatibility to previous mapping files that links are by resource_name
+    The keys with a type.name format are also indexed by their name, so they are found by name in constant time
     """
 
     def __init__(self, *args, **kwargs):
         self.store = dict()
+        # Keys that match ^aws_[\w-]+\.{name}$ by their name and by the length of their name, in insertion order
+        self.keys_by_name = dict()
+        self.keys_by_name_length = dict()
+        # Keys that are not strings cannot be matched against a regular expression
+        self.non_string_keys = 0
         self.update(dict(*args, **kwargs))  # use the free update to set keys
 
     def __getitem__(self, key):
         return self.backward_compatibility(key)
 
     def __setitem__(self, key, value):
+        if key not in self.store:
+            self.__index_key(key)
         self.store[key] = value
 
     def __delitem__(self, key):
         del self.store[key]
+        self.__unindex_key(key)
 
     def __iter__(self):
         return iter(self.store)
@@ -47,15 +96,56 @@ class TfIdMapDictionary(MutableMapping):
             return self.store[key]
         except KeyError:
             # match type.name == name
-            for iter_key, iter_value in self.store.items():
+            for iter_key in self.__get_keys_matching_name(key):
                 if re.match(rf"^aws_[\w-]+\.{key}$", iter_key):
-                    return iter_value
+                    return self.store[iter_key]
             # match name == type.name
             if is_type_and_name_string(key):
                 name = return_name_from_type_and_name_string(key)
                 return self.store[name]
         raise KeyError(key)
 
+    def __get_keys_matching_name(self, name):
+        """
+        Returns, in insertion order, the only keys whose aws_type.name form may match the given name
+        """
+        if self.non_string_keys or not isinstance(name, str) or not re.match(r"^[\w.-]+$", name):
+            return list(self.store)
+
+        # A name without wildcards only matches itself
+        if '.' not in name:
+            return list(self.keys_by_name.get(name, {}))
+
+        # Any other character in the name matches a single character
+        return list(self.keys_by_name_length.get(len(name), {}))
+
+    def __index_key(self, key):
+        if not isinstance(key, str):
+            self.non_string_keys += 1
+            return
+
+        name = _get_aws_key_name(key)
+        if name is not None:
+            self.keys_by_name.setdefault(name, {})[key] = None
+            self.keys_by_name_length.setdefault(len(name), {})[key] = None
+
+    def __unindex_key(self, key):
+        if not isinstance(key, str):
+            self.non_string_keys -= 1
+            return
+
+        name = _get_aws_key_name(key)
+        if name is not None:
+            self.__remove_from_index(self.keys_by_name, name, key)
+            self.__remove_from_index(self.keys_by_name_length, len(name), key)
+
+    @staticmethod
+    def __remove_from_index(index: dict, index_key, key):
+        keys = index.get(index_key, {})
+        keys.pop(key, None)
+        if not keys:
+            index.pop(index_key, None)
+
 
 class TfDataflowNodeId(str):
     """
@@ -69,12 +159,15 @@ class TfDataflowNodeId(str):
         if isinstance(other, TfDataflowNodeId):
             result = self.value == other.value
             if not result:
+                # The name of both ids, if they have a type.name format, is only calculated once per id value
+                self_name = return_name_from_type_and_name_string(self.value)
+                other_name = return_name_from_type_and_name_string(other.value)
                 # match type.name == name
-                if is_type_and_name_string(self.value) and not is_type_and_name_string(other.value):
-                    return return_name_from_type_and_name_string(self.value) == other.value
+                if self_name is not None and other_name is None:
+                    return self_name == other.value
                 # match name == type.name
-                elif not is_type_and_name_string(self.value) and is_type_and_name_string(other.value):
-                    return self.value == return_name_from_type_and_name_string(other.value)
+                elif self_name is None and other_name is not None:
+                    return self.value == other_name
             return result
         else:
             return self.value == other
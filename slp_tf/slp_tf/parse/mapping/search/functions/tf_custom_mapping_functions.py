@@ -1,22 +1,28 @@
+from sl_util.sl_util.jmespath_utils import JmespathExpressionCache
 from slp_tf.slp_tf.parse.mapping.jmespath.tf_custom_jmespath import jmespath_search
 
 
-def __find_first_search(search_path_root, source):
+def get_jmespath_expressions(kwargs: dict) -> JmespathExpressionCache:
+    tf_source_model = kwargs.get("tf_source_model", None)
+    return tf_source_model.jmespath_expressions if tf_source_model else None
+
+
+def __find_first_search(search_path_root, source, expressions=None):
     for search_path in search_path_root:
-        search_result = jmespath_search(search_path, source)
+        search_result = jmespath_search(search_path, source, expressions)
         if search_result is not None:
             return search_result
 
 
-def __search_with_default(obj, source, action):
+def __search_with_default(obj, source, action, expressions=None):
     try:
         search_params = obj[action]["$searchParams"]
 
         if "searchPath" in search_params:
             if action == "$path":
-                search_result = jmespath_search(search_params["searchPath"], source)
+                search_result = jmespath_search(search_params["searchPath"], source, expressions)
             elif action == "$findFirst":
-                search_result = __find_first_search(search_params["searchPath"], source)
+                search_result = __find_first_search(search_params["searchPath"], source, expressions)
             else:
                 return []
 
@@ -45,9 +51,13 @@ def root(mapping_source, **kwargs):
     JMESPath search through the entire source file data structure
     :param mapping_source: The $source for a mapping component
     :param kwargs:
+        tf_source_model: The TerraformSourceModel, whose resource index serves the most common queries
         source_model_data: The completely TF dictionary
     :return: The jmespath search of the $root value
     """
+    if tf_source_model := kwargs.get("tf_source_model", None):
+        return tf_source_model.query(mapping_source["$root"])
+
     source_model_data = kwargs.get("source_model_data", None)
     return jmespath_search(mapping_source["$root"], source_model_data)
 
@@ -169,14 +179,16 @@ def path(mapping_source, **kwargs):
     :param mapping_source: The $source for a mapping component
     :param kwargs:
         source: A section of the TF dictionary
+        tf_source_model: The TerraformSourceModel, whose compiled expressions are reused
     :return: Search through the object identified in the $source
     """
     source = kwargs.get("source")
+    expressions = get_jmespath_expressions(kwargs)
     if "$path" in mapping_source:
         if "$searchParams" in mapping_source["$path"]:
-            return __search_with_default(mapping_source, source, "$path")
+            return __search_with_default(mapping_source, source, "$path", expressions)
         else:
-            return jmespath_search(mapping_source["$path"], source)
+            return jmespath_search(mapping_source["$path"], source, expressions)
 
 
 def format(mapping_source, **kwargs):
@@ -198,13 +210,15 @@ def find_first(mapping_source, **kwargs):
     :param mapping_source: The $source for a mapping component
     :param kwargs:
         source: A section of the TF dictionary
+        tf_source_model: The TerraformSourceModel, whose compiled expressions are reused
     :return: Returns the first successful match
     """
     source = kwargs.get("source")
+    expressions = get_jmespath_expressions(kwargs)
     if "$searchParams" in mapping_source["$findFirst"]:
-        return __search_with_default(mapping_source, source, "$findFirst")
+        return __search_with_default(mapping_source, source, "$findFirst", expressions)
     else:
-        return __find_first_search(mapping_source["$findFirst"], source)
+        return __find_first_search(mapping_source["$findFirst"], source, expressions)
 
 
 def number_of_sources(mapping_source, **kwargs):
@@ -227,10 +241,13 @@ def module(mapping_source, **kwargs):
     JMESPath search through the module section matching by source's attribute
     :param mapping_source: The $source for a mapping component
     :param kwargs:
+        tf_source_model: The TerraformSourceModel, whose resource index serves the query
         source_model_data: The completely TF dictionary
     :return: The jmespath search of the $module value
     """
+    module_query = f"module|get_module_terraform(@, '{mapping_source['$module']}')"
+    if tf_source_model := kwargs.get("tf_source_model", None):
+        return tf_source_model.query(module_query)
 
     source_model_data = kwargs.get("source_model_data", None)
-    return jmespath_search(
-        f"module|get_module_terraform(@, '{mapping_source['$module']}')", source_model_data)
+    return jmespath_search(module_query, source_model_data)
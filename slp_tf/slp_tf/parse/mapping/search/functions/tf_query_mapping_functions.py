@@ -1,6 +1,7 @@
 from typing import Union
 
 from slp_tf.slp_tf.parse.mapping.jmespath.tf_custom_jmespath import jmespath_search
+from slp_tf.slp_tf.parse.mapping.search.functions.tf_custom_mapping_functions import get_jmespath_expressions
 
 
 def __equals_condition(attribute, value):
@@ -21,6 +22,7 @@ def query(mapping_source, **kwargs):
     :param mapping_source: The $source for a mapping component
     :param kwargs:
         source_model_data: The completely TF dictionary
+        tf_source_model: The TerraformSourceModel, whose compiled expressions are reused
     :return: The jmespath search of the composed query
     """
     source_model_data = kwargs.get("source_model_data", None)
@@ -29,7 +31,8 @@ def query(mapping_source, **kwargs):
     props_query = __generate_jmespath("resource_properties", mapping_source.get("$props", None), __property_condition)
 
     conditions = [type_query, name_query, props_query]
-    return jmespath_search(__generate_full_path("resource", conditions), source_model_data)
+    return jmespath_search(
+        __generate_full_path("resource", conditions), source_model_data, get_jmespath_expressions(kwargs))
 
 
 def __generate_full_path(root, conditions):
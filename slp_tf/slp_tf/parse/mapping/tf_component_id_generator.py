@@ -1,8 +1,13 @@
+from functools import lru_cache
+
 import sl_util.sl_util.secure_regex as re
 
 VALID_ID_REGEX = r"([a-z0-9_]+)"
+NORMALIZED_NAMES_CACHE_SIZE = 8192
 
 
+# The same resource names and types are normalized for every component generated from them
+@lru_cache(maxsize=NORMALIZED_NAMES_CACHE_SIZE)
 def normalize_name(name: str):
     return "_".join(re.findall(VALID_ID_REGEX, name.lower()))
 
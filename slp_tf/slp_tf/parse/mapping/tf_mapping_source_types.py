@@ -0,0 +1,59 @@
+from typing import Optional
+
+import sl_util.sl_util.secure_regex as re
+from sl_util.sl_util.mapping_source_types import MappingSourceTypes, union_mapping_source_types
+from slp_tf.slp_tf.parse.mapping.search.functions.tf_custom_mapping_functions import root, skip, singleton, catchall
+from slp_tf.slp_tf.parse.mapping.search.functions.tf_query_mapping_functions import query
+from slp_tf.slp_tf.parse.mapping.search.tf_mapping_function_selector import MappingFunctionSelector
+from slp_tf.slp_tf.parse.mapping.tf_resource_index import GET_QUERY, GET_STARTS_WITH_QUERY, SQUASH_BY_TYPE_QUERY
+
+QUERY_TYPE = re.compile(r"^[^'\\]+$")
+
+mapping_function_selector = MappingFunctionSelector()
+
+
+def get_mapping_source_types(mapping_source) -> Optional[MappingSourceTypes]:
+    """
+    Calculates the Terraform resource types a mapping $source can find, choosing the same mapping functions the
+    TerraformSourceModel search does
+    :param mapping_source: The $source of a mapping
+    :return: The resource types, or None if the $source may find resources of any type
+    """
+    if isinstance(mapping_source, list):
+        return union_mapping_source_types(get_mapping_source_types(element) for element in mapping_source)
+
+    if not isinstance(mapping_source, dict):
+        return None
+
+    key = next((key for key in mapping_source if key in mapping_function_selector.config), None)
+    mapping_function = mapping_function_selector.config.get(key)
+
+    if mapping_function is root:
+        return __get_root_source_types(mapping_source[key])
+
+    if mapping_function is query:
+        return __get_query_source_types(mapping_source.get("$type", None))
+
+    if mapping_function in (skip, singleton, catchall):
+        return get_mapping_source_types(mapping_source[key])
+
+
+def __get_root_source_types(root_query) -> Optional[MappingSourceTypes]:
+    if not isinstance(root_query, str):
+        return None
+
+    if match := GET_QUERY.match(root_query) or SQUASH_BY_TYPE_QUERY.match(root_query):
+        return MappingSourceTypes(types=[match.group(1)])
+
+    if match := GET_STARTS_WITH_QUERY.match(root_query):
+        return MappingSourceTypes(prefixes=[match.group(1)])
+
+
+def __get_query_source_types(resource_types) -> Optional[MappingSourceTypes]:
+    if isinstance(resource_types, str):
+        resource_types = [resource_types]
+
+    # Types which are not plain strings are not compared by equality, or make an invalid query
+    if isinstance(resource_types, list) and resource_types and all(
+            isinstance(resource_type, str) and QUERY_TYPE.match(resource_type) for resource_type in resource_types):
+        return MappingSourceTypes(types=resource_types)
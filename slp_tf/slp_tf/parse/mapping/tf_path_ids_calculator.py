@@ -1,4 +1,5 @@
-from typing import Optional
+from copy import copy
+from typing import Dict, List, Optional
 
 from otm.otm.entity.component import Component
 
@@ -8,12 +9,26 @@ def is_trustzone_parent(component: Component):
 
 
 class TerraformPathIdsCalculator:
+    """
+    Calculates the path ids of a whole list of components at once. The TerraformPathIdsResolver resolves most of
+    them while they are added, and only falls back to this calculator for the ones whose ids are repeated
+    """
 
-    def __init__(self, components: [Component], id_generator):
+    def __init__(self, components: [Component], id_generator, path_ids: Dict[str, str] = None):
         self.components = components
         self.id_generator = id_generator
 
-        self.path_ids = {}
+        # Path ids already known, which are never calculated again
+        self.path_ids = path_ids if path_ids is not None else {}
+
+        # The first component for each id is the one its children hang from
+        self.components_by_id = {}
+        for component in reversed(components):
+            self.components_by_id[component.id] = component
+
+        # Components whose parent chain does not end in a trustzone. When ids are repeated, a chain may be completed
+        # later by another component with the same id, so they are only remembered when ids are unique
+        self.unresolved_components = set() if len(self.components_by_id) == len(components) else None
 
     def calculate_path_ids(self) -> {}:
         for component in self.components:
@@ -23,31 +38,154 @@ class TerraformPathIdsCalculator:
         return self.path_ids
 
     def __calculate_path_id(self, component: Component) -> Optional[str]:
-        parent_path_id = self.__get_parent_path_id(component)
-        if not parent_path_id:
+        """
+        Walks up the parents of the component until one of them hangs from a trustzone or already has its path id,
+        then generates the path ids of the whole chain from the top down
+        """
+        chain = self.__get_unresolved_parents_chain(component)
+        if not chain:
+            return None
+
+        path_id = self.__get_parent_path_id(chain[-1])
+        if not path_id:
+            self.__set_unresolved(chain)
             return None
 
-        path_id = self.__generate_component_id(component, parent_path_id)
+        for chain_component in reversed(chain):
+            if not path_id:
+                return None
 
-        self.path_ids[component.id] = path_id
+            path_id = self.__generate_component_id(chain_component, path_id)
+            self.path_ids[chain_component.id] = path_id
 
         return path_id
 
+    def __get_unresolved_parents_chain(self, component: Component) -> Optional[List[Component]]:
+        chain = [component]
+        chain_components = {id(component)}
+
+        while not is_trustzone_parent(chain[-1]) and chain[-1].parent not in self.path_ids:
+            parent_component = self.components_by_id.get(chain[-1].parent)
+            if not parent_component or id(parent_component) in chain_components \
+                    or self.__is_unresolved(parent_component):
+                self.__set_unresolved(chain)
+                return None
+
+            chain.append(parent_component)
+            chain_components.add(id(parent_component))
+
+        return chain
+
     def __get_parent_path_id(self, component: Component) -> Optional[str]:
         if is_trustzone_parent(component):
             return component.parent
 
-        if component.parent in self.path_ids:
-            return self.path_ids[component.parent]
+        return self.path_ids[component.parent]
 
-        parent_component = self.__find_parent_component(component.parent)
-        if not parent_component:
-            return None
+    def __is_unresolved(self, component: Component) -> bool:
+        return self.unresolved_components is not None and id(component) in self.unresolved_components
 
-        return self.__calculate_path_id(parent_component)
+    def __set_unresolved(self, chain: List[Component]):
+        if self.unresolved_components is not None:
+            self.unresolved_components.update(id(component) for component in chain)
+
+    def __generate_component_id(self, component: Component, parent_id: str):
+        return self.id_generator.from_component_source(component.source, parent_id, component.name).generate_id()
+
+
+class TerraformPathIdsResolver:
+    """
+    Gives each component its path id while the components are added to the threat model. A component is resolved as
+    soon as its parent is, so only the components added before their parents have to wait for them. Once the path id
+    of an id is known, the components with that id or parent are updated.
+    The path id of a repeated id is the one of the first component with that id whose path can be calculated, which
+    may depend on components added later, so a component whose id is repeated before being resolved waits until all
+    the components are added. Then, if they are still unresolved, they are resolved by the TerraformPathIdsCalculator
+    over the whole list. This way, the path ids are always the same the calculator gives for the whole list.
+    """
+
+    def __init__(self, id_generator):
+        self.id_generator = id_generator
+
+        self.path_ids = {}
 
-    def __find_parent_component(self, parent_id: str):
-        return next(filter(lambda x: x.id == parent_id, self.components), None)
+        # Components whose id or parent are still waiting for a path id
+        self.__components_by_id = {}
+        self.__components_by_parent = {}
+        # Components waiting for their parent to be resolved before calculating their own path id
+        self.__children_by_parent = {}
+        # Every component added, along with its original id and parent
+        self.__components = []
+        self.__has_repeated_ids = False
+
+    def add(self, component: Component):
+        component_id, parent_id = component.id, component.parent
+        self.__components.append((component, component_id, parent_id))
+
+        repeated_id = component_id in self.__components_by_id
+        if component_id in self.path_ids:
+            # Repeated ids take the path id of the first component resolved with them
+            component.id = self.path_ids[component_id]
+        else:
+            self.__components_by_id.setdefault(component_id, []).append(component)
+
+        if parent_id in self.path_ids:
+            component.parent = self.path_ids[parent_id]
+        else:
+            self.__components_by_parent.setdefault(parent_id, []).append(component)
+
+        if repeated_id:
+            # The first component with the id may still be resolved by a component added later
+            self.__has_repeated_ids = True
+        elif is_trustzone_parent(component):
+            self.__resolve(component, parent_id)
+        elif parent_id in self.path_ids:
+            self.__resolve(component, self.path_ids[parent_id])
+        else:
+            self.__children_by_parent.setdefault(parent_id, []).append(component)
+
+    def finish(self):
+        """
+        Resolves the components which have been waiting for the rest of the components because their ids are repeated
+        """
+        if not self.__has_repeated_ids or not self.__components_by_id:
+            return
+
+        path_ids = TerraformPathIdsCalculator(self.__get_original_components(), self.id_generator,
+                                              path_ids=dict(self.path_ids)).calculate_path_ids()
+
+        for component_id, path_id in path_ids.items():
+            if component_id not in self.path_ids:
+                self.path_ids[component_id] = path_id
+                for component_with_id in self.__components_by_id.pop(component_id, []):
+                    component_with_id.id = path_id
+                for child in self.__components_by_parent.pop(component_id, []):
+                    child.parent = path_id
+
+    def __get_original_components(self) -> List[Component]:
+        original_components = []
+        for component, component_id, parent_id in self.__components:
+            original_component = copy(component)
+            original_component.id, original_component.parent = component_id, parent_id
+            original_components.append(original_component)
+        return original_components
+
+    def __resolve(self, component: Component, parent_path_id: Optional[str]):
+        pending = [(component, parent_path_id)]
+        while pending:
+            component, parent_path_id = pending.pop()
+            if not parent_path_id or component.id not in self.__components_by_id:
+                continue
+
+            component_id = component.id
+            path_id = self.__generate_component_id(component, parent_path_id)
+            self.path_ids[component_id] = path_id
+
+            for component_with_id in self.__components_by_id.pop(component_id, []):
+                component_with_id.id = path_id
+            for child in self.__components_by_parent.pop(component_id, []):
+                child.parent = path_id
+            pending.extend((child, path_id) for child in reversed(self.__children_by_parent.pop(component_id, [])))
 
     def __generate_component_id(self, component: Component, parent_id: str):
         return self.id_generator.from_component_source(component.source, parent_id, component.name).generate_id()
@@ -0,0 +1,235 @@
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import sl_util.sl_util.secure_regex as re
+from sl_util.sl_util.merge_utils import merge_into
+from slp_tf.slp_tf.parse.mapping.jmespath.tf_custom_jmespath import add_type_and_name, TerraformCustomFunctions
+
+logger = logging.getLogger(__name__)
+
+QUOTED_VALUE = r"\s*'([^'\\]*)'\s*"
+
+GET_QUERY = re.compile(r"^\s*resource\s*\|\s*get\(\s*@\s*," + QUOTED_VALUE + r"\)\s*$")
+GET_STARTS_WITH_QUERY = re.compile(r"^\s*resource\s*\|\s*get_starts_with\(\s*@\s*," + QUOTED_VALUE + r"\)\s*$")
+SQUASH_QUERY = re.compile(r"^\s*resource\s*\|\s*squash_terraform\(\s*@\s*\)\s*$")
+SQUASH_BY_TYPE_QUERY = re.compile(
+    r"^\s*resource\s*\|\s*squash_terraform\(\s*@\s*\)\s*\[\?\s*Type\s*==" + QUOTED_VALUE + r"\]\s*$")
+MODULE_QUERY = re.compile(r"^\s*module\s*\|\s*get_module_terraform\(\s*@\s*," + QUOTED_VALUE + r"\)\s*$")
+
+custom_functions = TerraformCustomFunctions()
+
+
+class TerraformResourceIndex:
+    """
+    Index of the Terraform resources and modules, built once per source data, so the most common $root queries
+    are answered without walking and rebuilding every resource for each mapping:
+        resource|get(@, 'type')
+        resource|get_starts_with(@, 'prefix')
+        resource|squash_terraform(@)
+        resource|squash_terraform(@)[?Type=='type']
+        module|get_module_terraform(@, 'source')
+    The results are the same objects the JMESPath query would return, as new shallow copies. Any other query, or
+    one whose data cannot be indexed, returns None and has to be run by the JMESPath engine.
+    The index may also be built one source file at a time with add, which merges each file into the data of the
+    index, so the mapping reads both the index and the data from it and the data of each file is dropped once added.
+    """
+
+    def __init__(self, data: dict = None):
+        self.data = None
+        self.resources: List[dict] = []
+        self.modules: List[dict] = []
+
+        # Positions of every resource in which each key appears, or None if the resources cannot be indexed
+        self.__resource_positions_by_key: Optional[Dict[str, List[int]]] = {}
+        self.__resources_by_type: Dict[str, Optional[List[Tuple[tuple, dict]]]] = {}
+        self.__resources_by_prefix: Dict[str, Optional[List[dict]]] = {}
+        # Squashed resources, built the first time they are queried, or None if the resources cannot be squashed
+        self.__squashed_resources: Optional[List[dict]] = None
+        self.__squashable = True
+        self.__squashed_resources_by_type: Dict[str, List[dict]] = {}
+        self.__modules_by_source: Optional[Dict[str, List[dict]]] = {}
+
+        self.__queries = [
+            (GET_QUERY, self.__get),
+            (GET_STARTS_WITH_QUERY, self.__get_starts_with),
+            (SQUASH_QUERY, self.__squash),
+            (SQUASH_BY_TYPE_QUERY, self.__squash_by_type),
+            (MODULE_QUERY, self.__get_modules),
+        ]
+
+        if data is not None:
+            self.__index(data)
+            self.data = data
+
+    def add(self, data: dict):
+        """
+        Indexes the resources and modules of the data of one more source file, placed after the ones already indexed,
+        and merges the data into the data of the index, extending its lists in place
+        """
+        self.__index(data)
+        self.data = merge_into(self.data, data)
+
+        # Any value that overrides the merged resources or modules leaves them out of the index
+        if not self.__is_merged(self.data, 'resource', self.resources):
+            self.__resource_positions_by_key = None
+        if not self.__is_merged(self.data, 'module', self.modules):
+            self.__modules_by_source = None
+
+    def search(self, query: str) -> Optional[List[dict]]:
+        """
+        :param query: A JMESPath query over the whole Terraform data
+        :return: The query results, or None if the query cannot be answered from the index
+        """
+        for pattern, search_function in self.__queries:
+            if match := pattern.match(query):
+                results = search_function(*match.groups())
+                return None if results is None else [result.copy() for result in results]
+
+    def get_resource_types(self) -> Optional[Counter]:
+        """
+        :return: The number of resources in which each type appears, either as one of their keys or as the
+        resource_type set by the loader, or None if the resources are not in the expected format
+        """
+        if self.__resource_positions_by_key is None or not all(self.resources):
+            return None
+
+        resource_types = Counter({key: len(positions) for key, positions in self.__resource_positions_by_key.items()})
+        for resource in self.resources:
+            resource_type = resource.get('resource_type')
+            if isinstance(resource_type, str) and resource_type not in resource:
+                resource_types[resource_type] += 1
+        return resource_types
+
+    def __index(self, data: dict):
+        if not isinstance(data, dict):
+            self.__resource_positions_by_key = None
+            self.__modules_by_source = None
+            return
+
+        if (resources := data.get('resource')) is not None:
+            self.__index_resources(resources)
+        if (modules := data.get('module')) is not None:
+            self.__index_modules(modules)
+
+    @staticmethod
+    def __is_merged(data, key: str, indexed_values: list) -> bool:
+        values = data.get(key) if isinstance(data, dict) else None
+        return len(indexed_values) == 0 if values is None else \
+            isinstance(values, list) and len(values) == len(indexed_values)
+
+    def __index_resources(self, resources):
+        if self.__resource_positions_by_key is None:
+            return
+        if not isinstance(resources, list) or not all(isinstance(r, dict) for r in resources):
+            self.__resource_positions_by_key = None
+            return
+
+        for resource in resources:
+            resource_position = len(self.resources)
+            self.resources.append(resource)
+            for key in resource:
+                self.__resource_positions_by_key.setdefault(key, []).append(resource_position)
+
+    def __get_squashed_resources(self) -> Optional[List[dict]]:
+        if self.__resource_positions_by_key is None:
+            return None
+
+        if self.__squashed_resources is None and self.__squashable:
+            try:
+                self.__squashed_resources = custom_functions._func_squash_terraform(self.resources)
+            except Exception as e:
+                logger.debug(f'Terraform resources cannot be squashed: {e}')
+                self.__squashable = False
+                return None
+
+            for squashed_resource in self.__squashed_resources:
+                if 'Type' in squashed_resource:
+                    self.__squashed_resources_by_type.setdefault(squashed_resource['Type'], []).append(
+                        squashed_resource)
+
+        return self.__squashed_resources
+
+    def __index_modules(self, modules):
+        if self.__modules_by_source is None:
+            return
+        if not isinstance(modules, list):
+            self.__modules_by_source = None
+            return
+
+        try:
+            modules_by_source = {}
+            for module in modules:
+                for module_name in module:
+                    module_source = module[module_name]['source']
+                    new_obj = add_type_and_name(module[module_name], module_source, module_name)
+                    new_obj['module'] = True
+                    modules_by_source.setdefault(module_source, []).append(new_obj)
+        except Exception as e:
+            logger.debug(f'Terraform modules cannot be indexed: {e}')
+            self.__modules_by_source = None
+            return
+
+        self.modules.extend(modules)
+        for module_source, modules_of_source in modules_by_source.items():
+            self.__modules_by_source.setdefault(module_source, []).extend(modules_of_source)
+
+    def __get_resources_by_type(self, resource_type: str) -> Optional[List[Tuple[tuple, dict]]]:
+        if self.__resource_positions_by_key is None:
+            return None
+
+        if resource_type not in self.__resources_by_type:
+            try:
+                self.__resources_by_type[resource_type] = [
+                    (self.__get_position(resource_position, resource_type),
+                     add_type_and_name(self.resources[resource_position][resource_type], resource_type, resource_name))
+                    for resource_position in self.__resource_positions_by_key.get(resource_type, [])
+                    for resource_name in self.resources[resource_position][resource_type]]
+            except Exception as e:
+                logger.debug(f'Terraform resources of type {resource_type} cannot be indexed: {e}')
+                self.__resources_by_type[resource_type] = None
+
+        return self.__resources_by_type[resource_type]
+
+    def __get_position(self, resource_position: int, key: str) -> tuple:
+        """
+        :return: The position of the key in the source data, as the position of its resource and its own position
+        among the keys of the resource
+        """
+        return resource_position, list(self.resources[resource_position]).index(key)
+
+    def __get(self, resource_type: str) -> Optional[List[dict]]:
+        resources = self.__get_resources_by_type(resource_type)
+        return None if resources is None else [resource for _, resource in resources]
+
+    def __get_starts_with(self, prefix: str) -> Optional[List[dict]]:
+        if self.__resource_positions_by_key is None:
+            return None
+
+        if prefix not in self.__resources_by_prefix:
+            resources = []
+            for resource_type in self.__resource_positions_by_key:
+                if resource_type.startswith(prefix):
+                    resources_by_type = self.__get_resources_by_type(resource_type)
+                    if resources_by_type is None:
+                        resources = None
+                        break
+                    resources.extend(resources_by_type)
+
+            self.__resources_by_prefix[prefix] = None if resources is None \
+                else [resource for _, resource in sorted(resources, key=lambda r: r[0])]
+
+        return self.__resources_by_prefix[prefix]
+
+    def __squash(self) -> Optional[List[dict]]:
+        return self.__get_squashed_resources()
+
+    def __squash_by_type(self, resource_type: str) -> Optional[List[dict]]:
+        if self.__get_squashed_resources() is None:
+            return None
+        return self.__squashed_resources_by_type.get(resource_type, [])
+
+    def __get_modules(self, module_source: str) -> Optional[List[dict]]:
+        if self.__modules_by_source is None:
+            return None
+        return self.__modules_by_source.get(module_source, [])
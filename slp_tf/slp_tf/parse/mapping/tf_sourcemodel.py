@@ -1,32 +1,83 @@
 import json
+from typing import Callable, Dict, Tuple
 
-from deepmerge import always_merger
-
-from slp_tf.slp_tf.parse.mapping.jmespath.tf_custom_jmespath import jmespath_search
+from sl_util.sl_util.jmespath_utils import JmespathExpressionCache
+from sl_util.sl_util.merge_utils import merge_all
+from slp_tf.slp_tf.parse.mapping.jmespath.tf_custom_jmespath import jmespath_search, jmespath_options
 from slp_tf.slp_tf.parse.mapping.search.tf_mapping_function_selector import MappingFunctionSelector
+from slp_tf.slp_tf.parse.mapping.tf_resource_index import TerraformResourceIndex
 
 
 class TerraformSourceModel:
-    def __init__(self, data=None, otm=None):
+    def __init__(self, data=None, otm=None, resource_index: TerraformResourceIndex = None):
         self.data = data or {}
         self.otm = otm
         self.lookup = {}
         self.mapping_function_selector = MappingFunctionSelector()
+        self.jmespath_expressions = JmespathExpressionCache(jmespath_options)
+        self.__resource_index = resource_index
+        # Search functions compiled for each mapping node, which is kept so its id is not reused by other objects
+        self.__compiled_searches: Dict[int, Tuple[object, Callable]] = {}
 
     def load(self, data):
-        always_merger.merge(self.data, data)
+        merge_all([self.data, data])
+        self.__resource_index = None
 
     def json(self):
         return json.dumps(self.data, indent=2)
 
     def query(self, query):
-        return jmespath_search(query, self.data)
+        if (results := self.__get_resource_index().search(query)) is not None:
+            return results
+
+        return jmespath_search(query, self.data, self.jmespath_expressions)
+
+    def get_resource_types(self):
+        return self.__get_resource_index().get_resource_types()
+
+    def __get_resource_index(self) -> TerraformResourceIndex:
+        # The data may be replaced at any moment, so the index is built for the current data when first needed
+        if self.__resource_index is None or self.__resource_index.data is not self.data:
+            self.__resource_index = TerraformResourceIndex(self.data)
+        return self.__resource_index
+
+    def compile_mapping(self, mapping):
+        """
+        Compiles in advance the search of every node in the mapping
+        """
+        if isinstance(mapping, (list, dict)):
+            self.__get_compiled_search(mapping)
+            for node in mapping.values() if isinstance(mapping, dict) else mapping:
+                self.compile_mapping(node)
 
     def search(self, mapping_source, source=None):
         if isinstance(mapping_source, str):
             return mapping_source
 
+        if not isinstance(mapping_source, (list, dict)):
+            return None
+
+        return self.__get_compiled_search(mapping_source)(source)
+
+    def __get_compiled_search(self, mapping_source) -> Callable:
+        if (compiled_search := self.__compiled_searches.get(id(mapping_source))) is None:
+            compiled_search = (mapping_source, self.__compile_search(mapping_source))
+            self.__compiled_searches[id(mapping_source)] = compiled_search
+
+        return compiled_search[1]
+
+    def __compile_search(self, mapping_source) -> Callable:
         if isinstance(mapping_source, list):
+            return self.__compile_list_search(mapping_source)
+
+        if mapping_function := self.mapping_function_selector.get(mapping_source):
+            return lambda source: mapping_function(
+                mapping_source=mapping_source, tf_source_model=self, source=source, source_model_data=self.data)
+
+        return lambda source: mapping_source
+
+    def __compile_list_search(self, mapping_source: list) -> Callable:
+        def search_elements(source):
             results = []
             for element in mapping_source:
                 mapping_path_value = self.search(element, source)
@@ -36,10 +87,4 @@ class TerraformSourceModel:
                     results = results + [str(mapping_path_value)]
             return results
 
-        if isinstance(mapping_source, dict):
-
-            if mapping_function := self.mapping_function_selector.get(mapping_source):
-                return mapping_function(
-                    mapping_source=mapping_source, tf_source_model=self, source=source, source_model_data=self.data)
-
-            return mapping_source
+        return search_elements
@@ -1,10 +1,16 @@
 import logging
 import uuid
+from typing import Callable, Dict, List
 
-from slp_tf.slp_tf.parse.mapping.mappers.tf_backward_compatibility import TfIdMapDictionary, TfDataflowNodeId
+from otm.otm.entity.dataflow import Dataflow
+from sl_util.sl_util.mapping_source_types import MappingSkipMetrics
+from slp_tf.slp_tf.parse.mapping.mappers.tf_backward_compatibility import TfIdMapDictionary, TfDataflowNodeId, \
+    get_dataflow_node_key
 from slp_tf.slp_tf.parse.mapping.mappers.tf_component_mapper import TerraformComponentMapper
 from slp_tf.slp_tf.parse.mapping.mappers.tf_dataflow_mapper import TerraformDataflowMapper
 from slp_tf.slp_tf.parse.mapping.mappers.tf_trustzone_mapper import TerraformTrustzoneMapper
+from slp_tf.slp_tf.parse.mapping.tf_mapping_source_types import get_mapping_source_types
+from slp_tf.slp_tf.parse.mapping.tf_path_ids_calculator import TerraformPathIdsResolver
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +32,53 @@ class ComponentLists:
         self.singleton = []
 
 
+class HubDataflowIndex:
+    """
+    Index of the threat model dataflows by their source node and, for the type 2 and type 3 hub dataflows, by the
+    node names their hub is joined through. Dataflows can be added to the threat model while it is in use, so
+    they are indexed on every update, always keeping the order they have in the threat model
+    """
+
+    def __init__(self, dataflows: List[Dataflow], get_hub_dataflow_info: Callable[[Dataflow], dict]):
+        self.dataflows = dataflows
+        self.get_hub_dataflow_info = get_hub_dataflow_info
+        self.size = 0
+        self.by_source_node: Dict[str, List[Dataflow]] = {}
+        self.by_hub_node_name: Dict[str, List[int]] = {}
+
+    def update(self):
+        for position in range(self.size, len(self.dataflows)):
+            dataflow = self.dataflows[position]
+            self.by_source_node.setdefault(get_dataflow_node_key(dataflow.source_node), []).append(dataflow)
+
+            hub_info = self.get_hub_dataflow_info(dataflow)
+            if hub_info[HUB_TYPE] is TYPE2 or hub_info[HUB_TYPE] is TYPE3:
+                for node_key in {get_dataflow_node_key(hub_info[SOURCE_NODE_NAME]),
+                                 get_dataflow_node_key(hub_info[DESTINATION_NODE_NAME])}:
+                    self.by_hub_node_name.setdefault(node_key, []).append(position)
+
+        self.size = len(self.dataflows)
+
+    def get_by_source_node(self, source_node) -> List[Dataflow]:
+        self.update()
+        return self.by_source_node.get(get_dataflow_node_key(source_node), [])
+
+    def get_positions_by_hub_node_name(self, node_name) -> List[int]:
+        self.update()
+        return self.by_hub_node_name.get(get_dataflow_node_key(node_name), [])
+
+
+def _get_ids(elements) -> set:
+    return {element["id"] for element in elements}
+
+
+def _group_by_type(components) -> Dict[str, List[dict]]:
+    components_by_type = {}
+    for component in components:
+        components_by_type.setdefault(component["type"], []).append(component)
+    return components_by_type
+
+
 def _default_dataflow_mapping_template():
     return {
         "id": {"$path": "resource_id"},
@@ -34,27 +87,36 @@ def _default_dataflow_mapping_template():
 
 
 class TerraformTransformer:
-    def __init__(self, source_model=None, threat_model=None):
+    def __init__(self, source_model=None, threat_model=None, path_ids_resolver: TerraformPathIdsResolver = None):
         self.source_model = source_model
         self.threat_model = threat_model
+        self.path_ids_resolver = path_ids_resolver
         self.iac_mapping = {}
         self.id_map = TfIdMapDictionary()
         self.id_parents = {}
         self.id_dataflows = {}
         self.tree = {}
-        self.singleton_component_ids = []
+        self.singleton_component_ids = set()
+        self.hub_dataflows_info = {}
+        self.hub_dataflow_index = None
 
     def run(self, iac_mapping):
         self.iac_mapping = iac_mapping
         self.build_lookup()
+        self.compile_expressions()
         self.transform_trustzones()
         self.transform_components()
         self.transform_dataflows()
+        logger.debug(f"JMESPath expressions usage: {self.source_model.jmespath_expressions.get_metrics()}")
 
     def build_lookup(self):
         if "lookup" in self.iac_mapping:
             self.source_model.lookup = self.iac_mapping["lookup"]
 
+    def compile_expressions(self):
+        self.source_model.jmespath_expressions.compile_mapping(self.iac_mapping)
+        self.source_model.compile_mapping(self.iac_mapping)
+
     def transform_trustzones(self):
         logger.info("Adding trustzones")
 
@@ -115,6 +177,8 @@ class TerraformTransformer:
         logger.debug("Finding components")
 
         found_components = ComponentLists()
+        resource_types = self.source_model.get_resource_types()
+        metrics = MappingSkipMetrics()
 
         for mapping in self.iac_mapping["components"]:
             mapper = TerraformComponentMapper(
@@ -122,7 +186,15 @@ class TerraformTransformer:
                 self.__find_trustzone_parent_by_default(),
                 self.id_map
             )
-            for component in mapper.run(self.source_model, self.id_parents):
+            if not self.__may_find_components(mapping, resource_types):
+                metrics.skip()
+                continue
+
+            metrics.start()
+            mapping_components = mapper.run(self.source_model, self.id_parents)
+            metrics.stop(len(mapping_components))
+
+            for component in mapping_components:
                 if isinstance(mapping["$source"], dict):
                     if "$skip" in mapping["$source"]:
                         found_components.skip.append(component)
@@ -135,8 +207,22 @@ class TerraformTransformer:
                         continue
 
                 found_components.components.append(component)
+
+        logger.debug(f"Component mappings skipped by resource type: {metrics.get_metrics()}")
         return found_components
 
+    @staticmethod
+    def __may_find_components(mapping, resource_types) -> bool:
+        """
+        Mappings whose $source can only find resource types which are not in the source are not run, unless they
+        have an $altsource. They also run when their type is missing, for the mapper to report it
+        """
+        if resource_types is None or "$altsource" in mapping or "type" not in mapping:
+            return True
+
+        source_types = get_mapping_source_types(mapping.get("$source"))
+        return source_types is None or source_types.is_found_in(resource_types)
+
     def __remove_aux_data(self, components):
         for component in components:
             if "singleton_multiple_name" in component:
@@ -146,13 +232,16 @@ class TerraformTransformer:
 
     def __calculate_components(self):
         components = self.__find_components()
-        results_without_singleton = self.__get_components(components.components, components.skip)
-        results_without_catchall = self.__get_singleton(components.singleton, components.skip, results_without_singleton)
-        return self.__get_catchall(components.catchall, components.skip, results_without_catchall)
+        skip_ids = _get_ids(components.skip)
+        results_without_singleton = self.__get_components(components.components, skip_ids)
+        results_without_catchall = self.__get_singleton(components.singleton, skip_ids, results_without_singleton)
+        return self.__get_catchall(components.catchall, skip_ids, results_without_catchall)
 
     def __add_components_to_otm(self, components):
+        trustzone_ids = _get_ids(self.iac_mapping["trustzones"])
+        component_ids = _get_ids(components)
         for component in components:
-            parent_type = self.__get_parent_type(component, components)
+            parent_type = self.__get_parent_type(component, trustzone_ids, component_ids)
             if not parent_type:
                 continue
 
@@ -162,88 +251,94 @@ class TerraformTransformer:
             logger.debug(f"Added component: [{component['name']}][{component['id']}]"
                          f"{component['tags']}" if 'tags' in component else "")
 
-    def __get_parent_type(self, component, components):
-        if component['parent'] in [trustzone["id"] for trustzone in self.iac_mapping["trustzones"]]:
+            if self.path_ids_resolver:
+                self.path_ids_resolver.add(self.threat_model.components[-1])
+
+        if self.path_ids_resolver:
+            self.path_ids_resolver.finish()
+
+    def __get_parent_type(self, component, trustzone_ids, component_ids):
+        if component['parent'] in trustzone_ids:
             return 'trustZone'
 
-        parent_component = next(filter(lambda x: x["id"] == component['parent'], components), None)
-        if parent_component:
+        if component['parent'] in component_ids:
             return 'component'
 
-    def __get_components(self, components, skip):
+    def __get_components(self, components, skip_ids):
         results = []
         for component in components:
-            skip_this = False
-            for skip_component in skip:
-                if component["id"] == skip_component["id"]:
-                    logger.debug("Skipping component '{}'".format(component["id"]))
-                    skip_this = True
-                    break
-            if not skip_this:
+            if component["id"] in skip_ids:
+                logger.debug("Skipping component '{}'".format(component["id"]))
+            else:
                 results.append(component)
         return results
 
-    def __get_catchall(self, catchall, skip, results):
+    def __get_catchall(self, catchall, skip_ids, results):
+        result_ids = _get_ids(results)
         for component in catchall:
             skip_this = False
-            for skip_component in skip:
-                if component["id"] == skip_component["id"]:
-                    logger.debug("Skipping catchall component '{}'".format(component["id"]))
-                    skip_this = True
-                    break
-            if component["id"] in self.singleton_component_ids:
+            if component["id"] in skip_ids:
+                logger.debug("Skipping catchall component '{}'".format(component["id"]))
+                skip_this = True
+            if component["id"] in self.singleton_component_ids or component["id"] in result_ids:
                 logger.debug("Catchall component already added '{}'".format(component["id"]))
                 skip_this = True
-            for current_component in results:
-                if component["id"] == current_component["id"]:
-                    logger.debug("Catchall component already added '{}'".format(component["id"]))
-                    skip_this = True
-                    break
             if not skip_this:
                 results.append(component)
+                result_ids.add(component["id"])
         return results
 
-    def __get_singleton(self, singleton, skip, results):
-        singleton_types_added = []
+    def __get_singleton(self, singleton, skip_ids, results):
+        results_by_type = _group_by_type(results)
+        id_map_keys_by_id = self.__get_id_map_keys_by_id()
+        singleton_types_added = set()
         for component in singleton:
-            skip_this = False
-            for skip_component in skip:
-                if component["id"] == skip_component["id"]:
-                    logger.debug("Skipping singleton component '{}'".format(component["id"]))
-                    skip_this = True
-                    break
-            if not skip_this:
-                self.singleton_component_ids.append(component["id"])
+            if component["id"] in skip_ids:
+                logger.debug("Skipping singleton component '{}'".format(component["id"]))
+            else:
+                self.singleton_component_ids.add(component["id"])
                 if component["type"] not in singleton_types_added:
                     results.append(component)
-                    singleton_types_added.append(component["type"])
+                    results_by_type.setdefault(component["type"], []).append(component)
+                    singleton_types_added.add(component["type"])
                 else:
                     # if the component is singleton and it already exists in otm (from a previous mapping)
                     # no new component is generated but the existing component is updated
                     # a)with the group name (even more if had a component name)
                     # b)with a new tag with data from this source component
-                    for result in results:
-                        if result["type"] == component["type"]:
-                            # Modify uuid of the given component
-                            for key in self.id_map:
-                                if self.id_map[key] == component["id"]:
-                                    self.id_map[key] = result["id"]
-
-                            if "singleton_multiple_name" in component:
-                                result["name"] = component["singleton_multiple_name"]
-
-                            # update "result" component with its multiple tags before adding tags from "component"
-                            if "singleton_multiple_tags" in result:
-                                if len(result["tags"]) <= len(result["singleton_multiple_tags"]) \
-                                        and result["tags"] is not result["singleton_multiple_tags"]:
-                                    result["tags"] = result["singleton_multiple_tags"]
-
-                            if "singleton_multiple_tags" in component:
-                                for tag in component["singleton_multiple_tags"]:
-                                    if tag not in result["tags"]:
-                                        result["tags"].append(tag)
+                    for result in results_by_type[component["type"]]:
+                        # Modify uuid of the given component
+                        self.__replace_id_map_id(id_map_keys_by_id, component["id"], result["id"])
+
+                        if "singleton_multiple_name" in component:
+                            result["name"] = component["singleton_multiple_name"]
+
+                        # update "result" component with its multiple tags before adding tags from "component"
+                        if "singleton_multiple_tags" in result:
+                            if len(result["tags"]) <= len(result["singleton_multiple_tags"]) \
+                                    and result["tags"] is not result["singleton_multiple_tags"]:
+                                result["tags"] = result["singleton_multiple_tags"]
+
+                        if "singleton_multiple_tags" in component:
+                            for tag in component["singleton_multiple_tags"]:
+                                if tag not in result["tags"]:
+                                    result["tags"].append(tag)
         return results
 
+    def __get_id_map_keys_by_id(self):
+        keys_by_id = {}
+        for key, value in self.id_map.items():
+            # Keys mapped to several ids are never replaced, so only the ones mapped to a single id are indexed
+            if not isinstance(value, list):
+                keys_by_id.setdefault(value, []).append(key)
+        return keys_by_id
+
+    def __replace_id_map_id(self, keys_by_id, old_id, new_id):
+        keys = keys_by_id.pop(old_id, [])
+        for key in keys:
+            self.id_map[key] = new_id
+        keys_by_id.setdefault(new_id, []).extend(keys)
+
     def transform_dataflows(self):
         logger.info("Adding dataflows")
         logger.debug("Finding dataflows")
@@ -258,9 +353,12 @@ class TerraformTransformer:
         self.__clean_hub_dataflows()
 
     def __generate_dataflows_from_hubs(self):
+        self.hub_dataflows_info = {}
+        self.hub_dataflow_index = HubDataflowIndex(self.threat_model.dataflows, self.__get_hub_dataflow_info)
+
         for dataflow in self.threat_model.dataflows:
             if "-hub" in dataflow.source_node or "-hub" in dataflow.destination_node:
-                for cursor_dataflow in self.threat_model.dataflows:
+                for cursor_dataflow in self.__get_hub_cursor_dataflows(dataflow):
 
                     if self.__is_same_dataflow(dataflow, cursor_dataflow):
                         continue
@@ -280,6 +378,24 @@ class TerraformTransformer:
 
         self.__case_2_generate_hub_dataflows()
 
+    def __get_hub_cursor_dataflows(self, dataflow):
+        """
+        Dataflows that may be joined to the given one in case 1 or case 2, in the order they are in the threat model.
+        Only type 1 dataflows are joined, to type 2 or 3 dataflows whose source or destination is the same node
+        as its destination. Dataflows generated meanwhile are also returned, as they are added after the others
+        """
+        if self.__get_hub_dataflow_info(dataflow)[HUB_TYPE] is not TYPE1:
+            return
+
+        destination_node_name = self.__get_hub_dataflow_info(dataflow)[DESTINATION_NODE_NAME]
+        last_position = -1
+        while positions := [position for position in
+                            self.hub_dataflow_index.get_positions_by_hub_node_name(destination_node_name)
+                            if position > last_position]:
+            for position in positions:
+                last_position = position
+                yield self.threat_model.dataflows[position]
+
     def __is_same_dataflow(self, dataflow_1, dataflow_2):
         dataflow_1_hub_info = self.__get_hub_dataflow_info(dataflow_1)
         dataflow_2_hub_info = self.__get_hub_dataflow_info(dataflow_2)
@@ -340,7 +456,7 @@ class TerraformTransformer:
             tags += additional_tags
             same_dataflow = list(filter(lambda x: x.source_node == source_resource_id
                                                   and x.destination_node == destination_resource_id
-                                        , self.threat_model.dataflows))
+                                        , self.hub_dataflow_index.get_by_source_node(source_resource_id)))
             if len(same_dataflow) > 0:
                 logger.debug("same dataflow, not generated")
                 # TODO: include tag information in that same_dataflow
@@ -451,6 +567,7 @@ class TerraformTransformer:
     def __case_2_generate_hub_dataflows(self):
         """"Traverse Transformer tree for final case 2 dataflows creation, looking for connections between
          type 2 nodes in both origin and destination branches in the tree"""
+        parents_by_type_2_child_name = self.__get_parents_by_type_2_child_name()
         for parent in self.tree:
             logger.debug("PARENT: " + parent)
             children = self.tree[parent]
@@ -463,16 +580,18 @@ class TerraformTransformer:
                     logger.debug("  |-GRANDCHILD: " + grandchild + " " + bound)
 
                     additional_tags = self.__get_additional_tags(child_hub_name, grandchild)
-                    end_components = self.__case_2_look_for_end_component(parent, grandchild)
+                    end_components = self.__case_2_look_for_end_component(
+                        parent, parents_by_type_2_child_name.get(grandchild, []))
 
                     for end_component in end_components:
                         # assumed that all end components are TYPE1 components
                         source_dataflows = list(filter(lambda x: x.source_node == parent
                                                                  and "hub-" in x.destination_node
-                                                       , self.threat_model.dataflows))
+                                                       , self.hub_dataflow_index.get_by_source_node(parent)))
                         destination_dataflows = list(filter(lambda x: x.source_node == end_component
                                                                       and "hub-" in x.destination_node
-                                                            , self.threat_model.dataflows))
+                                                            , self.hub_dataflow_index.get_by_source_node(
+                                                                end_component)))
                         for destination_dataflow in destination_dataflows:
                             if not self.__is_same_dataflow(source_dataflows[0], destination_dataflow):
                                 if bound is INBOUND:
@@ -487,12 +606,12 @@ class TerraformTransformer:
         type_2_child_name = TYPE2 + "-hub-" + child_hub_name
         grandchild_as_dataflow = list(filter(lambda x: x.source_node == type_2_child_name
                                                        and x.destination_node == grandchild
-                                             , self.threat_model.dataflows))
+                                             , self.hub_dataflow_index.get_by_source_node(type_2_child_name)))
 
         if len(grandchild_as_dataflow) == 0:
             grandchild_as_dataflow = list(filter(lambda x: x.source_node == grandchild
                                                            and x.destination_node == type_2_child_name
-                                                 , self.threat_model.dataflows))
+                                                 , self.hub_dataflow_index.get_by_source_node(grandchild)))
 
         if len(grandchild_as_dataflow) > 0:
             additional_tags = []
@@ -503,26 +622,38 @@ class TerraformTransformer:
                 additional_tags))
         return additional_tags
 
-    def __case_2_look_for_end_component(self, end_component, hub_node_as_child):
-        """Traverse Transformer to look for components that may be connected to the parameter component throughout
-        the type_2 hub node"""
-        end_components = []
+    def __get_parents_by_type_2_child_name(self):
+        """Traverse Transformer tree once to know which parents are connected to every type_2 hub node, in the order
+        they are in the tree"""
+        parents_by_type_2_child_name = {}
         for parent in self.tree:
-            if parent == end_component:
-                continue
-
             children = self.tree[parent]
             for child in children:
                 child_hub_type, child_hub_name = self.__separate_hub_type_and_hub_dataflow(child)
                 type_2_child_name = TYPE2 + "-hub-" + child_hub_name
+                parents_by_type_2_child_name.setdefault(type_2_child_name, []).append(parent)
+
+        return parents_by_type_2_child_name
 
-                if type_2_child_name == hub_node_as_child:
-                    if parent not in end_components:
-                        end_components.append(parent)
+    def __case_2_look_for_end_component(self, end_component, hub_node_parents):
+        """Look for components that may be connected to the parameter component throughout the type_2 hub node"""
+        end_components = []
+        for parent in hub_node_parents:
+            if parent == end_component:
+                continue
+
+            if parent not in end_components:
+                end_components.append(parent)
 
         return end_components
 
     def __get_hub_dataflow_info(self, dataflow):
+        # The node names of the dataflows do not change, so they are only separated once per dataflow
+        if id(dataflow) not in self.hub_dataflows_info:
+            self.hub_dataflows_info[id(dataflow)] = self.__calculate_hub_dataflow_info(dataflow)
+        return self.hub_dataflows_info[id(dataflow)]
+
+    def __calculate_hub_dataflow_info(self, dataflow):
         dataflow_hub_type_source, dataflow_source_node_name = \
             self.__separate_hub_type_and_hub_dataflow(dataflow.source_node)
         dataflow_hub_type_destination, dataflow_destination_node_name = \
@@ -1,13 +1,15 @@
 from slp_base.slp_base import MappingLoader, MappingValidator
 from slp_base.slp_base import OTMProcessor
 from slp_base.slp_base import ProviderValidator
+from slp_base.slp_base.mapping import MAX_SIZE as MAPPING_MAX_SIZE
+from slp_base.slp_base.otm_processor import release_otm_sources
 from slp_base.slp_base.provider_loader import ProviderLoader
 from slp_base.slp_base.provider_parser import ProviderParser
 from slp_tf.slp_tf.load.tf_loader import TerraformLoader
 from slp_tf.slp_tf.load.tf_mapping_file_loader import TerraformMappingFileLoader
 from slp_tf.slp_tf.parse.tf_parser import TerraformParser
 from slp_tf.slp_tf.validate.tf_mapping_file_validator import TerraformMappingFileValidator
-from slp_tf.slp_tf.validate.tf_validator import TerraformValidator
+from slp_tf.slp_tf.validate.tf_validator import TerraformValidator, MAX_SIZE
 
 
 class TerraformProcessor(OTMProcessor):
@@ -15,32 +17,54 @@ class TerraformProcessor(OTMProcessor):
     Terraform implementation of OTMProcessor
     """
 
-    def __init__(self, project_id: str, project_name: str, sources: [bytes], mappings: [bytes]):
+    def __init__(self, project_id: str, project_name: str, sources: [bytes], mappings: [bytes],
+                 max_size: int = MAX_SIZE, mapping_max_size: int = MAPPING_MAX_SIZE, streaming: bool = False):
         self.project_id = project_id
         self.project_name = project_name
         self.sources = sources
         self.mappings = mappings
+        self.max_size = max_size
+        self.mapping_max_size = mapping_max_size
+        # Keeps the memory bounded by releasing the sources as soon as they are parsed and the source data once mapped
+        self.streaming = streaming
 
         self.terraform_loader = None
         self.mapping_loader = None
+        self.terraform_parser = None
 
     def get_provider_validator(self) -> ProviderValidator:
-        return TerraformValidator(self.sources)
+        return TerraformValidator(self.sources, max_size=self.max_size)
 
     def get_provider_loader(self) -> ProviderLoader:
-        self.terraform_loader = TerraformLoader(self.sources)
+        self.terraform_loader = TerraformLoader(self.sources, streaming=self.streaming)
         return self.terraform_loader
 
     def get_mapping_validator(self) -> MappingValidator:
-        return TerraformMappingFileValidator(self.mappings)
+        return TerraformMappingFileValidator(self.mappings, max_size=self.mapping_max_size)
 
     def get_mapping_loader(self) -> MappingLoader:
-        self.mapping_loader = TerraformMappingFileLoader(self.mappings)
+        self.mapping_loader = TerraformMappingFileLoader(self.mappings, max_size=self.mapping_max_size)
         return self.mapping_loader
 
     def get_provider_parser(self) -> ProviderParser:
-        return TerraformParser(
+        self.terraform_parser = TerraformParser(
                 self.project_id,
                 self.project_name,
                 self.terraform_loader.get_terraform(),
-                self.mapping_loader.get_mappings())
+                self.mapping_loader.get_mappings(),
+                resource_index=self.terraform_loader.get_resource_index())
+        return self.terraform_parser
+
+    def _clean_resources(self):
+        if not self.streaming:
+            return
+
+        self.sources = None
+        if self.terraform_loader:
+            self.terraform_loader.terraform = None
+            self.terraform_loader.resource_index = None
+        if self.terraform_parser:
+            self.terraform_parser.source = None
+            self.terraform_parser.source_model = None
+            self.terraform_parser.transformer = None
+            release_otm_sources(self.terraform_parser.otm)
@@ -16,9 +16,10 @@ MIN_SIZE = 20
 
 class TerraformValidator(ProviderValidator):
 
-    def __init__(self, terraform_data_list: [bytes]):
+    def __init__(self, terraform_data_list: [bytes], max_size: int = MAX_SIZE):
         super(TerraformValidator, self).__init__()
         self.terraform_data_list = terraform_data_list
+        self.max_size = max_size
 
     def validate(self):
         logger.info('Validating Terraform file')
@@ -28,7 +29,7 @@ class TerraformValidator(ProviderValidator):
     def __validate_size(self):
         for tf_data in self.terraform_data_list:
             size = len(tf_data)
-            if size > MAX_SIZE or size < MIN_SIZE:
+            if size > self.max_size or size < MIN_SIZE:
                 raise generate_size_error(IacType.TERRAFORM, 'iac_file', IacFileNotValidError)
 
     def __validate_content_type(self):
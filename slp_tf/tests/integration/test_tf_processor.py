@@ -261,3 +261,36 @@ class TestTerraformProcessor:
         # AND whose information is right
         assert error.value.title == 'Terraform file is not valid'
         assert error.value.message == 'Provided iac_file is not valid. Invalid size'
+
+    def test_streaming_processing(self):
+        # GIVEN a valid TF file with some resources
+        terraform_file = get_byte_data(test_resource_paths.terraform_for_mappings_tests_json)
+
+        # AND a valid TF mapping file
+        mapping_file = get_byte_data(test_resource_paths.terraform_iriusrisk_tf_aws_mapping)
+
+        # WHEN the TF file is processed in streaming mode
+        otm = TerraformProcessor(SAMPLE_ID, SAMPLE_NAME, [terraform_file], [mapping_file], streaming=True).process()
+
+        # THEN the resulting OTM match the expected one
+        result, expected = validate_and_compare(otm, expected_run_valid_mappings, excluded_regex)
+        assert result == expected
+
+        # AND the source data of the components is released
+        assert all(component.source is None for component in otm.components)
+
+    def test_configurable_max_size(self):
+        # GIVEN a valid TF file bigger than the default max size
+        terraform_file = get_byte_data(test_resource_paths.terraform_for_mappings_tests_json) + \
+            b'\n#' + create_artificial_file(MAX_TF_FILE_SIZE)
+
+        # AND a valid TF mapping file
+        mapping_file = get_byte_data(test_resource_paths.terraform_iriusrisk_tf_aws_mapping)
+
+        # WHEN the TF file is processed with a bigger max size
+        otm = TerraformProcessor(SAMPLE_ID, SAMPLE_NAME, [terraform_file], [mapping_file],
+                                 max_size=2 * MAX_TF_FILE_SIZE).process()
+
+        # THEN the resulting OTM match the expected one
+        result, expected = validate_and_compare(otm, expected_run_valid_mappings, excluded_regex)
+        assert result == expected
@@ -0,0 +1,47 @@
+import logging
+import time
+
+from slp_tf.slp_tf.load.tf_loader import HCL2_PARSING_BACKENDS, NativeHcl2Backend, PythonHcl2Backend
+from slp_tf.tests.unit.load.test_hcl2_parser import get_terraform_fixtures
+from sl_util.tests.util.benchmarks import benchmark
+
+logger = logging.getLogger(__name__)
+
+ROUNDS = 3
+
+
+def load_valid_fixtures() -> [str]:
+    fixtures = []
+    for fixture in get_terraform_fixtures():
+        with open(fixture, 'rb') as f:
+            text = f.read().decode()
+        try:
+            PythonHcl2Backend().parse(text)
+            fixtures.append(text)
+        except Exception:
+            pass
+    return fixtures
+
+
+def measure(backend, fixtures: [str]) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for fixture in fixtures:
+            backend.parse(fixture)
+    return time.perf_counter() - start
+
+
+@benchmark
+class TestHcl2ParsingBenchmark:
+
+    def test_native_backend_is_faster_than_python_hcl2(self):
+        # GIVEN all the valid Terraform fixtures
+        fixtures = load_valid_fixtures()
+
+        # WHEN they are parsed by every backend
+        timings = {name: measure(backend, fixtures) for name, backend in HCL2_PARSING_BACKENDS.items()}
+        for name, timing in timings.items():
+            logger.info(f'{name}: {len(fixtures) * ROUNDS} files parsed in {timing:.3f}s')
+
+        # THEN the native backend is the fastest
+        assert timings[NativeHcl2Backend.name] < timings[PythonHcl2Backend.name]
@@ -0,0 +1,64 @@
+import pickle
+
+from slp_tf.slp_tf.load.hcl2_cache import Hcl2Cache, get_source_digest
+
+
+class TestHcl2Cache:
+
+    def test_same_content_same_digest(self):
+        # GIVEN the same content as str and as bytes
+        # WHEN the digests are calculated
+        # THEN both digests are equal
+        assert get_source_digest('resource "aws_vpc" "vpc" {}') == get_source_digest(b'resource "aws_vpc" "vpc" {}')
+
+    def test_get_returns_a_copy(self):
+        # GIVEN a cache with a parsed file
+        cache = Hcl2Cache()
+        cache.put('digest', {'resource': [{'aws_vpc': {'vpc': {}}}]})
+
+        # WHEN the cached data is retrieved and modified
+        cache.get('digest')['resource'].append({})
+
+        # THEN the cached data remains unchanged
+        assert cache.get('digest') == {'resource': [{'aws_vpc': {'vpc': {}}}]}
+
+    def test_least_recently_used_is_evicted(self):
+        # GIVEN a cache with room for only two entries
+        entry_size = len(pickle.dumps({'resource': ['a']}, protocol=pickle.HIGHEST_PROTOCOL))
+        cache = Hcl2Cache(max_size=entry_size * 2)
+        cache.put('first', {'resource': ['a']})
+        cache.put('second', {'resource': ['b']})
+
+        # AND the first entry is used
+        cache.get('first')
+
+        # WHEN a new entry is added
+        cache.put('third', {'resource': ['c']})
+
+        # THEN the least recently used entry is evicted
+        assert 'first' in cache
+        assert 'second' not in cache
+        assert 'third' in cache
+
+    def test_entries_are_persisted_in_cache_dir(self, tmp_path):
+        # GIVEN a cache persisting the entries in a folder
+        Hcl2Cache(cache_dir=str(tmp_path)).put('digest', {'resource': ['a']})
+
+        # WHEN a new cache is created over the same folder
+        cache = Hcl2Cache(cache_dir=str(tmp_path))
+
+        # THEN the entry is loaded from disk
+        assert 'digest' not in cache
+        assert cache.get('digest') == {'resource': ['a']}
+        assert 'digest' in cache
+
+    def test_unreadable_entries_are_discarded(self, tmp_path):
+        # GIVEN a corrupted entry in the cache dir
+        (tmp_path / 'digest.hcl2.pickle').write_bytes(b'corrupted')
+
+        # WHEN the entry is retrieved
+        cache = Hcl2Cache(cache_dir=str(tmp_path))
+
+        # THEN no data is returned
+        assert cache.get('digest') is None
+        assert 'digest' not in cache
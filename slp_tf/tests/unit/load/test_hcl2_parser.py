@@ -0,0 +1,91 @@
+import glob
+import os
+
+import pytest
+from pytest import mark, param
+
+from slp_tf.slp_tf.load.hcl2_parser import HclSyntaxError, loads
+from slp_tf.slp_tf.load.tf_loader import NativeHcl2Backend, PythonHcl2Backend
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'))
+FIXTURE_DIRS = ['slp_tf/tests/resources', 'tests/resources', 'examples/terraform']
+
+
+def get_terraform_fixtures() -> [str]:
+    fixtures = []
+    for fixture_dir in FIXTURE_DIRS:
+        for extension in ['tf', 'tfvars']:
+            fixtures += glob.glob(f'{ROOT_DIR}/{fixture_dir}/**/*.{extension}', recursive=True)
+    return sorted(fixtures)
+
+
+def parse_or_error(backend, text):
+    try:
+        return backend.parse(text)
+    except Exception as e:
+        return e
+
+
+class TestHcl2Parser:
+
+    @mark.parametrize('fixture', [param(fixture, id=os.path.relpath(fixture, ROOT_DIR))
+                                  for fixture in get_terraform_fixtures()])
+    def test_same_result_as_python_hcl2(self, fixture):
+        # GIVEN a Terraform file from the repository fixtures
+        with open(fixture, 'rb') as f:
+            text = f.read().decode()
+
+        # WHEN it is parsed by both backends
+        expected = parse_or_error(PythonHcl2Backend(), text)
+        actual = parse_or_error(NativeHcl2Backend(), text)
+
+        # THEN both fail or both return the same data
+        if isinstance(expected, Exception):
+            assert isinstance(actual, Exception)
+        else:
+            assert actual == expected
+
+    @mark.parametrize('text,expected', [
+        param('a = 1.5', {'a': 1.5}, id='float'),
+        param('a = -1', {'a': '${-1}'}, id='unary'),
+        param('a = (1 + 2) * 3', {'a': '${1 + 2 * 3}'}, id='parenthesis'),
+        param('a = "a" == "b"', {'a': 'a" == "b'}, id='quoted binary operation'),
+        param('a = [1, "b", true, null, x.y]', {'a': [1, 'b', True, None, '${x.y}']}, id='tuple'),
+        param('a = f([1,"b"], {x = 1}, true)', {'a': "${f([1, 'b'], {'x': 1}, True)}"}, id='function'),
+        param('a = x ?\n "y" :\n [1]', {'a': '${x ? "y" : [1]}'}, id='conditional'),
+        param('a = [for k, v in var.m : k if v]', {'a': '${[for k , v in var.m : k if v]}'}, id='for tuple'),
+        param('a = {for k, v in m : k => v...}', {'a': '${{for k , v in m : k => v ...}}'}, id='for object'),
+        param('a = { "k" = 1, b : 2\n c = 3 }', {'a': {'k': 1, 'b': 2, 'c': 3}}, id='object'),
+        param('a = x.*.id[0].y[*].z', {'a': '${x.*.id[0].y[*].z}'}, id='splat'),
+        param('a = x.10', {'a': '${x[1]}'}, id='legacy index'),
+        param('a = "${lookup(m, "k")}-${b}"', {'a': '${lookup(m, "k")}-${b}'}, id='interpolation'),
+        param('a = <<-EOF\n  hello\n   world\n  EOF\n', {'a': 'hello\n world'}, id='heredoc'),
+        param('b "x" "y" {\n}\n# c\nb "x" "z" {\n /* d */ c = 1 }', {'b': [{'x': {'y': {}}}, {'x': {'z': {'c': 1}}}]},
+              id='blocks'),
+    ])
+    def test_expressions(self, text, expected):
+        # GIVEN a Terraform expression
+        # WHEN it is parsed
+        # THEN it is kept the same way as python-hcl2 does
+        assert loads(text) == expected
+
+    @mark.parametrize('text', [
+        param('a = "abc', id='unterminated string'),
+        param('a = "${}"', id='empty interpolation'),
+        param('a = {a = 1 b = 2}', id='missing object separator'),
+        param('resource "a" "b" {', id='unterminated block'),
+        param('a = $', id='unexpected character'),
+    ])
+    def test_syntax_errors(self, text):
+        # GIVEN an invalid Terraform text
+        # WHEN it is parsed
+        # THEN an HclSyntaxError is raised
+        with pytest.raises(HclSyntaxError):
+            loads(text)
+
+    def test_duplicated_attribute(self):
+        # GIVEN a Terraform text with a duplicated attribute
+        # WHEN it is parsed
+        # THEN a RuntimeError is raised
+        with pytest.raises(RuntimeError, match='a already defined'):
+            loads('a = 1\na = 2')
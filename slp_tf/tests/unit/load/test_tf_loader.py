@@ -1,8 +1,11 @@
 from unittest import TestCase
 from unittest.mock import patch
 
+from sl_util.sl_util.process_utils import submit_all
 from slp_base import LoadingIacFileError
-from slp_tf.slp_tf.load.tf_loader import TerraformLoader
+from slp_tf.slp_tf.load.hcl2_cache import Hcl2Cache
+from slp_tf.slp_tf.load.tf_loader import TerraformLoader, PARALLEL_PARSING_MIN_SOURCES, NativeHcl2Backend, \
+    PythonHcl2Backend
 
 
 class TestTerraformLoader(TestCase):
@@ -57,3 +60,88 @@ class TestTerraformLoader(TestCase):
         # AND an empty IaC file message is on the exception
         assert str(loading_error.exception.title) == 'IaC file is not valid'
         assert str(loading_error.exception.message) == 'IaC file is empty'
+
+    @patch('hcl2.load')
+    def test_cached_source_is_not_parsed_again(self, hcl2_mock):
+        # GIVEN a source already loaded
+        source = 'resource "aws_vpc" "cached_vpc" {}'
+        hcl2_mock.side_effect = [{'resource': [{'aws_vpc': {'cached_vpc': {}}}]}]
+        cache = Hcl2Cache()
+        TerraformLoader([source], cache=cache).load()
+
+        # WHEN the same source is loaded again
+        tf_loader = TerraformLoader([source], cache=cache)
+        tf_loader.load()
+
+        # THEN the source is parsed only once
+        assert hcl2_mock.call_count == 1
+
+        # AND the Terraform data is the same
+        assert tf_loader.get_terraform()['resource'][0]['resource_id'] == 'aws_vpc.cached_vpc'
+
+    def test_parallel_parsing(self):
+        # GIVEN enough sources to be parsed in parallel
+        sources = [f'resource "aws_vpc" "vpc_{index}" {{}}'.encode() for index in range(PARALLEL_PARSING_MIN_SOURCES)]
+
+        # WHEN they are loaded in parallel and sequentially
+        parallel_loader = TerraformLoader(sources, cache=Hcl2Cache(), max_workers=2)
+        with patch('slp_tf.slp_tf.load.tf_loader.submit_all', wraps=submit_all) as submit_all_mock:
+            parallel_loader.load()
+        sequential_loader = TerraformLoader(sources, cache=Hcl2Cache(), max_workers=1)
+        sequential_loader.load()
+
+        # THEN the parallel loader parses them in the shared worker processes
+        submit_all_mock.assert_called_once()
+
+        # AND the Terraform data is the same and keeps the sources order
+        assert parallel_loader.get_terraform() == sequential_loader.get_terraform()
+        assert [resource['resource_name'] for resource in parallel_loader.get_terraform()['resource']] == \
+               [f'vpc_{index}' for index in range(PARALLEL_PARSING_MIN_SOURCES)]
+
+    def test_parsing_backends_do_not_share_cache(self):
+        # GIVEN a source loaded with the python-hcl2 backend
+        source = b'resource "aws_vpc" "vpc" {\n  cidr_block = var.cidr\n}'
+        cache = Hcl2Cache()
+        python_hcl2_loader = TerraformLoader([source], cache=cache, backend=PythonHcl2Backend.name)
+        python_hcl2_loader.load()
+
+        # WHEN it is loaded with the native backend
+        native_loader = TerraformLoader([source], cache=cache, backend=NativeHcl2Backend.name)
+        native_loader.load()
+
+        # THEN it is cached once per backend
+        assert len(cache) == 2
+
+        # AND both return the same data
+        assert native_loader.get_terraform() == python_hcl2_loader.get_terraform()
+
+    def test_unknown_parsing_backend(self):
+        # GIVEN an unknown parsing backend
+        # WHEN the loader is created
+        # THEN a ValueError is raised
+        with self.assertRaises(ValueError):
+            TerraformLoader(['source'], backend='unknown')
+
+    def test_streaming_loading(self):
+        # GIVEN some sources
+        sources = [f'resource "aws_vpc" "vpc_{index}" {{}}'.encode() for index in range(PARALLEL_PARSING_MIN_SOURCES)]
+        expected_loader = TerraformLoader(list(sources), cache=Hcl2Cache())
+        expected_loader.load()
+
+        # WHEN they are loaded in streaming mode
+        cache = Hcl2Cache()
+        streaming_loader = TerraformLoader(sources, cache=cache, streaming=True)
+        streaming_loader.load()
+
+        # THEN the Terraform data is the same
+        assert streaming_loader.get_terraform() == expected_loader.get_terraform()
+
+        # AND the sources of the caller are left as they were given
+        assert sources == expected_loader.sources
+
+        # AND it is the data of the index built file by file
+        assert streaming_loader.get_resource_index().data is streaming_loader.get_terraform()
+        assert len(streaming_loader.get_resource_index().resources) == PARALLEL_PARSING_MIN_SOURCES
+
+        # AND nothing is cached
+        assert len(cache) == 0
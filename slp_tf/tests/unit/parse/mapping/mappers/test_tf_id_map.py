@@ -1,5 +1,7 @@
 import pytest
 
+import sl_util.sl_util.secure_regex as re
+
 from slp_tf.slp_tf.parse.mapping.mappers.tf_backward_compatibility import TfIdMapDictionary
 
 TYPE, NAME, EXPECTED = ("aws_security_group", "VPCssmSecurityGroup", "IriusRisk")
@@ -39,3 +41,61 @@ class TestTfIdMapDictionary:
         pytest.param("Not_exists", False, id="by not existing key")])
     def test_contain(self, id_map, key, expected):
         assert (key in id_map) == expected
+
+    @pytest.mark.parametrize('key', [
+        pytest.param(f"{TYPE}.{NAME}", id="by key"),
+        pytest.param(f"{NAME}", id="by backward_compatibility"),
+        pytest.param(f"aws_subnet.{NAME}", id="by type.name with other type"),
+        pytest.param(f"{NAME[:5]}.{NAME[6:]}", id="by name with wildcard"),
+        pytest.param(f"{NAME}.*", id="by expression"),
+        pytest.param("Not_exists", id="by not existing key")])
+    def test_same_result_as_scanning_keys(self, key):
+        # GIVEN an id map with several type.name and name keys
+        keys = [f"{TYPE}.other", f"aws_subnet.{NAME}", f"{TYPE}.{NAME}", "other", f"aws_x.y.{NAME}", "aws_.z"]
+        id_map = TfIdMapDictionary({k: index for index, k in enumerate(keys)})
+
+        # WHEN a key is looked up
+        # THEN the result is the same as scanning all the keys
+        expected = _scan_id_map(id_map.store, key)
+        assert id_map.get(key, 'default') == expected
+        assert (key in id_map) == bool(expected != 'default' and expected)
+
+    def test_deleted_keys_are_not_found_by_name(self):
+        # GIVEN an id map with a type.name key
+        id_map = TfIdMapDictionary()
+        id_map[f"{TYPE}.{NAME}"] = EXPECTED
+        id_map[f"aws_subnet.{NAME}"] = "other"
+
+        # WHEN the key is deleted
+        del id_map[f"{TYPE}.{NAME}"]
+
+        # THEN its name finds the next key with the same name
+        assert id_map.get(NAME) == "other"
+
+        # AND it is not found once all of them are deleted
+        del id_map[f"aws_subnet.{NAME}"]
+        assert NAME not in id_map
+
+    def test_reinserted_keys_keep_the_insertion_order(self):
+        # GIVEN an id map with two type.name keys with the same name
+        id_map = TfIdMapDictionary()
+        id_map[f"{TYPE}.{NAME}"] = EXPECTED
+        id_map[f"aws_subnet.{NAME}"] = "other"
+
+        # WHEN the first one is deleted and inserted again
+        del id_map[f"{TYPE}.{NAME}"]
+        id_map[f"{TYPE}.{NAME}"] = EXPECTED
+
+        # THEN the name finds the one which is first in the dictionary
+        assert id_map.get(NAME) == "other"
+
+
+def _scan_id_map(store: dict, key: str):
+    if key in store:
+        return store[key]
+    for iter_key, iter_value in store.items():
+        if re.match(rf"^aws_[\w-]+\.{key}$", iter_key):
+            return iter_value
+    if re.match(rf"^aws_[\w-]+\.[\w-]+$", key):
+        return store.get(re.match(rf"^aws_[\w-]+\.([\w-]+)$", key).group(1), 'default')
+    return 'default'
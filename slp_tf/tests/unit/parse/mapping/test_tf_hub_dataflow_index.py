@@ -0,0 +1,78 @@
+import pytest
+
+from otm.otm.entity.dataflow import Dataflow
+from slp_tf.slp_tf.parse.mapping.mappers.tf_backward_compatibility import TfDataflowNodeId, get_dataflow_node_key
+from slp_tf.slp_tf.parse.mapping.tf_transformer import HubDataflowIndex, HUB_TYPE, SOURCE_NODE_NAME, \
+    DESTINATION_NODE_NAME, TYPE1, TYPE2, TYPE3
+
+
+def get_hub_dataflow_info(dataflow: Dataflow) -> dict:
+    hub_type = None
+    node_names = []
+    for node in [dataflow.source_node, dataflow.destination_node]:
+        for node_hub_type in [TYPE1, TYPE2, TYPE3]:
+            if node.startswith(node_hub_type + '-hub-'):
+                hub_type = hub_type or node_hub_type
+                node = node[10:]
+        node_names.append(TfDataflowNodeId(node))
+    return {HUB_TYPE: hub_type, SOURCE_NODE_NAME: node_names[0], DESTINATION_NODE_NAME: node_names[1]}
+
+
+def create_dataflow(source_node: str, destination_node: str) -> Dataflow:
+    return Dataflow(f'{source_node}->{destination_node}', 'name', source_node, destination_node)
+
+
+class TestHubDataflowIndex:
+
+    @pytest.mark.parametrize('node_id,key', [
+        pytest.param('aws_security_group.sg', 'sg', id='type and name'),
+        pytest.param(TfDataflowNodeId('aws_security_group.sg'), 'sg', id='type and name node id'),
+        pytest.param('sg', 'sg', id='name'),
+        pytest.param('type1-hub-sg', 'type1-hub-sg', id='hub'),
+        pytest.param(['hub-sg'], None, id='not a string'),
+    ])
+    def test_get_dataflow_node_key(self, node_id, key):
+        # GIVEN a dataflow node id
+        # WHEN its key is calculated
+        # THEN every node id that may be equal to it shares the key
+        assert get_dataflow_node_key(node_id) == key
+
+    def test_dataflows_by_source_node(self):
+        # GIVEN some dataflows
+        dataflows = [create_dataflow('a', 'b'), create_dataflow('aws_vpc.a', 'c'), create_dataflow('b', 'a')]
+        index = HubDataflowIndex(dataflows, get_hub_dataflow_info)
+
+        # WHEN they are looked up by source node
+        # THEN the ones that may have the same source are returned in order
+        assert index.get_by_source_node('a') == dataflows[0:2]
+        assert index.get_by_source_node('aws_subnet.b') == dataflows[2:]
+        assert index.get_by_source_node('unknown') == []
+
+    def test_dataflows_by_hub_node_name(self):
+        # GIVEN some dataflows of every hub type
+        dataflows = [
+            create_dataflow('component', 'type1-hub-aws_security_group.sg1'),
+            create_dataflow('type3-hub-sg1', '0.0.0.0/0'),
+            create_dataflow('type2-hub-sg2', 'type2-hub-sg1'),
+            create_dataflow('component', 'other_component')
+        ]
+        index = HubDataflowIndex(dataflows, get_hub_dataflow_info)
+
+        # WHEN the type 2 and type 3 dataflows are looked up by the hub node name
+        # THEN their positions are returned
+        assert index.get_positions_by_hub_node_name(TfDataflowNodeId('aws_security_group.sg1')) == [1, 2]
+        assert index.get_positions_by_hub_node_name('sg2') == [2]
+        assert index.get_positions_by_hub_node_name('component') == []
+
+    def test_added_dataflows_are_indexed(self):
+        # GIVEN an index already in use
+        dataflows = [create_dataflow('a', 'b')]
+        index = HubDataflowIndex(dataflows, get_hub_dataflow_info)
+        assert index.get_by_source_node('a') == dataflows
+
+        # WHEN a new dataflow is added
+        dataflows.append(create_dataflow('a', 'type3-hub-sg'))
+
+        # THEN it is found as well
+        assert index.get_by_source_node('a') == dataflows
+        assert index.get_positions_by_hub_node_name('sg') == [1]
@@ -0,0 +1,43 @@
+import pytest
+
+from slp_tf.slp_tf.parse.mapping.tf_mapping_source_types import get_mapping_source_types
+
+
+class TestTerraformMappingSourceTypes:
+
+    @pytest.mark.parametrize('mapping_source, types, prefixes', [
+        pytest.param({'$root': "resource|get(@, 'aws_vpc')"}, {'aws_vpc'}, set(), id='get'),
+        pytest.param({'$root': "resource|get_starts_with(@, 'aws_s3')"}, set(), {'aws_s3'}, id='get_starts_with'),
+        pytest.param({'$root': "resource|squash_terraform(@)[?Type=='aws_lb']"}, {'aws_lb'}, set(), id='squash'),
+        pytest.param({'$type': ['aws_lb', 'aws_elb'], '$name': 'lb'}, {'aws_lb', 'aws_elb'}, set(), id='query'),
+        pytest.param({'$singleton': {'$root': "resource|get(@, 'aws_vpc')"}}, {'aws_vpc'}, set(), id='singleton'),
+        pytest.param({'$skip': {'$type': 'aws_vpc'}}, {'aws_vpc'}, set(), id='skip'),
+        pytest.param({'$catchall': {'$root': "resource|get_starts_with(@, 'aws_')"}}, set(), {'aws_'}, id='catchall'),
+        pytest.param([{'$type': 'aws_vpc'}, {'$root': "resource|get_starts_with(@, 'aws_s3')"}],
+                     {'aws_vpc'}, {'aws_s3'}, id='list')])
+    def test_known_types(self, mapping_source, types, prefixes):
+        # GIVEN a mapping source which can only find some resource types
+
+        # WHEN its types are calculated
+        source_types = get_mapping_source_types(mapping_source)
+
+        # THEN they are the ones in the mapping
+        assert source_types.types == types
+        assert source_types.prefixes == prefixes
+
+    @pytest.mark.parametrize('mapping_source', [
+        pytest.param({'$root': "resource|squash_terraform(@)"}, id='any resource'),
+        pytest.param({'$root': "resource[?aws_vpc]"}, id='any other query'),
+        pytest.param({'$type': {'$regex': '^aws_.*$'}}, id='regex type'),
+        pytest.param({'$name': 'vpc'}, id='query without type'),
+        pytest.param({'$module': 'terraform-aws-modules/vpc/aws'}, id='module'),
+        pytest.param({'$path': 'resource_type'}, id='other function'),
+        pytest.param({'$root': 'resource', '$skip': {'$type': 'aws_vpc'}}, id='first function is used'),
+        pytest.param([{'$type': 'aws_vpc'}, {'$name': 'vpc'}], id='list with unknown types'),
+        pytest.param('aws_vpc', id='string')])
+    def test_unknown_types(self, mapping_source):
+        # GIVEN a mapping source which may find resources of any type
+
+        # WHEN its types are calculated
+        # THEN they are unknown
+        assert get_mapping_source_types(mapping_source) is None
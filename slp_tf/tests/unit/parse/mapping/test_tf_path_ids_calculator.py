@@ -1,9 +1,11 @@
-from random import shuffle
+from copy import deepcopy
+from random import Random, shuffle
 
 from pytest import mark
 
 from otm.otm.entity.component import Component
-from slp_tf.slp_tf.parse.mapping.tf_path_ids_calculator import TerraformPathIdsCalculator
+from slp_tf.slp_tf.parse.mapping.tf_path_ids_calculator import TerraformPathIdsCalculator, \
+    TerraformPathIdsResolver
 
 
 class MockedComponentIdGenerator:
@@ -303,3 +305,144 @@ class TestTerraformPathIdsCalculator:
         assert len(path_ids) == 1
 
         assert path_ids == BROKEN_PATH_PATH_IDS
+
+    def test_deeply_nested_components(self):
+        # GIVEN a chain of components deeper than the recursion limit, from the leaf to the trustzone
+        depth = 5000
+        components = to_otm_components([{
+            'name': f'component_{level}',
+            'component_type': 'empty-component',
+            'parent_type': 'trustZone' if level == 0 else 'component',
+            'source': {'Type': 'aws_subnet', '_key': f'c{level}'},
+            'parent': 'tz-1' if level == 0 else f'c{level - 1}',
+            'tags': [],
+            'component_id': f'c{level}'
+        } for level in reversed(range(depth))])
+
+        # WHEN calling calculate_path_ids
+        path_ids = TerraformPathIdsCalculator(components, MockedComponentIdGenerator).calculate_path_ids()
+
+        # THEN every component has its whole path
+        assert len(path_ids) == depth
+        assert path_ids['c2'] == 'tz-1.aws_subnet-c0.aws_subnet-c1.aws_subnet-c2'
+        assert path_ids[f'c{depth - 1}'].count('.') == depth
+
+    def test_circular_parents(self):
+        # GIVEN two components which are parents of each other
+        # AND a child of one of them
+        components = to_otm_components([{
+            'name': name,
+            'component_type': 'empty-component',
+            'parent_type': 'component',
+            'source': {'Type': 'aws_subnet', '_key': name},
+            'parent': parent,
+            'tags': [],
+            'component_id': name
+        } for name, parent in [('a', 'b'), ('b', 'a'), ('child', 'a')]])
+
+        # WHEN calling calculate_path_ids
+        path_ids = TerraformPathIdsCalculator(components, MockedComponentIdGenerator).calculate_path_ids()
+
+        # THEN no path_ids are returned
+        assert len(path_ids) == 0
+
+
+class TestTerraformPathIdsResolver:
+
+    @mark.parametrize('components, expected_path_ids',
+                      [(THREE_LEVELS_TWO_LEAFS_COMPONENTS, THREE_LEVELS_TWO_LEAFS_PATH_IDS),
+                       (TRUSTZONE_PARENT_COMPONENT, TRUSTZONE_PARENT_PATH_IDS),
+                       (TWO_TRUSTZONES_TWO_LEVELS_COMPONENTS, TWO_TRUSTZONES_TWO_LEVELS_PATH_IDS),
+                       (BROKEN_PATH_COMPONENTS, BROKEN_PATH_PATH_IDS),
+                       (UNEXISTING_PARENT_COMPONENT, {})])
+    def test_same_path_ids_as_calculator(self, components, expected_path_ids):
+        # GIVEN a list of components added in any order
+        components = [deepcopy(component) for component in shuffle_components(components)]
+        original_ids = {id(component): (component.id, component.parent) for component in components}
+        resolver = TerraformPathIdsResolver(MockedComponentIdGenerator)
+
+        # WHEN every component is added to the resolver
+        for component in components:
+            resolver.add(component)
+
+        # THEN the path ids are the same the calculator generates
+        assert resolver.path_ids == expected_path_ids
+
+        # AND the ids and parents of the components are replaced by their path ids
+        for component in components:
+            component_id, parent = original_ids[id(component)]
+            assert component.id == expected_path_ids.get(component_id, component_id)
+            assert component.parent == expected_path_ids.get(parent, parent)
+
+    def test_children_added_before_their_parents(self):
+        # GIVEN a hierarchy of components where children are added first
+        components = [deepcopy(component) for component in THREE_LEVELS_TWO_LEAFS_COMPONENTS]
+        components.sort(key=lambda component: component.id.startswith('gp'))
+        resolver = TerraformPathIdsResolver(MockedComponentIdGenerator)
+
+        # WHEN the components are added but the top one
+        for component in components[:-1]:
+            resolver.add(component)
+
+        # THEN none of them is resolved
+        assert resolver.path_ids == {}
+
+        # AND all of them are resolved once the top one is added
+        resolver.add(components[-1])
+        assert resolver.path_ids == THREE_LEVELS_TWO_LEAFS_PATH_IDS
+        assert sorted(component.id for component in components) == sorted(THREE_LEVELS_TWO_LEAFS_PATH_IDS.values())
+
+    def test_repeated_id_added_before_its_first_component_is_resolved(self):
+        # GIVEN a component whose parent is added after it
+        # AND another component with the same id which hangs from a trustzone
+        components = to_otm_components([{
+            'name': name,
+            'component_type': 'empty-component',
+            'parent_type': 'trustZone' if parent == 'tz' else 'component',
+            'source': {'Type': f'aws_{name}', '_key': key},
+            'parent': parent,
+            'tags': [],
+            'component_id': name
+        } for name, key, parent in [('x', 'a1', 'p'), ('x', 'a2', 'tz'), ('p', 'p', 'tz')]])
+        resolver = TerraformPathIdsResolver(MockedComponentIdGenerator)
+
+        # WHEN every component is added to the resolver
+        for component in components:
+            resolver.add(component)
+        resolver.finish()
+
+        # THEN the repeated id takes the path id of the first component with it, as the calculator does
+        assert resolver.path_ids == {'p': 'tz.aws_p-p', 'x': 'tz.aws_p-p.aws_x-a1'}
+        assert [component.id for component in components] == ['tz.aws_p-p.aws_x-a1'] * 2 + ['tz.aws_p-p']
+
+    @mark.parametrize('seed', range(20))
+    def test_same_path_ids_as_calculator_with_repeated_ids(self, seed: int):
+        # GIVEN a list of components with repeated ids, hanging from trustzones, other components or missing parents
+        generator = Random(seed)
+        ids = [f'c{index}' for index in range(6)]
+        components = to_otm_components([{
+            'name': f'component_{index}',
+            'component_type': 'empty-component',
+            'parent_type': 'trustZone' if parent.startswith('tz') else 'component',
+            'source': {'Type': 'aws_subnet', '_key': f'k{index}'},
+            'parent': parent,
+            'tags': [],
+            'component_id': generator.choice(ids)
+        } for index, parent in enumerate(generator.choice(ids + ['tz-1', 'tz-2', 'missing']) for _ in range(12))])
+        original_ids = [(component.id, component.parent) for component in components]
+        expected_path_ids = TerraformPathIdsCalculator(deepcopy(components), MockedComponentIdGenerator) \
+            .calculate_path_ids()
+
+        # WHEN every component is added to the resolver
+        resolver = TerraformPathIdsResolver(MockedComponentIdGenerator)
+        for component in components:
+            resolver.add(component)
+        resolver.finish()
+
+        # THEN the path ids are the same the calculator generates
+        assert resolver.path_ids == expected_path_ids
+
+        # AND the ids and parents of the components are replaced by their path ids
+        for component, (component_id, parent) in zip(components, original_ids):
+            assert component.id == expected_path_ids.get(component_id, component_id)
+            assert component.parent == expected_path_ids.get(parent, parent)
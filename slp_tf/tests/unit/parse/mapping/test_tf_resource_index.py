@@ -0,0 +1,165 @@
+import copy
+import glob
+import os
+
+import yaml
+from pytest import mark, param
+
+from sl_util.sl_util.merge_utils import merge_all
+from slp_tf.slp_tf.load.tf_loader import TerraformLoader
+from slp_tf.slp_tf.parse.mapping.jmespath.tf_custom_jmespath import jmespath_search
+from slp_tf.slp_tf.parse.mapping.tf_resource_index import TerraformResourceIndex
+from slp_tf.slp_tf.parse.mapping.tf_sourcemodel import TerraformSourceModel
+from slp_tf.tests.resources import test_resource_paths
+from slp_tf.tests.unit.load.test_hcl2_parser import get_terraform_fixtures
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', '..'))
+MAPPING_FILES = ['slp_tf/tests/resources/mapping/**/*.yaml', 'examples/terraform/*.yaml', 'tests/resources/terraform/*.yaml']
+
+
+def get_root_queries(node) -> [str]:
+    if isinstance(node, dict):
+        queries = [f"module|get_module_terraform(@, '{node['$module']}')"] if '$module' in node else []
+        if isinstance(node.get('$root'), str):
+            queries.append(node['$root'])
+        return queries + [query for value in node.values() for query in get_root_queries(value)]
+    if isinstance(node, list):
+        return [query for value in node for query in get_root_queries(value)]
+    return []
+
+
+def get_mapping_queries() -> [str]:
+    queries = set()
+    for pattern in MAPPING_FILES:
+        for mapping_file in glob.glob(f'{ROOT_DIR}/{pattern}', recursive=True):
+            try:
+                with open(mapping_file) as f:
+                    queries.update(get_root_queries(yaml.safe_load(f)))
+            except yaml.YAMLError:
+                pass
+    return sorted(queries)
+
+
+def load_terraform(fixture: str):
+    with open(fixture, 'rb') as f:
+        loader = TerraformLoader([f.read()])
+    try:
+        loader.load()
+        return loader.get_terraform()
+    except Exception:
+        return None
+
+
+class TestTerraformResourceIndex:
+
+    @mark.parametrize('fixture', [param(fixture, id=os.path.relpath(fixture, ROOT_DIR))
+                                  for fixture in get_terraform_fixtures()])
+    def test_same_result_as_jmespath(self, fixture):
+        # GIVEN a loaded Terraform file
+        data = load_terraform(fixture)
+        if data is None:
+            return
+
+        # AND its resource index
+        index = TerraformResourceIndex(data)
+
+        for query in get_mapping_queries():
+            # WHEN every query in the mapping files is searched in the index
+            results = index.search(query)
+
+            # THEN the results are the same as the ones from JMESPath
+            if results is not None:
+                assert results == jmespath_search(query, data), query
+
+    @mark.parametrize('query', [
+        param("resource|get(@, 'aws_vpc')", id='get'),
+        param(" resource | get( @ , 'aws_vpc' ) ", id='get with spaces'),
+        param("resource|get_starts_with(@, 'aws_')", id='get starts with'),
+        param("resource|squash_terraform(@)", id='squash'),
+        param("resource|squash_terraform(@)[?Type=='aws_subnet']", id='squash by type'),
+        param("resource|squash_terraform(@)[?Type == 'aws_unknown']", id='squash by unknown type'),
+        param("module|get_module_terraform(@, 'terraform-aws-modules/vpc/aws')", id='modules'),
+    ])
+    def test_indexed_queries(self, query):
+        # GIVEN a loaded Terraform file with resources and modules
+        data = load_terraform(test_resource_paths.terraform_modules)
+
+        # WHEN the query is searched in the index
+        results = TerraformResourceIndex(data).search(query)
+
+        # THEN the results are the same as the ones from JMESPath
+        assert results == jmespath_search(query, data)
+
+    @mark.parametrize('data,query', [
+        param({'resource': [{'aws_vpc': {'vpc': {}}}]}, "resource|[?resource_type=='aws_vpc']", id='unknown query'),
+        param({'resource': [{'aws_vpc': 'vpc'}]}, "resource|get(@, 'aws_vpc')", id='invalid resource'),
+        param({'resource': 'aws_vpc'}, "resource|squash_terraform(@)", id='invalid resources'),
+        param({'resource': [{}]}, "resource|squash_terraform(@)", id='empty resource'),
+        param({'module': [{'vpc': {}}]}, "module|get_module_terraform(@, 'vpc')", id='module without source'),
+    ])
+    def test_not_indexed_queries(self, data, query):
+        # GIVEN a query that cannot be answered from the index
+        # WHEN it is searched in the index
+        # THEN no results are returned
+        assert TerraformResourceIndex(data).search(query) is None
+
+    def test_built_file_by_file(self):
+        # GIVEN the data of two files with resources and modules
+        files_data = [
+            {'resource': [{'aws_vpc': {'vpc': {}}}, {'aws_subnet': {'subnet_a': {}}}],
+             'module': [{'vpc_module': {'source': 'terraform-aws-modules/vpc/aws'}}]},
+            {'resource': [{'aws_subnet': {'subnet_b': {}}}, {'aws_security_group': {'sg': {}}}],
+             'variable': [{'region': {'default': 'eu-west-1'}}]}]
+        data = merge_all(copy.deepcopy(files_data))
+
+        # WHEN they are added one by one
+        index = TerraformResourceIndex()
+        for file_data in files_data:
+            index.add(file_data)
+
+        # THEN the data of the index is their merged data
+        assert index.data == data
+
+        # AND it gets the same results as the index of the merged data
+        expected_index = TerraformResourceIndex(data)
+        assert index.get_resource_types() == expected_index.get_resource_types()
+        for query in ["resource|get(@, 'aws_subnet')", "resource|get_starts_with(@, 'aws_s')",
+                      "resource|squash_terraform(@)[?Type=='aws_subnet']",
+                      "module|get_module_terraform(@, 'terraform-aws-modules/vpc/aws')"]:
+            assert index.search(query) == expected_index.search(query) == jmespath_search(query, data), query
+
+    @mark.parametrize('files_data', [
+        param([{'resource': [{'aws_vpc': {'vpc': {}}}]}, {'resource': None}], id='resources overridden'),
+        param([{'resource': [{'aws_vpc': {'vpc': {}}}]}, {'resource': 'aws_vpc'}], id='invalid resources'),
+        param([{'resource': [{'aws_vpc': {'vpc': {}}}]}, []], id='not a dict'),
+    ])
+    def test_not_indexed_when_merged_resources_are_overridden(self, files_data):
+        # GIVEN the data of some files, where the resources of the first one are overridden by the following ones
+        # WHEN they are added one by one
+        index = TerraformResourceIndex()
+        for file_data in files_data:
+            index.add(file_data)
+
+        # THEN the resources are not answered from the index
+        assert index.search("resource|get(@, 'aws_vpc')") is None
+
+    def test_results_are_copies(self):
+        # GIVEN a resource index
+        index = TerraformResourceIndex({'resource': [{'aws_vpc': {'vpc': {'cidr_block': '10.0.0.0/16'}}}]})
+
+        # WHEN a result is modified
+        index.search("resource|get(@, 'aws_vpc')")[0]['Type'] = 'modified'
+
+        # THEN the following searches are not affected
+        assert index.search("resource|get(@, 'aws_vpc')")[0]['Type'] == 'aws_vpc'
+
+    def test_source_model_query_falls_back_to_jmespath(self):
+        # GIVEN a source model whose data is replaced after a first query
+        source_model = TerraformSourceModel({'resource': [{'aws_vpc': {'vpc': {}}}]})
+        assert len(source_model.query("resource|get(@, 'aws_vpc')")) == 1
+        source_model.data = {'resource': [{'aws_vpc': {'vpc': {}}}, {'aws_vpc': {'other': {}}}]}
+
+        # WHEN it is queried with indexed and not indexed queries
+        # THEN the current data is used
+        assert len(source_model.query("resource|get(@, 'aws_vpc')")) == 2
+        assert source_model.query("resource[1].aws_vpc") == {'other': {}}
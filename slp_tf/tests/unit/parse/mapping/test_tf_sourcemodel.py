@@ -0,0 +1,43 @@
+from slp_tf.slp_tf.parse.mapping.tf_sourcemodel import TerraformSourceModel
+
+SOURCE = {'resource_name': 'vpc', 'resource_type': 'aws_vpc'}
+
+
+class TestTerraformSourceModel:
+
+    def test_search_mapping_nodes(self):
+        # GIVEN a source model
+        source_model = TerraformSourceModel({'resource': [{'aws_vpc': {'vpc': {}}}]})
+
+        # WHEN mapping nodes of every kind are searched
+        # THEN the results are the same as interpreting them
+        assert source_model.search('literal', SOURCE) == 'literal'
+        assert source_model.search({'$path': 'resource_name'}, SOURCE) == 'vpc'
+        assert source_model.search([{'$path': 'resource_name'}, 'literal'], SOURCE) == ['vpc', 'literal']
+        assert source_model.search({'$unknown': 'value'}, SOURCE) == {'$unknown': 'value'}
+        assert source_model.search(5, SOURCE) is None
+        assert source_model.search({'$root': "resource|get(@, 'aws_vpc')"})[0]['_key'] == 'vpc'
+
+    def test_compiled_search_uses_current_data(self):
+        # GIVEN a mapping node already searched in the source model
+        source_model = TerraformSourceModel({'resource': [{'aws_vpc': {'vpc': {}}}]})
+        mapping_source = {'$root': "resource|get(@, 'aws_vpc')"}
+        assert len(source_model.search(mapping_source)) == 1
+
+        # WHEN the data is replaced
+        source_model.data = {'resource': [{'aws_vpc': {'vpc': {}}}, {'aws_vpc': {'other': {}}}]}
+
+        # THEN the same mapping node searches the current data
+        assert len(source_model.search(mapping_source)) == 2
+
+    def test_compile_mapping(self):
+        # GIVEN a mapping compiled in advance
+        source_model = TerraformSourceModel()
+        mapping = {'components': [
+            {'$source': {'$skip': {'$path': 'resource_type'}}, 'name': {'$path': 'resource_name'}}]}
+        source_model.compile_mapping(mapping)
+
+        # WHEN its nodes are searched
+        # THEN the results are the same as searching them directly
+        assert source_model.search(mapping['components'][0]['$source'], SOURCE) == 'aws_vpc'
+        assert source_model.search(mapping['components'][0]['name'], SOURCE) == 'vpc'
@@ -42,6 +42,20 @@ class TestTerraformValidator(TestCase):
         assert validation_error.exception.title == 'Terraform file is not valid'
         assert validation_error.exception.message == 'Provided iac_file is not valid. Invalid size'
 
+    @patch('magic.Magic.from_buffer')
+    def test_configurable_max_size(self, mime_checker_mock):
+        # GIVEN a source bigger than the default max size
+        source = create_terraform_file_data(size=MAX_SIZE + 1)
+
+        # AND a mock for the mime checker returning a valid MIME
+        mime_checker_mock.side_effect = [VALID_MIME]
+
+        # WHEN the validate method with a bigger max size
+        TerraformValidator([source], max_size=2 * MAX_SIZE).validate()
+
+        # THEN file is checked and no exception raised
+        mime_checker_mock.assert_called()
+
     @patch('magic.Magic.from_buffer')
     def test_invalid_mime_type_file(self, mime_checker_mock):
         # GIVEN a TF source with right size
@@ -1,3 +1,6 @@
+import shapely
+from shapely import STRtree
+
 from slp_visio.slp_visio.load.objects.diagram_objects import DiagramComponent, DiagramComponentOrigin
 
 
@@ -56,3 +59,34 @@ class ParentCalculator:
 
         if len(potential_parents) > 1:
             return select_parent_by_area(potential_parents)
+
+
+class IndexedParentCalculator:
+    """
+    Calculates the parents of all the components of a diagram against the same parent candidates. Their
+    representations are indexed in an R-tree and prepared once, so each component is only checked against the
+    candidates whose bounds hold it, and the same parent as the ParentCalculator is chosen among the ones containing
+    it
+    """
+
+    def __init__(self, parent_candidates: [DiagramComponent]):
+        self.parent_candidates = parent_candidates
+        self.representations = [parent_candidate.representation for parent_candidate in parent_candidates]
+        shapely.prepare([representation for representation in self.representations if representation is not None])
+        self.tree = STRtree(self.representations)
+
+    def calculate_parent(self, child_candidate: DiagramComponent) -> DiagramComponent:
+        if child_candidate.representation is None:
+            return None
+
+        # The candidates are checked in their original order, which breaks the ties between the same areas
+        potential_parents = []
+        for index in sorted(self.tree.query(child_candidate.representation, predicate='within')):
+            if is_contained(self.parent_candidates[index], child_candidate):
+                potential_parents.append(self.parent_candidates[index])
+
+        if len(potential_parents) == 1:
+            return potential_parents[0]
+
+        if len(potential_parents) > 1:
+            return select_parent_by_area(potential_parents)
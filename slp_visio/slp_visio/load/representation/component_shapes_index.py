@@ -0,0 +1,25 @@
+from shapely import STRtree
+from shapely.geometry import Point, box
+from vsdx import Shape
+
+from slp_visio.slp_visio.load.representation.simple_component_representer import SimpleComponentRepresenter
+
+
+class ComponentShapesIndex:
+    """
+    Representations of the component shapes of a page, built once and indexed in an R-tree by their bounds, so only
+    the components whose bounds are near a point have to be checked
+    """
+
+    def __init__(self, components: [Shape], representer: SimpleComponentRepresenter):
+        self.components = components
+        self.polygons = [representer.build_representation(component) for component in components]
+        self.tree = STRtree(self.polygons)
+
+    def get_near_components(self, point: Point, distance: float) -> [int]:
+        """
+        :return: The positions of the components whose bounds are no further than the distance from the point, in the
+        same order as the components
+        """
+        area = box(point.x - distance, point.y - distance, point.x + distance, point.y + distance)
+        return sorted(self.tree.query(area))
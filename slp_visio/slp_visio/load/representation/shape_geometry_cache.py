@@ -0,0 +1,56 @@
+from typing import Callable
+
+from shapely.geometry import Polygon
+from vsdx import Shape
+
+from slp_visio.slp_visio.parse.shape_position_calculator import ShapePositionCalculator
+from slp_visio.slp_visio.util.visio import get_limits, get_normalized_angle
+
+
+def build_limits_polygon(limits: tuple) -> Polygon:
+    return Polygon([(limits[0][0], limits[0][1]),
+                    (limits[0][0], limits[1][1]),
+                    (limits[1][0], limits[1][1]),
+                    (limits[1][0], limits[0][1])])
+
+
+class ShapeGeometryCache:
+    """
+    Geometry of the shapes of a page, where the absolute center, limits, angle and polygon of each shape are
+    calculated the first time they are asked for and reused afterwards. The corners of the parents are remembered
+    too, so the parents shared by the shapes of a group are calculated once.
+    Shapes are identified by their XML element, since vsdx builds new Shape objects each time the children of a page
+    or a group are read
+    """
+
+    def __init__(self):
+        self.__parent_corners = {}
+        self.__centers = {}
+        self.__limits = {}
+        self.__angles = {}
+        self.__polygons = {}
+
+    def get_absolute_center(self, shape: Shape) -> tuple:
+        return self.__get(self.__centers, shape,
+                          lambda: ShapePositionCalculator(shape, self.__parent_corners).get_absolute_center())
+
+    def get_limits(self, shape: Shape) -> tuple:
+        return self.__get(self.__limits, shape, lambda: get_limits(shape, self.get_absolute_center(shape)))
+
+    def get_normalized_angle(self, shape: Shape) -> float:
+        return self.__get(self.__angles, shape, lambda: get_normalized_angle(shape))
+
+    def get_polygon(self, shape: Shape) -> Polygon:
+        """
+        :return: The rectangle the shape takes up in the page, ignoring its rotation
+        """
+        return self.__get(self.__polygons, shape, lambda: build_limits_polygon(self.get_limits(shape)))
+
+    @staticmethod
+    def __get(values: dict, shape: Shape, calculate: Callable):
+        value = values.get(shape.xml)
+        if value is None:
+            value = calculate()
+            values[shape.xml] = value
+
+        return value
@@ -1,18 +1,18 @@
 from shapely.geometry import Polygon
 from vsdx import Shape
 
+from slp_visio.slp_visio.load.representation.shape_geometry_cache import ShapeGeometryCache, build_limits_polygon
 from slp_visio.slp_visio.load.representation.visio_shape_representer import VisioShapeRepresenter
 from slp_visio.slp_visio.util.visio import get_limits
 
 
 class SimpleComponentRepresenter(VisioShapeRepresenter):
 
-    def build_representation(self, shape: Shape) -> Polygon:
-        limits = get_limits(shape)
+    def __init__(self, geometry_cache: ShapeGeometryCache = None):
+        self.geometry_cache = geometry_cache
 
-        points = [(limits[0][0], limits[0][1]),
-                  (limits[0][0], limits[1][1]),
-                  (limits[1][0], limits[1][1]),
-                  (limits[1][0], limits[0][1])]
+    def build_representation(self, shape: Shape) -> Polygon:
+        if self.geometry_cache:
+            return self.geometry_cache.get_polygon(shape)
 
-        return Polygon(points)
+        return build_limits_polygon(get_limits(shape))
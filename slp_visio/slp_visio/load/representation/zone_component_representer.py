@@ -4,6 +4,7 @@ from shapely.geometry import Polygon
 from vsdx import Shape
 
 from slp_visio.slp_visio.load.objects.diagram_objects import DiagramLimits
+from slp_visio.slp_visio.load.representation.shape_geometry_cache import ShapeGeometryCache
 from slp_visio.slp_visio.load.representation.visio_shape_representer import VisioShapeRepresenter
 from slp_visio.slp_visio.load.representation.zone.irregular_zones import irregular_zones
 from slp_visio.slp_visio.load.representation.zone.regular_zones import regular_zones
@@ -52,13 +53,17 @@ def represent_irregular_zone(angle: float, some_point: tuple, limits: DiagramLim
 
 class ZoneComponentRepresenter(VisioShapeRepresenter):
 
-    def __init__(self, diagram_limits: DiagramLimits):
+    def __init__(self, diagram_limits: DiagramLimits, geometry_cache: ShapeGeometryCache = None):
         self.diagram_limits = diagram_limits
+        self.geometry_cache = geometry_cache
 
     def build_representation(self, shape: Shape) -> Polygon:
-        angle = get_normalized_angle(shape)
-        calculator = ShapePositionCalculator(shape)
-        shape_center = calculator.get_absolute_center()
+        if self.geometry_cache:
+            angle = self.geometry_cache.get_normalized_angle(shape)
+            shape_center = self.geometry_cache.get_absolute_center(shape)
+        else:
+            angle = get_normalized_angle(shape)
+            shape_center = ShapePositionCalculator(shape).get_absolute_center()
 
         return represent_quadrant(angle, shape_center, self.diagram_limits) or \
             represent_irregular_zone(angle, shape_center, self.diagram_limits)
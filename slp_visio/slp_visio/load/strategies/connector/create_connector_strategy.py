@@ -20,7 +20,8 @@ class CreateConnectorStrategy:
                 or NotImplemented)
 
     @abc.abstractmethod
-    def create_connector(self, shape: Shape, components=None) -> Optional[DiagramConnector]:
+    def create_connector(self, shape: Shape, components=None, representer=None,
+                         components_index=None) -> Optional[DiagramConnector]:
         """creates the OTM Dataflow from the vsdx shape"""
         raise NotImplementedError
 
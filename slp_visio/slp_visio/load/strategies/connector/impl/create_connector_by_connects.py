@@ -15,7 +15,8 @@ class CreateConnectorByConnects(CreateConnectorStrategy):
     Strategy to create a connector from the shape connects
     """
 
-    def create_connector(self, shape: Shape, components=None) -> Optional[DiagramConnector]:
+    def create_connector(self, shape: Shape, components=None, representer=None,
+                         components_index=None) -> Optional[DiagramConnector]:
         connected_shapes = shape.connects
         if not self.are_two_different_shapes(connected_shapes):
             return None
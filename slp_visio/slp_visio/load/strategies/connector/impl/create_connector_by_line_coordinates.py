@@ -5,12 +5,17 @@ from vsdx import Shape
 
 from sl_util.sl_util.injection import register
 from slp_visio.slp_visio.load.objects.diagram_objects import DiagramConnector
+from slp_visio.slp_visio.load.representation.component_shapes_index import ComponentShapesIndex
 from slp_visio.slp_visio.load.representation.simple_component_representer import SimpleComponentRepresenter
 from slp_visio.slp_visio.load.strategies.connector.create_connector_strategy import CreateConnectorStrategy, \
     CreateConnectorStrategyContainer
 from slp_visio.slp_visio.util.visio import is_bidirectional_connector
 
 
+# Distances are compared once rounded to two decimals, so the shapes up to this far from the tolerance may match
+ROUNDING_MARGIN = 0.01
+
+
 @register(CreateConnectorStrategyContainer.visio_strategies)
 class CreateConnectorByLineCoordinates(CreateConnectorStrategy):
     """
@@ -25,7 +30,8 @@ class CreateConnectorByLineCoordinates(CreateConnectorStrategy):
         self.tolerance = 0.09
         self.representer: SimpleComponentRepresenter = SimpleComponentRepresenter()
 
-    def create_connector(self, shape: Shape, components=None) -> Optional[DiagramConnector]:
+    def create_connector(self, shape: Shape, components=None, representer: SimpleComponentRepresenter = None,
+                         components_index: ComponentShapesIndex = None) -> Optional[DiagramConnector]:
         if not shape.begin_x or not shape.begin_y or not shape.end_x or not shape.end_y:
             return None
         begin_line = Point(shape.begin_x, shape.begin_y)
@@ -33,10 +39,13 @@ class CreateConnectorByLineCoordinates(CreateConnectorStrategy):
         if not begin_line or not end_line:
             return None
 
-        if not components:
-            return None
-        origin = self.__match_component(begin_line, components)
-        target = self.__match_component(end_line, components)
+        if components_index is None:
+            if not components:
+                return None
+            # Without the index of the page, the components are indexed for this connector alone
+            components_index = ComponentShapesIndex(components, representer or self.representer)
+        origin = self.__match_component(begin_line, components_index)
+        target = self.__match_component(end_line, components_index)
 
         if not origin or not target:
             return None
@@ -48,14 +57,13 @@ class CreateConnectorByLineCoordinates(CreateConnectorStrategy):
             bidirectional=is_bidirectional_connector(shape),
             name=shape.text)
 
-    def __match_component(self, point, components) -> Optional[str]:
+    def __match_component(self, point, components_index: ComponentShapesIndex) -> Optional[str]:
         matching_component = {}
 
-        for component in components:
-            polygon = self.representer.build_representation(component)
-            distance = round(polygon.exterior.distance(point), 2)
+        for index in components_index.get_near_components(point, self.tolerance + ROUNDING_MARGIN):
+            distance = round(components_index.polygons[index].exterior.distance(point), 2)
             if distance <= matching_component.get('distance', self.tolerance):
-                matching_component['id'] = component.ID
+                matching_component['id'] = components_index.components[index].ID
                 matching_component['distance'] = distance
 
         return matching_component.get('id', None)
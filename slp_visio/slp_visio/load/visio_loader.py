@@ -11,7 +11,7 @@ class VisioLoader(ProviderLoader):
 
     def load(self):
         try:
-            self.visio = self.parser.parse(self.source.name)
+            self.visio = self.parser.parse(self.source)
         except Exception as e:
             logger.error(f'{e}')
             detail = e.__class__.__name__
@@ -0,0 +1,70 @@
+import os
+from typing import BinaryIO, Optional, Union
+from xml.etree import ElementTree
+from zipfile import ZipFile
+
+from sl_util.sl_util.file_utils import get_file_type_by_content, get_file_type_by_name
+
+CONTENT_TYPES_PART = '[Content_Types].xml'
+# libmagic tells an Office Open XML package from a plain zip by the names of its first entries, which are not
+# always within the first 2 KB of the file
+MIME_TYPE_HEADER_SIZE = 16 * 1024
+
+
+class VsdxPackage:
+    """
+    Zip package of a VSDX diagram, read from its file on disk or from the in-memory or spooled file uploaded through
+    the API, so no copy of it is written to disk. The zip is opened once, the first time one of its parts is read,
+    and the same handle is shared by the validation and the loading of the diagram until the package is closed
+    """
+
+    def __init__(self, source: Union[str, BinaryIO], name: str = None):
+        self.source = source
+        self.name = name or (source if isinstance(source, str) else getattr(source, 'name', None))
+
+        self.__zip: Optional[ZipFile] = None
+
+    @property
+    def size(self) -> int:
+        if isinstance(self.source, str):
+            return os.path.getsize(self.source)
+
+        self.source.seek(0, os.SEEK_END)
+        return self.source.tell()
+
+    def get_mime_type(self) -> str:
+        if isinstance(self.source, str):
+            return get_file_type_by_name(self.source)
+
+        # The type is sniffed from the header of the file, so there is no need to read the whole upload
+        self.source.seek(0)
+        header = self.source.read(MIME_TYPE_HEADER_SIZE)
+        self.source.seek(0)
+        return get_file_type_by_content(header)
+
+    @property
+    def zip(self) -> ZipFile:
+        if self.__zip is None:
+            if not isinstance(self.source, str):
+                self.source.seek(0)
+            self.__zip = ZipFile(self.source)
+
+        return self.__zip
+
+    def has_part(self, part: str) -> bool:
+        return part in self.zip.NameToInfo
+
+    def read_xml(self, part: str) -> Optional[ElementTree.ElementTree]:
+        """
+        :return: The parsed XML of the part, or None if the package does not have it
+        """
+        if not self.has_part(part):
+            return None
+
+        with self.zip.open(part) as part_file:
+            return ElementTree.parse(part_file)
+
+    def close(self):
+        if self.__zip is not None:
+            self.__zip.close()
+            self.__zip = None
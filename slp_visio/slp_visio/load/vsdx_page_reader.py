@@ -0,0 +1,276 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+from xml.etree.ElementTree import Element
+
+from vsdx import Cell, Connect, namespace, r_namespace
+from vsdx.shapes import to_float
+
+from slp_visio.slp_visio.load.vsdx_package import VsdxPackage
+
+logger = logging.getLogger(__name__)
+
+PAGES_PART = 'visio/pages/pages.xml'
+PAGES_RELS_PART = 'visio/pages/_rels/pages.xml.rels'
+PAGES_FOLDER = 'visio/pages/'
+MASTERS_PART = 'visio/masters/masters.xml'
+MASTERS_RELS_PART = 'visio/masters/_rels/masters.xml.rels'
+MASTERS_FOLDER = 'visio/masters/'
+
+SHAPE_TAG = f'{namespace}Shape'
+SHAPES_TAG = f'{namespace}Shapes'
+CELL_TAG = f'{namespace}Cell'
+TEXT_TAG = f'{namespace}Text'
+SECTION_TAG = f'{namespace}Section'
+CONNECT_TAG = f'{namespace}Connect'
+
+# Placeholder for the values calculated the first time they are read, which may be None
+NOT_CALCULATED = object()
+
+
+class VsdxShape:
+    """
+    Shape of a page read by the VsdxPageReader, with the same interface as the vsdx Shape for everything the
+    identifiers, strategies and representers read. Unlike the vsdx Shape, its children and its master shape are only
+    looked up once, and its connects are taken from an index of the page instead of scanning all of them
+    """
+
+    def __init__(self, xml: Element, parent, page: 'VsdxPage'):
+        self.xml = xml
+        self.parent = parent
+        self.page = page
+        self.ID = xml.attrib.get('ID', None)
+        self.master_shape_ID = xml.attrib.get('MasterShape', None)
+        self.master_page_ID = xml.attrib.get('Master', None)
+        if self.master_page_ID is None and isinstance(parent, VsdxShape):
+            self.master_page_ID = parent.master_page_ID
+        self.shape_type = xml.attrib.get('Type', None)
+        self.shape_name = xml.attrib.get('NameU') or xml.get('Name')
+        self.cells = {cell.attrib.get('N'): Cell(xml=cell, shape=self) for cell in xml.findall(CELL_TAG)}
+
+        self.__child_shapes: Optional[List[VsdxShape]] = None
+        self.__master_shape = NOT_CALCULATED
+
+    @property
+    def child_shapes(self) -> List['VsdxShape']:
+        if self.__child_shapes is None:
+            # As in vsdx, the children of a group are in its Shapes element and any other shape is a container itself
+            parent_element = self.xml.find(SHAPES_TAG) if self.shape_type == 'Group' else self.xml
+            self.__child_shapes = [VsdxShape(shape, self, self.page) for shape in parent_element if 'Shape' in
+                                   shape.tag] if parent_element is not None and len(parent_element) else []
+
+        return self.__child_shapes
+
+    @property
+    def text(self) -> str:
+        text_element = self.xml.find(TEXT_TAG)
+
+        if text_element is not None:
+            return ''.join(text_element.itertext())
+        elif self.master_page_ID and self.master_shape and self.master_shape.text:
+            return self.master_shape.text
+        return ''
+
+    @property
+    def master_page(self) -> Optional['VsdxPage']:
+        return self.page.reader.get_master_page(self.master_page_ID)
+
+    @property
+    def master_shape(self) -> Optional['VsdxShape']:
+        if self.__master_shape is NOT_CALCULATED:
+            self.__master_shape = self.__find_master_shape()
+
+        return self.__master_shape
+
+    @property
+    def connects(self) -> List[Connect]:
+        return self.page.get_connects_of(self.ID)
+
+    def cell_value(self, name: str):
+        cell = self.cells.get(name)
+        if cell:
+            return cell.value
+
+        if self.master_page_ID is not None:
+            return self.master_shape.cell_value(name)
+
+    @property
+    def x(self):
+        return to_float(self.cell_value('PinX'))
+
+    @property
+    def y(self):
+        return to_float(self.cell_value('PinY'))
+
+    @property
+    def begin_x(self):
+        return to_float(self.cell_value('BeginX'))
+
+    @property
+    def begin_y(self):
+        return to_float(self.cell_value('BeginY'))
+
+    @property
+    def end_x(self):
+        return to_float(self.cell_value('EndX'))
+
+    @property
+    def end_y(self):
+        return to_float(self.cell_value('EndY'))
+
+    @property
+    def width(self):
+        return to_float(self.cell_value('Width'))
+
+    @property
+    def height(self):
+        return to_float(self.cell_value('Height'))
+
+    @property
+    def center_x_y(self) -> tuple:
+        if self.begin_x is not None:
+            return self.begin_x + (self.width / 2), self.begin_y + (self.height / 2)
+
+        return self.x, self.y
+
+    def find_shape_by_id(self, shape_id: str) -> Optional['VsdxShape']:
+        """
+        :return: The first shape with the id among the children of the shape, searched depth first
+        """
+        pending = list(reversed(self.child_shapes))
+        while pending:
+            shape = pending.pop()
+            if shape.ID == shape_id:
+                return shape
+            if shape.shape_type == 'Group':
+                pending.extend(reversed(shape.child_shapes))
+
+    def __find_master_shape(self) -> Optional['VsdxShape']:
+        master_page = self.master_page
+        if not master_page:
+            return None
+
+        # There is always a single shape in a master page
+        master_shape = master_page.child_shapes[0]
+        if self.master_shape_ID is not None:
+            return master_shape.find_shape_by_id(self.master_shape_ID)
+
+        return master_shape
+
+    def __repr__(self):
+        return f'<VsdxShape ID={self.ID} name={self.shape_name} type={self.shape_type}>'
+
+
+class VsdxPage:
+    """
+    Page or master read by the VsdxPageReader, which holds the connects between its shapes indexed by the ids of
+    the shapes they connect
+    """
+
+    def __init__(self, xml: Optional[Element], connects: List[Element], name: str, page_id: str,
+                 reader: 'VsdxPageReader'):
+        self.xml = xml
+        self.name = name
+        self.page_id = page_id
+        self.reader = reader
+        self.master_unique_id = None
+        self.master_base_id = None
+
+        self.connects = [Connect(xml=connect, page=self) for connect in connects]
+        self.__connects_by_shape_id: Dict[str, List[Connect]] = {}
+        for connect in self.connects:
+            self.__connects_by_shape_id.setdefault(connect.shape_id, []).append(connect)
+            if connect.connector_shape_id != connect.shape_id:
+                self.__connects_by_shape_id.setdefault(connect.connector_shape_id, []).append(connect)
+
+        self.__child_shapes: Optional[List[VsdxShape]] = None
+
+    @property
+    def child_shapes(self) -> List[VsdxShape]:
+        if self.__child_shapes is None:
+            shapes = self.xml.find(SHAPES_TAG)
+            self.__child_shapes = VsdxShape(shapes, self, self).child_shapes if shapes is not None else []
+
+        return self.__child_shapes
+
+    def get_connects_of(self, shape_id: str) -> List[Connect]:
+        """
+        :return: The connects from or to the shape, in the order they are in the page
+        """
+        return self.__connects_by_shape_id.get(shape_id, [])
+
+    def __repr__(self):
+        return f'<VsdxPage ID={self.page_id} name={self.name}>'
+
+
+class VsdxPageReader:
+    """
+    Reader of the first page of a VSDX package, which is the only one the diagram is taken from. The page is
+    parsed in a single pass, where the sections of the shapes, like their geometry or their text format, are dropped
+    as soon as they are read, since nothing is taken from them. The masters are indexed along with the page, but
+    each one is only read the first time a shape refers to it, so the package has to be kept open while the page
+    is in use
+    """
+
+    def __init__(self, package: VsdxPackage):
+        self.package = package
+
+        self.__masters: Optional[Dict[str, Tuple[Element, str]]] = None
+        self.__master_pages: Dict[str, VsdxPage] = {}
+
+    def read_page(self) -> VsdxPage:
+        relid_page_dict = {rel.attrib['Id']: rel.attrib['Target'] for rel in self.__read_root(PAGES_RELS_PART)}
+
+        page = self.__read_root(PAGES_PART)[0]
+        rel_id = page.find(f'{namespace}Rel').attrib[f'{r_namespace}id']
+        page_path = PAGES_FOLDER + relid_page_dict.get(rel_id, None)
+
+        # The masters are indexed now, so a package with broken masters fails to load as it does with vsdx
+        self.__index_masters()
+
+        return self.__read_page(page_path, page.attrib['Name'], page.attrib.get('ID'))
+
+    def get_master_page(self, master_id: str) -> Optional[VsdxPage]:
+        if master_id not in self.__masters:
+            return None
+
+        if master_id not in self.__master_pages:
+            master, master_path = self.__masters[master_id]
+            master_page = self.__read_page(
+                master_path, master.attrib.get('NameU') or master.attrib.get('Name') or 'Unknown', master_id)
+            master_page.master_unique_id = master.attrib.get('UniqueID')
+            master_page.master_base_id = master.attrib.get('BaseID')
+            self.__master_pages[master_id] = master_page
+            logger.debug(f'Read master {master_page.name} from {master_path}')
+
+        return self.__master_pages[master_id]
+
+    def __index_masters(self):
+        master_rels = self.__read_root(MASTERS_RELS_PART)
+        relid_to_path = {rel.attrib.get('Id'): MASTERS_FOLDER + rel.attrib.get('Target')
+                         for rel in (master_rels if master_rels is not None else [])}
+
+        self.__masters = {}
+        masters = self.__read_root(MASTERS_PART)
+        for master in masters if masters is not None else []:
+            rel_id = master.find(f'{namespace}Rel').attrib[f'{r_namespace}id']
+            self.__masters.setdefault(master.attrib['ID'], (master, relid_to_path[rel_id]))
+
+    def __read_page(self, part: str, name: str, page_id: str) -> VsdxPage:
+        if not self.package.has_part(part):
+            return VsdxPage(None, [], name, page_id, self)
+
+        connects = []
+        with self.package.zip.open(part) as part_file:
+            elements = ElementTree.iterparse(part_file, events=('end',))
+            for _, element in elements:
+                if element.tag == SECTION_TAG:
+                    element.clear()
+                elif element.tag == CONNECT_TAG:
+                    connects.append(element)
+
+        return VsdxPage(elements.root, connects, name, page_id, self)
+
+    def __read_root(self, part: str) -> Optional[Element]:
+        xml = self.package.read_xml(part)
+        return xml.getroot() if xml is not None else None
@@ -1,13 +1,17 @@
-from vsdx import Shape, VisioFile
+from typing import Union
+
+from vsdx import Shape
 
 from slp_base import DiagramType
 from slp_visio.slp_visio.load.boundary_identifier import BoundaryIdentifier
 from slp_visio.slp_visio.load.component_identifier import ComponentIdentifier
 from slp_visio.slp_visio.load.connector_identifier import ConnectorIdentifier
 from slp_visio.slp_visio.load.objects.diagram_objects import Diagram, DiagramComponentOrigin, DiagramLimits
+from slp_visio.slp_visio.load.representation.shape_geometry_cache import ShapeGeometryCache
 from slp_visio.slp_visio.load.representation.simple_component_representer import SimpleComponentRepresenter
 from slp_visio.slp_visio.load.representation.zone_component_representer import ZoneComponentRepresenter
-from slp_visio.slp_visio.util.visio import get_limits
+from slp_visio.slp_visio.load.vsdx_package import VsdxPackage
+from slp_visio.slp_visio.load.vsdx_page_reader import VsdxPageReader, VsdxPage
 
 DIAGRAM_LIMITS_PADDING = 2
 DEFAULT_DIAGRAM_LIMITS = DiagramLimits(((1000, 1000), (1000, 1000)))
@@ -16,9 +20,8 @@ BOUNDARY = 'boundary'
 CONNECTOR = 'connector'
 
 
-def load_visio_page_from_file(visio_filename: str):
-    with VisioFile(visio_filename) as vis:
-        return vis.pages[0]
+def load_visio_page(package: VsdxPackage) -> VsdxPage:
+    return VsdxPageReader(package).read_page()
 
 
 class VsdxParser:
@@ -31,18 +34,33 @@ class VsdxParser:
         self._component_representer = None
 
         self.page = None
+        self.geometry_cache = None
         self._visio_components = []
         self._visio_connectors = []
         self.component_identifier = ComponentIdentifier()
         self.connector_identifier = ConnectorIdentifier()
         self.boundary_identifier = BoundaryIdentifier()
 
-    def parse(self, visio_diagram_filename) -> Diagram:
-        self.page = load_visio_page_from_file(visio_diagram_filename)
+    def parse(self, source: Union[VsdxPackage, str]) -> Diagram:
+        """
+        :param source: The package of the diagram, or the name of its file
+        """
+        package = source if isinstance(source, VsdxPackage) else VsdxPackage(source)
+        try:
+            return self.__parse(package)
+        finally:
+            # The packages opened here are closed once the page is parsed, the rest are closed by their owners
+            if package is not source:
+                package.close()
+
+    def __parse(self, package: VsdxPackage) -> Diagram:
+        self.page = load_visio_page(package)
+        # The geometry of each shape is calculated once for the page and shared by everything reading it
+        self.geometry_cache = ShapeGeometryCache()
 
         diagram_limits = self.__calculate_diagram_limits()
-        self._component_representer = SimpleComponentRepresenter()
-        self.__zone_representer = ZoneComponentRepresenter(diagram_limits)
+        self._component_representer = SimpleComponentRepresenter(self.geometry_cache)
+        self.__zone_representer = ZoneComponentRepresenter(diagram_limits, self.geometry_cache)
 
         self._load_page_elements()
 
@@ -52,7 +70,7 @@ class VsdxParser:
         floor_coordinates = [None, None]
         top_coordinates = [0, 0]
 
-        for shape_limits in map(get_limits, self.page.child_shapes):
+        for shape_limits in map(self.geometry_cache.get_limits, self.page.child_shapes):
             if not floor_coordinates[0] or shape_limits[0][0] < floor_coordinates[0]:
                 floor_coordinates[0] = shape_limits[0][0] - DIAGRAM_LIMITS_PADDING
 
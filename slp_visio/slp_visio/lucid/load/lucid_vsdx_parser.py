@@ -1,18 +1,34 @@
+from typing import Optional
+
 from vsdx import Shape
 
-from slp_visio.slp_visio.load.parent_calculator import ParentCalculator
+from slp_visio.slp_visio.load.parent_calculator import IndexedParentCalculator
+from slp_visio.slp_visio.load.representation.component_shapes_index import ComponentShapesIndex
 from slp_visio.slp_visio.load.vsdx_parser import VsdxParser, COMPONENT
 
 
 class LucidVsdxParser(VsdxParser):
 
+    def __init__(self, component_factory, connector_factory):
+        super().__init__(component_factory, connector_factory)
+        self._components_index: Optional[ComponentShapesIndex] = None
+
+    def _load_connectors(self):
+        # The components of the page are indexed once for all its connectors
+        self._components_index = ComponentShapesIndex(
+            self._classified_shapes[COMPONENT], self._component_representer)
+        super()._load_connectors()
+
     def _add_connector(self, connector_shape: Shape):
 
-        visio_connector = self.connector_factory.create_connector(connector_shape, self._classified_shapes[COMPONENT])
+        visio_connector = self.connector_factory.create_connector(
+            connector_shape, self._classified_shapes[COMPONENT], self._component_representer,
+            components_index=self._components_index)
         if visio_connector:
             self._visio_connectors.append(visio_connector)
 
     def _calculate_parents(self):
         trustzones_and_components = [c for c in self._visio_components if c.type != 'Line']
+        parent_calculator = IndexedParentCalculator(trustzones_and_components)
         for component in trustzones_and_components:
-            component.parent = ParentCalculator(component).calculate_parent(trustzones_and_components)
+            component.parent = parent_calculator.calculate_parent(component)
@@ -15,8 +15,10 @@ class LucidConnectorFactory:
         CreateConnectorStrategyContainer.visio_strategies]):
         self.strategies = strategies
 
-    def create_connector(self, shape: Shape, components: [Shape]) -> Optional[DiagramConnector]:
+    def create_connector(self, shape: Shape, components: [Shape], representer=None,
+                         components_index=None) -> Optional[DiagramConnector]:
         for strategy in self.strategies:
-            connector = strategy.create_connector(shape, components=components)
+            connector = strategy.create_connector(
+                shape, components=components, representer=representer, components_index=components_index)
             if connector:
                 return connector
@@ -1,9 +1,10 @@
 from slp_base import DiagramType
 
+from slp_visio.slp_visio.load.vsdx_package import VsdxPackage
 from slp_visio.slp_visio.validate.visio_validator import VisioValidator
 
 
 class LucidValidator(VisioValidator):
 
-    def __init__(self, file):
-        super().__init__(file, DiagramType.LUCID)
+    def __init__(self, package: VsdxPackage):
+        super().__init__(package, DiagramType.LUCID)
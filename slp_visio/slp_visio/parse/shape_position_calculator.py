@@ -3,9 +3,14 @@ from vsdx.shapes import to_float, Shape
 
 class ShapePositionCalculator:
 
-    def __init__(self, shape: Shape):
+    def __init__(self, shape: Shape, parent_corners: dict = None):
+        """
+        :param parent_corners: Top left corners of the parents already calculated, by their XML element, which is
+        filled with the new ones so the parents shared by several shapes are only calculated once
+        """
         self.shape = shape
         self.max_levels = 12
+        self.parent_corners = parent_corners
 
 
     def get_absolute_center(self) -> {}:
@@ -18,8 +23,7 @@ class ShapePositionCalculator:
         parent: Shape = self.shape.parent
         level = 0
         while parent is not None and parent.ID is not None and level < self.max_levels:
-            left = to_float(parent.center_x_y[0]) - (to_float(parent.width) / 2)
-            top = to_float(parent.center_x_y[1]) - (to_float(parent.height) / 2)
+            left, top = self._get_parent_corner(parent)
             center = center[0] + left, center[1] + top
             parent = parent.parent
             level += 1
@@ -27,3 +31,19 @@ class ShapePositionCalculator:
 
     def _get_relative_center(self):
         return tuple(map(float, self.shape.center_x_y))
+
+    def _get_parent_corner(self, parent: Shape) -> tuple:
+        if self.parent_corners is None:
+            return self.__calculate_corner(parent)
+
+        corner = self.parent_corners.get(parent.xml)
+        if corner is None:
+            corner = self.__calculate_corner(parent)
+            self.parent_corners[parent.xml] = corner
+
+        return corner
+
+    @staticmethod
+    def __calculate_corner(parent: Shape) -> tuple:
+        return to_float(parent.center_x_y[0]) - (to_float(parent.width) / 2), \
+            to_float(parent.center_x_y[1]) - (to_float(parent.height) / 2)
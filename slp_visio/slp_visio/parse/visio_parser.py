@@ -11,7 +11,7 @@ from otm.otm.trustzone_representation_calculator import \
     calculate_missing_trustzones_representations
 from slp_base import ProviderParser
 from slp_visio.slp_visio.load.objects.diagram_objects import Diagram, DiagramComponent
-from slp_visio.slp_visio.load.parent_calculator import ParentCalculator
+from slp_visio.slp_visio.load.parent_calculator import IndexedParentCalculator
 from slp_visio.slp_visio.load.visio_mapping_loader import VisioMappingFileLoader
 from slp_visio.slp_visio.parse.diagram_pruner import DiagramPruner
 from slp_visio.slp_visio.parse.mappers.diagram_component_mapper import DiagramComponentMapper
@@ -183,5 +183,6 @@ class VisioParser(ProviderParser):
         return False
 
     def _calculate_parents(self):
+        parent_calculator = IndexedParentCalculator(self.diagram.components)
         for component in self.diagram.components:
-            component.parent = ParentCalculator(component).calculate_parent(self.diagram.components)
+            component.parent = parent_calculator.calculate_parent(component)
@@ -72,9 +72,11 @@ def normalize_angle(angle: float) -> float:
     return angle + 2 * pi if angle < 0 else angle
 
 
-def get_limits(shape: Shape) -> tuple:
-    calculator = ShapePositionCalculator(shape)
-    center_x, center_y = calculator.get_absolute_center()
+def get_limits(shape: Shape, center: tuple = None) -> tuple:
+    """
+    :param center: The absolute center of the shape, when it is already known
+    """
+    center_x, center_y = center or ShapePositionCalculator(shape).get_absolute_center()
     width = get_width(shape)
     height = get_height(shape)
 
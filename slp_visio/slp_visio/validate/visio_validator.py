@@ -1,11 +1,8 @@
 import logging
-import os
-from zipfile import ZipFile
-
-from sl_util.sl_util.file_utils import get_file_type_by_name
 
 from slp_base import ProviderValidator, DiagramFileNotValidError, DiagramType
 from slp_base.slp_base.provider_validator import generate_content_type_error, generate_size_error
+from slp_visio.slp_visio.load.vsdx_package import VsdxPackage, CONTENT_TYPES_PART
 
 logger = logging.getLogger(__name__)
 
@@ -15,29 +12,26 @@ MIN_SIZE = 10
 
 class VisioValidator(ProviderValidator):
 
-    def __init__(self, file, provider=DiagramType.VISIO):
-        self.file = file
+    def __init__(self, package: VsdxPackage, provider=DiagramType.VISIO):
+        self.package = package
         self.provider = provider
 
     def validate(self):
         logger.info('Validating visio file')
         self.__validate_size()
-        self.__validate_content_type()
-        self.__validate_zip_content()
+        mime = self.package.get_mime_type()
+        self.__validate_content_type(mime)
+        self.__validate_zip_content(mime)
 
     def __validate_size(self):
-        size = os.path.getsize(self.file.name)
+        size = self.package.size
         if size > MAX_SIZE or size < MIN_SIZE:
             raise generate_size_error(self.provider, 'diag_file', DiagramFileNotValidError)
 
-    def __validate_content_type(self):
-        mime = get_file_type_by_name(self.file.name)
+    def __validate_content_type(self, mime: str):
         if mime not in self.provider.valid_mime:
             raise generate_content_type_error(self.provider, 'diag_file', DiagramFileNotValidError)
 
-    def __validate_zip_content(self):
-        mime = get_file_type_by_name(self.file.name)
-        if 'application/zip' == mime:
-            with ZipFile(self.file.name) as myzip:
-                if not any("[Content_Types].xml" == file.filename for file in myzip.filelist):
-                    raise generate_content_type_error(self.provider, 'diag_file', DiagramFileNotValidError)
+    def __validate_zip_content(self, mime: str):
+        if 'application/zip' == mime and not self.package.has_part(CONTENT_TYPES_PART):
+            raise generate_content_type_error(self.provider, 'diag_file', DiagramFileNotValidError)
@@ -1,10 +1,10 @@
 from starlette.datastructures import UploadFile
 
-from sl_util.sl_util.file_utils import copy_to_disk, delete
 from slp_base import OTMProcessor, ProviderValidator, ProviderLoader, MappingValidator, MappingLoader, ProviderParser, \
     DiagramType
 from slp_visio.slp_visio.load.visio_loader import VisioLoader
 from slp_visio.slp_visio.load.visio_mapping_loader import VisioMappingFileLoader
+from slp_visio.slp_visio.load.vsdx_package import VsdxPackage
 from slp_visio.slp_visio.lucid.load.lucid_loader import LucidLoader
 from slp_visio.slp_visio.lucid.validate.lucid_validator import LucidValidator
 from slp_visio.slp_visio.parse.lucid_parser import LucidParser
@@ -23,8 +23,9 @@ class VisioProcessor(OTMProcessor):
         self.project_id = project_id
         self.project_name = project_name
         self.mappings = mappings
-        self.is_temporary_source = type(source) is UploadFile
-        self.source = copy_to_disk(source.file, '.vsdx') if self.is_temporary_source else source
+        # Uploaded files are read from the buffer they are received in, so they are not copied to disk
+        self.source = VsdxPackage(source.file, source.filename) if type(source) is UploadFile \
+            else VsdxPackage(source.name)
         self.loader = None
         self.mapping_loader = None
 
@@ -53,5 +54,4 @@ class VisioProcessor(OTMProcessor):
         return provider_parser(self.project_id, self.project_name, self.loader.get_visio(), self.mapping_loader)
 
     def _clean_resources(self):
-        if self.is_temporary_source:
-            delete(self.source.name)
+        self.source.close()
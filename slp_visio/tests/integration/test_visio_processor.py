@@ -1,9 +1,12 @@
+from unittest.mock import patch
+
 import pytest
 from pytest import mark
 
 from sl_util.sl_util.file_utils import get_byte_data
 from slp_base import DiagramFileNotValidError
 from slp_base.tests.util.otm import validate_and_compare_otm, validate_and_compare
+from slp_visio.slp_visio.load.vsdx_package import VsdxPackage
 from slp_visio.slp_visio.visio_processor import VisioProcessor
 from slp_visio.tests.resources import test_resource_paths
 from slp_visio.tests.resources.test_resource_paths import expected_aws_shapes, expected_simple_boundary_tzs, \
@@ -230,7 +233,7 @@ class TestVisioProcessor:
         processor = VisioProcessor("project-id", "project-name", source, [get_byte_data(default_visio_mapping)])
 
         # Then the original file is being used
-        assert file_exists(processor.source.name)
+        assert processor.source.source == source.name
 
         # And the file can be processed
         otm = processor.process()
@@ -238,39 +241,38 @@ class TestVisioProcessor:
         assert result == expected
 
         # And the original file is not deleted
-        assert file_exists(processor.source.name)
+        assert file_exists(source.name)
 
-    def test_temporary_file_is_deleted(self):
+    def test_uploaded_file_is_not_copied_to_disk(self):
         # Given a visio file uploaded through the API
         source = get_upload_file(test_resource_paths.visio_aws_shapes)
 
         # When the processor is instanced
-        processor = VisioProcessor("project-id", "project-name", source, [get_byte_data(default_visio_mapping)])
+        with patch('tempfile.NamedTemporaryFile') as named_temporary_file_mock:
+            processor = VisioProcessor("project-id", "project-name", source, [get_byte_data(default_visio_mapping)])
 
-        # Then a temporary file is created
-        assert file_exists(processor.source.name)
+            # Then the uploaded file is read from the buffer it was received in
+            assert processor.source.source is source.file
 
-        # And the file can be processed
-        otm = processor.process()
-        result, expected = validate_and_compare_otm(otm.json(), expected_aws_shapes, None)
-        assert result == expected
+            # And the file can be processed
+            otm = processor.process()
+            result, expected = validate_and_compare_otm(otm.json(), expected_aws_shapes, None)
+            assert result == expected
 
-        # And the temporary file is deleted after processing
-        assert not file_exists(processor.source.name)
+        # And no copy of it is written to disk
+        named_temporary_file_mock.assert_not_called()
 
-    def test_temporary_file_is_deleted_when_exception(self):
+    def test_uploaded_file_is_closed_when_exception(self):
         # Given an invalid visio file uploaded through the API
         source = get_upload_file(test_resource_paths.visio_invalid_file_size)
 
         # When the processor is instanced
         processor = VisioProcessor("project-id", "project-name", source, [get_byte_data(default_visio_mapping)])
 
-        # Then a temporary file is created
-        assert file_exists(processor.source.name)
-
-        # And a validation exception is raised
-        with pytest.raises(DiagramFileNotValidError):
-            processor.process()
+        # Then a validation exception is raised
+        with patch.object(VsdxPackage, 'close', wraps=processor.source.close) as close_mock:
+            with pytest.raises(DiagramFileNotValidError):
+                processor.process()
 
-        # And the temporary file is deleted after processing
-        assert not file_exists(processor.source.name)
+        # And the package of the file is closed after processing
+        close_mock.assert_called_once()
@@ -0,0 +1,75 @@
+from unittest.mock import Mock, PropertyMock
+
+from slp_visio.slp_visio.load.representation.shape_geometry_cache import ShapeGeometryCache
+from slp_visio.slp_visio.load.representation.simple_component_representer import SimpleComponentRepresenter
+from slp_visio.slp_visio.parse.shape_position_calculator import ShapePositionCalculator
+from slp_visio.slp_visio.util.visio import get_limits
+from slp_visio.tests.util.visio import read_visio_main_page
+from slp_visio.tests.resources.test_resource_paths import visio_shape_group
+
+
+def get_all_shapes(shapes) -> list:
+    result = []
+    for shape in shapes:
+        result.append(shape)
+        if shape.shape_type == 'Group':
+            result.extend(get_all_shapes(shape.child_shapes))
+    return result
+
+
+def mock_shape(shape_id: int, center: tuple, parent=None) -> Mock:
+    shape = Mock(ID=shape_id, width=2, height=2)
+    shape.parent = parent
+    shape.center_x_y_mock = PropertyMock(return_value=center)
+    type(shape).center_x_y = shape.center_x_y_mock
+    return shape
+
+
+class TestShapeGeometryCache:
+
+    def test_same_geometry_as_calculating_each_shape(self):
+        # GIVEN the shapes of a page with nested groups
+        shapes = get_all_shapes(read_visio_main_page(visio_shape_group).child_shapes)
+
+        # WHEN their geometry is read from the cache
+        cache = ShapeGeometryCache()
+        centers = [cache.get_absolute_center(shape) for shape in shapes]
+        limits = [cache.get_limits(shape) for shape in shapes]
+        polygons = [cache.get_polygon(shape) for shape in shapes]
+
+        # THEN it is the same as calculating the geometry of each shape on its own
+        assert len(shapes) == 17
+        assert centers == [ShapePositionCalculator(shape).get_absolute_center() for shape in shapes]
+        assert limits == [get_limits(shape) for shape in shapes]
+        assert polygons == [SimpleComponentRepresenter().build_representation(shape) for shape in shapes]
+
+    def test_geometry_is_calculated_once_per_shape(self):
+        # GIVEN a page
+        page = read_visio_main_page(visio_shape_group)
+        cache = ShapeGeometryCache()
+
+        # WHEN the geometry of its shapes is read twice, the children of the page being read again each time
+        first_polygons = [cache.get_polygon(shape) for shape in get_all_shapes(page.child_shapes)]
+        second_polygons = [cache.get_polygon(shape) for shape in get_all_shapes(page.child_shapes)]
+
+        # THEN the same geometry is returned for the same shapes
+        assert all(first is second for first, second in zip(first_polygons, second_polygons))
+
+    def test_parents_are_calculated_once(self):
+        # GIVEN a group inside another one
+        group = mock_shape(1, (5, 5))
+        inner_group = mock_shape(2, (3, 3), parent=group)
+
+        # AND some shapes inside the inner group
+        shapes = [mock_shape(3 + index, (index, index), parent=inner_group) for index in range(3)]
+
+        # WHEN the absolute center of the shapes is calculated
+        cache = ShapeGeometryCache()
+        centers = [cache.get_absolute_center(shape) for shape in shapes]
+
+        # THEN the centers are relative to the corners of both groups
+        assert centers == [(6, 6), (7, 7), (8, 8)]
+
+        # AND the center of each group is only read to calculate its corner once
+        assert group.center_x_y_mock.call_count == 2
+        assert inner_group.center_x_y_mock.call_count == 2
@@ -1,7 +1,12 @@
+from random import Random
 from unittest.mock import MagicMock, Mock, patch
 
 from pytest import mark, param
+from shapely.geometry import Point
 
+from slp_visio.slp_visio.load.representation.component_shapes_index import ComponentShapesIndex
+from slp_visio.slp_visio.load.representation.shape_geometry_cache import ShapeGeometryCache
+from slp_visio.slp_visio.load.representation.simple_component_representer import SimpleComponentRepresenter
 from slp_visio.slp_visio.load.strategies.connector.impl.create_connector_by_line_coordinates import \
     CreateConnectorByLineCoordinates
 
@@ -18,6 +23,15 @@ def mock_component(_id, pos):
     return mocked
 
 
+def match_component_by_scan(point: Point, components) -> int:
+    matching_id, matching_distance = None, TOLERANCE
+    for component in components:
+        distance = round(SimpleComponentRepresenter().build_representation(component).exterior.distance(point), 2)
+        if distance <= matching_distance:
+            matching_id, matching_distance = component.ID, distance
+    return matching_id
+
+
 class TestCreateConnectorByLineCoordinates:
     @mark.parametrize('line,start,end', [
         param(['1040', '-560', '1290', '-560'], ['960', '-600', '80', '80'], ['1290', '-590', '60', '60'],
@@ -163,3 +177,87 @@ class TestCreateConnectorByLineCoordinates:
 
         # THEN no diagram is returned
         assert not diagram_connector
+
+    def test_components_are_represented_once_per_page(self):
+        # GIVEN the components of a page
+        components = [mock_component(4, [0.96, -0.6, 0.08, 0.08]), mock_component(5, [1.29, -0.59, 0.06, 0.06])]
+
+        # AND some connectors between them
+        shapes = [MagicMock(ID=index, begin_x=1.04, begin_y=-0.56, end_x=1.29, end_y=-0.56) for index in range(3)]
+
+        # WHEN the connectors are created with the index of the components of the page
+        strategy = CreateConnectorByLineCoordinates()
+        with patch.object(SimpleComponentRepresenter, 'build_representation',
+                          wraps=strategy.representer.build_representation) as build_representation_mock:
+            components_index = ComponentShapesIndex(components, strategy.representer)
+            diagram_connectors = [strategy.create_connector(shape, components=components,
+                                                            components_index=components_index) for shape in shapes]
+
+        # THEN all of them are created
+        assert [(connector.from_id, connector.to_id) for connector in diagram_connectors] == [(4, 5)] * 3
+
+        # AND the representation of each component is built only once
+        assert build_representation_mock.call_count == len(components)
+
+    def test_components_are_represented_by_the_given_representer(self):
+        # GIVEN the components of a page
+        components = [mock_component(4, [0.96, -0.6, 0.08, 0.08]), mock_component(5, [1.29, -0.59, 0.06, 0.06])]
+
+        # AND the representer of the page
+        representer = SimpleComponentRepresenter(ShapeGeometryCache())
+
+        # WHEN a connector between them is created with the representer
+        shape = MagicMock(ID=1, begin_x=1.04, begin_y=-0.56, end_x=1.29, end_y=-0.56)
+        with patch.object(ShapeGeometryCache, 'get_polygon',
+                          wraps=representer.geometry_cache.get_polygon) as get_polygon_mock:
+            diagram_connector = CreateConnectorByLineCoordinates().create_connector(
+                shape, components=components, representer=representer)
+
+        # THEN the connector is created
+        assert (diagram_connector.from_id, diagram_connector.to_id) == (4, 5)
+
+        # AND the components are represented by the geometry kept for the page
+        assert [call.args[0] for call in get_polygon_mock.call_args_list] == components
+
+    def test_components_of_other_pages_are_not_kept(self):
+        # GIVEN the components of two pages, at the same place but with different ids
+        first_page = [mock_component(4, [0.96, -0.6, 0.08, 0.08]), mock_component(5, [1.29, -0.59, 0.06, 0.06])]
+        second_page = [mock_component(6, [0.96, -0.6, 0.08, 0.08]), mock_component(7, [1.29, -0.59, 0.06, 0.06])]
+
+        # AND a connector between them
+        shape = MagicMock(ID=1, begin_x=1.04, begin_y=-0.56, end_x=1.29, end_y=-0.56)
+
+        # WHEN the connector is created by the same strategy for each page
+        strategy = CreateConnectorByLineCoordinates()
+        first_connector = strategy.create_connector(
+            shape, components=first_page, components_index=ComponentShapesIndex(first_page, strategy.representer))
+        second_connector = strategy.create_connector(shape, components=second_page)
+
+        # THEN each connector joins the components of its own page
+        assert (first_connector.from_id, first_connector.to_id) == (4, 5)
+        assert (second_connector.from_id, second_connector.to_id) == (6, 7)
+
+    def test_same_matches_as_checking_every_component(self):
+        # GIVEN many components next to each other, some of them at the same distance of the points between them
+        random = Random(1)
+        components = [mock_component(index, [(index % 20) * 0.2, (index // 20) * 0.2, 0.1, 0.1])
+                      for index in range(200)]
+
+        # AND connectors with their ends near the components
+        shapes = [MagicMock(ID=index, begin_x=random.uniform(-0.2, 4.2), begin_y=random.uniform(-0.2, 2.2),
+                            end_x=random.choice([0.15, 0.2, 0.35]), end_y=random.uniform(-0.2, 2.2))
+                  for index in range(100)]
+
+        # WHEN the connectors are created
+        strategy = CreateConnectorByLineCoordinates()
+        diagram_connectors = [strategy.create_connector(shape, components=components) for shape in shapes]
+
+        # THEN the components matched are the same as checking every component
+        for shape, diagram_connector in zip(shapes, diagram_connectors):
+            origin = match_component_by_scan(Point(shape.begin_x, shape.begin_y), components)
+            target = match_component_by_scan(Point(shape.end_x, shape.end_y), components)
+            expected = (origin, target) if origin is not None and target is not None else None
+            assert ((diagram_connector.from_id, diagram_connector.to_id) if diagram_connector else None) == expected
+
+        # AND some of them are connected
+        assert any(diagram_connectors)
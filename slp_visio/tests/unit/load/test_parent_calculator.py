@@ -1,9 +1,10 @@
+from random import Random
 from unittest.mock import patch
 
-from shapely.geometry import Polygon, Point
+from shapely.geometry import Polygon, Point, box
 
 from slp_visio.slp_visio.load.objects.diagram_objects import DiagramComponent
-from slp_visio.slp_visio.load.parent_calculator import ParentCalculator
+from slp_visio.slp_visio.load.parent_calculator import ParentCalculator, IndexedParentCalculator
 
 CHILD_CANDIDATE_NAME = 'Child Candidate'
 PARENT_CANDIDATE_NAME = 'Parent Candidate'
@@ -12,6 +13,17 @@ def create_representation_mock(dimension: float = None) -> Polygon:
     return Point(1, 1).buffer(dimension or 10, 0)
 
 
+def create_random_components(count: int) -> [DiagramComponent]:
+    random = Random(count)
+    components = []
+    for index in range(count):
+        x, y = random.uniform(0, 1000), random.uniform(0, 1000)
+        width, height = random.choice([(5, 5), (50, 40), (50, 40), (300, 200)])
+        components.append(DiagramComponent(
+            id=str(index), name=str(index), representation=box(x, y, x + width, y + height)))
+    return components
+
+
 class TestParentCalculator:
 
     def test_no_parent_candidates(self):
@@ -102,3 +114,50 @@ class TestParentCalculator:
 
         # THEN the parent candidate with smaller area is returned
         assert parent == parent_candidate_smaller_area
+
+
+class TestIndexedParentCalculator:
+
+    def test_same_parents_as_parent_calculator(self):
+        # GIVEN many components of different sizes, some of them inside others
+        components = create_random_components(300)
+
+        # WHEN calculating the parents of all of them
+        parent_calculator = IndexedParentCalculator(components)
+        parents = [parent_calculator.calculate_parent(component) for component in components]
+
+        # THEN every component gets the same parent as calculating it one by one
+        assert parents == [ParentCalculator(component).calculate_parent(components) for component in components]
+        assert any(parents)
+
+    def test_parents_with_same_area(self):
+        # GIVEN a child candidate
+        child_candidate = DiagramComponent(id='CC', name=CHILD_CANDIDATE_NAME, representation=box(4, 4, 6, 6))
+
+        # AND two parent candidates with the same area containing it
+        # AND a parent candidate with the same representation as the child
+        parent_candidates = [
+            DiagramComponent(id='PC1', name=PARENT_CANDIDATE_NAME, representation=box(0, 0, 10, 10)),
+            DiagramComponent(id='PC2', name=PARENT_CANDIDATE_NAME, representation=box(1, 1, 11, 11)),
+            DiagramComponent(id='PC3', name=PARENT_CANDIDATE_NAME, representation=box(4, 4, 6, 6)),
+            child_candidate]
+
+        # WHEN calling calculate_parent
+        parent = IndexedParentCalculator(parent_candidates).calculate_parent(child_candidate)
+
+        # THEN the first of the candidates with the smallest area is returned
+        assert parent == parent_candidates[0]
+
+    def test_component_without_representation(self):
+        # GIVEN a child candidate without representation
+        child_candidate = DiagramComponent(id='CC', name=CHILD_CANDIDATE_NAME)
+
+        # AND a parent candidate
+        parent_candidates = [DiagramComponent(
+            id='PC', name=PARENT_CANDIDATE_NAME, representation=create_representation_mock())]
+
+        # WHEN calling calculate_parent
+        parent = IndexedParentCalculator(parent_candidates).calculate_parent(child_candidate)
+
+        # THEN no parent is returned
+        assert not parent
@@ -0,0 +1,72 @@
+from unittest.mock import patch
+from zipfile import ZipFile
+
+from pytest import mark, param
+
+from slp_visio.slp_visio.load.vsdx_package import VsdxPackage, MIME_TYPE_HEADER_SIZE
+from slp_visio.slp_visio.load.vsdx_page_reader import VsdxPageReader
+from slp_visio.tests.resources import test_resource_paths
+from sl_util.tests.util.file_utils import get_upload_file
+
+
+class TestVsdxPackage:
+
+    def test_zip_is_opened_once(self):
+        # GIVEN a visio file uploaded through the API
+        package = VsdxPackage(get_upload_file(test_resource_paths.visio_aws_shapes).file)
+
+        # WHEN it is validated and its page and masters are read
+        with patch('slp_visio.slp_visio.load.vsdx_package.ZipFile', wraps=ZipFile) as zip_file_mock:
+            package.has_part('[Content_Types].xml')
+            page = VsdxPageReader(package).read_page()
+            assert all(shape.master_page for shape in page.child_shapes)
+
+        # THEN its zip is only opened once
+        zip_file_mock.assert_called_once()
+
+        package.close()
+
+    @mark.parametrize('visio_filename', [
+        param(test_resource_paths.visio_aws_shapes, id='aws_shapes'),
+        param(test_resource_paths.visio_aws_stencils, id='aws_stencils'),
+        param(test_resource_paths.visio_orphan_dataflows, id='orphan_dataflows')
+    ])
+    def test_same_size_and_mime_type_in_memory_and_on_disk(self, visio_filename: str):
+        # GIVEN a visio file on disk
+        on_disk = VsdxPackage(visio_filename)
+
+        # AND the same file uploaded through the API
+        in_memory = VsdxPackage(get_upload_file(visio_filename).file)
+
+        # THEN both have the same size and mime type
+        assert on_disk.size == in_memory.size
+        assert on_disk.get_mime_type() == in_memory.get_mime_type()
+
+    def test_mime_type_is_read_from_the_header(self):
+        # GIVEN a visio file uploaded through the API
+        upload = get_upload_file(test_resource_paths.visio_aws_stencils).file
+        package = VsdxPackage(upload)
+
+        # WHEN its mime type is read
+        with patch.object(upload, 'read', wraps=upload.read) as read_mock:
+            mime_type = package.get_mime_type()
+
+        # THEN only its header is read
+        assert mime_type == 'application/vnd.ms-visio.drawing.main+xml'
+        read_mock.assert_called_once_with(MIME_TYPE_HEADER_SIZE)
+
+        # AND the file is left at its start
+        assert upload.tell() == 0
+
+    def test_missing_part(self):
+        # GIVEN a visio file
+        package = VsdxPackage(test_resource_paths.visio_aws_shapes)
+
+        # WHEN a part it does not have is read
+        xml = package.read_xml('visio/pages/page99.xml')
+
+        # THEN nothing is returned
+        assert xml is None
+        assert not package.has_part('visio/pages/page99.xml')
+
+        package.close()
@@ -0,0 +1,125 @@
+import glob
+import os
+from unittest.mock import patch
+
+import pytest
+from pytest import mark, param
+from vsdx import VisioFile
+
+from slp_visio.slp_visio.load.vsdx_package import VsdxPackage
+from slp_visio.slp_visio.load.vsdx_page_reader import VsdxPageReader
+from slp_visio.tests.resources import test_resource_paths
+
+VSDX_FIXTURES = sorted(glob.glob(f'{test_resource_paths.path}/**/*.vsdx', recursive=True))
+
+
+def read_safely(read):
+    try:
+        return read()
+    except Exception as e:
+        return e.__class__.__name__
+
+
+def describe_master_page(shape) -> tuple:
+    master_page = shape.master_page
+    return (master_page.name, master_page.page_id, master_page.master_unique_id,
+            master_page.master_base_id) if master_page else None
+
+
+def describe_master_shape(master_shape) -> tuple:
+    return (master_shape.ID, master_shape.shape_name) if master_shape else None
+
+
+def describe_shape(shape) -> dict:
+    """
+    :return: Everything the identifiers, strategies and representers read from the shape and its children
+    """
+    return {
+        'ID': shape.ID,
+        'shape_name': shape.shape_name,
+        'shape_type': shape.shape_type,
+        'master_page_ID': shape.master_page_ID,
+        'master_shape_ID': shape.master_shape_ID,
+        'text': read_safely(lambda: shape.text),
+        # The cells of the sections, like the geometry, are not read by the page reader
+        'cells': {name: cell.value for name, cell in shape.cells.items() if '/' not in name},
+        'center_x_y': read_safely(lambda: shape.center_x_y),
+        'line': read_safely(lambda: (shape.begin_x, shape.begin_y, shape.end_x, shape.end_y)),
+        'arrows': read_safely(lambda: (shape.cell_value('BeginArrow'), shape.cell_value('EndArrow'))),
+        'connects': [(c.shape_id, c.connector_shape_id, c.from_rel, c.to_rel) for c in shape.connects],
+        'master_page': read_safely(lambda: describe_master_page(shape)),
+        'master_shape': read_safely(lambda: describe_master_shape(shape.master_shape)),
+        'parent': (shape.parent.ID, shape.parent.parent.ID if shape.parent.ID else None),
+        'child_shapes': [describe_shape(child) for child in shape.child_shapes]
+    }
+
+
+class TestVsdxPageReader:
+
+    @mark.parametrize('visio_filename', [param(filename, id=os.path.basename(filename))
+                                         for filename in VSDX_FIXTURES])
+    def test_same_page_as_vsdx(self, visio_filename: str):
+        # GIVEN a visio file
+        package = VsdxPackage(visio_filename)
+
+        # AND its first page as read by vsdx
+        try:
+            with VisioFile(visio_filename) as vis:
+                expected_page = vis.pages[0]
+                expected_shapes = [describe_shape(shape) for shape in expected_page.child_shapes]
+        except Exception:
+            # WHEN vsdx cannot read it THEN the page reader cannot either
+            with pytest.raises(Exception):
+                VsdxPageReader(package).read_page()
+            return
+
+        # WHEN the page is read by the page reader
+        page = VsdxPageReader(package).read_page()
+
+        # THEN the page and all its shapes are the same
+        assert (page.name, page.page_id) == (expected_page.name, expected_page.page_id)
+        assert [describe_shape(shape) for shape in page.child_shapes] == expected_shapes
+
+        package.close()
+
+    def test_only_the_parts_needed_are_read(self):
+        # GIVEN a visio file with several pages
+        package = VsdxPackage(test_resource_paths.visio_multiple_pages_diagram)
+
+        # WHEN its first page and the masters of its shapes are read
+        with patch.object(VsdxPackage, 'read_xml', wraps=package.read_xml) as read_xml_mock, \
+                patch.object(package.zip, 'open', wraps=package.zip.open) as open_mock:
+            page = VsdxPageReader(package).read_page()
+            masters = {shape.master_page.page_id for shape in page.child_shapes if shape.master_page}
+
+        # THEN only the indexes of the pages and the masters are read
+        assert [call.args[0] for call in read_xml_mock.call_args_list] == [
+            'visio/pages/_rels/pages.xml.rels', 'visio/pages/pages.xml',
+            'visio/masters/_rels/masters.xml.rels', 'visio/masters/masters.xml']
+
+        # AND the first page along with the masters used by its shapes
+        parsed_parts = [call.args[0] for call in open_mock.call_args_list][4:]
+        assert parsed_parts[0] == 'visio/pages/page1.xml'
+        assert len(parsed_parts) == len(set(parsed_parts)) == 1 + len(masters)
+        assert all(part.startswith('visio/masters/master') for part in parsed_parts[1:])
+
+        package.close()
+
+    def test_children_and_masters_are_read_once(self):
+        # GIVEN the first page of a visio file
+        package = VsdxPackage(test_resource_paths.visio_aws_shapes)
+        page = VsdxPageReader(package).read_page()
+
+        # WHEN its shapes are read twice
+        shapes = page.child_shapes
+
+        # THEN the same shapes are returned
+        assert page.child_shapes is shapes
+        assert all(shape.child_shapes is shape.child_shapes for shape in shapes)
+
+        # AND so are their masters
+        assert any(shape.master_shape for shape in shapes)
+        assert all(shape.master_shape is shape.master_shape for shape in shapes)
+        assert all(shape.master_page is shape.master_page for shape in shapes)
+
+        package.close()
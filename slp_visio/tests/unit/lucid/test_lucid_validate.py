@@ -1,14 +1,16 @@
-from unittest.mock import patch, MagicMock, mock_open, Mock
+from unittest.mock import patch, mock_open, Mock
 
 import pytest
 
 from slp_base import DiagramFileNotValidError
+from slp_visio.slp_visio.load.vsdx_package import VsdxPackage
 from slp_visio.slp_visio.lucid.validate.lucid_validator import LucidValidator
 
 
 class MockZipf:
     def __init__(self, filename):
         self.filelist = [Mock(filename=filename)]
+        self.NameToInfo = {file.filename: file for file in self.filelist}
 
     def __iter__(self):
         return iter(self.filelist)
@@ -21,7 +23,10 @@ class MockZipf:
 
 
 class TestLucidValidator:
-    validator = LucidValidator(MagicMock(name="file_name"))
+    @property
+    def validator(self):
+        # The package keeps the zip it opens, so each test validates a new one
+        return LucidValidator(VsdxPackage("file_name"))
 
     @patch("os.path.getsize")
     @pytest.mark.parametrize('size_value', [
@@ -52,7 +57,7 @@ class TestLucidValidator:
         assert error_info.typename == 'DiagramFileNotValidError'
         assert error_info.value.message == 'Invalid content type for diag_file'
 
-    @patch("slp_visio.slp_visio.validate.visio_validator.ZipFile")
+    @patch("slp_visio.slp_visio.load.vsdx_package.ZipFile")
     @patch("magic.Magic.from_file")
     @patch("os.path.getsize")
     @pytest.mark.parametrize('size_value, mime_type_value', [
@@ -69,7 +74,7 @@ class TestLucidValidator:
 
         self.validator.validate()
 
-    @patch("slp_visio.slp_visio.validate.visio_validator.ZipFile")
+    @patch("slp_visio.slp_visio.load.vsdx_package.ZipFile")
     @patch("magic.Magic.from_file")
     @patch("os.path.getsize")
     def test_invalid_zip(self, getsize_mock, get_mime_type, zip_file):
@@ -1,13 +1,14 @@
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 import pytest
 
 from slp_base import DiagramFileNotValidError
+from slp_visio.slp_visio.load.vsdx_package import VsdxPackage
 from slp_visio.slp_visio.validate.visio_validator import VisioValidator
 
 
 class TestVisioValidator:
-    validator = VisioValidator(MagicMock(name="file_name"))
+    validator = VisioValidator(VsdxPackage("file_name"))
 
     @patch("os.path.getsize")
     @pytest.mark.parametrize('size_value', [
@@ -10,6 +10,7 @@ from slp_base.slp_base.provider_resolver import ProviderResolver
 from slp_base.slp_base.provider_type import IacType
 from startleft.startleft.api.check_mime_type import check_mime_type
 from startleft.startleft.api.controllers.otm_controller import RESPONSE_STATUS_CODE, PREFIX, controller_responses
+from startleft.startleft.iac_options import get_iac_processor_options
 
 URL = '/iac'
 
@@ -33,7 +34,8 @@ def iac(iac_file: List[UploadFile]
         name: str = Form(...),
         mapping_file: UploadFile = File(None),
         default_mapping_file: UploadFile = File(None),
-        custom_mapping_file: UploadFile = File(None)):
+        custom_mapping_file: UploadFile = File(None),
+        nested_stacks: bool = Form(None)):
     logger.info(f"POST request received for creating new project with id {id} and name {name} from IaC {iac_type} file")
 
     logger.info("Parsing Threat Model file to OTM")
@@ -48,7 +50,9 @@ def iac(iac_file: List[UploadFile]
         with custom_mapping_file.file as f:
             mapping_data_list.append(f.read())
 
-    processor = provider_resolver.get_processor(iac_type, id, name, iac_data, mapping_data_list)
+    options = get_iac_processor_options(iac_type, nested_stacks=nested_stacks,
+                                        source_names=[iac_file_element.filename for iac_file_element in iac_file])
+    processor = provider_resolver.get_processor(iac_type, id, name, iac_data, mapping_data_list, **options)
     otm = processor.process()
 
     return Response(status_code=201, media_type="application/json", content=get_otm_as_json(otm))
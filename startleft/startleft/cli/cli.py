@@ -21,6 +21,7 @@ from slp_visio.slp_visio.visio_summary import VisioSummary
 from startleft.startleft._version.version_loader import load_startleft_version
 from startleft.startleft.api import fastapi_server
 from startleft.startleft.cli.clioptions.exclusion_option import Exclusion
+from startleft.startleft.iac_options import get_iac_processor_options
 from startleft.startleft.log import get_log_level, configure_logging
 from startleft.startleft.messages import *
 
@@ -81,7 +82,7 @@ def cli(log_level, verbose):
 
 
 def parse_iac(iac_type, default_mapping_file, custom_mapping_file, output_file, project_name, project_id,
-              iac_files):
+              iac_files, iac_max_size=None, mapping_max_size=None, streaming=None, nested_stacks=None):
     """
     Parses IaC source files into Open Threat Model
     """
@@ -95,8 +96,11 @@ def parse_iac(iac_type, default_mapping_file, custom_mapping_file, output_file,
     if custom_mapping_file:
         mapping_data_list.append(get_byte_data(custom_mapping_file))
 
-    processor = provider_resolver.get_processor(IacType(iac_type.upper()), project_id, project_name, iac_data,
-                                                mapping_data_list)
+    type_ = IacType(iac_type.upper())
+    options = get_iac_processor_options(type_, iac_max_size, mapping_max_size, streaming, nested_stacks,
+                                        source_names=list(iac_files))
+    processor = provider_resolver.get_processor(type_, project_id, project_name, iac_data, mapping_data_list,
+                                                **options)
     otm = processor.process()
 
     get_otm_as_file(otm, output_file)
@@ -188,15 +192,21 @@ def __diagram_summary(source_files: List[str], default_mapping_file: Optional[st
 @click.option(OUTPUT_FILE_NAME, OUTPUT_FILE_SHORTNAME, default=OUTPUT_FILE, help=OUTPUT_FILE_DESC)
 @click.option(PROJECT_NAME_NAME, PROJECT_NAME_SHORTNAME, required=True, help=PROJECT_NAME_DESC)
 @click.option(PROJECT_ID_NAME, PROJECT_ID_SHORTNAME, required=True, help=PROJECT_ID_DESC)
+@click.option(IAC_MAX_SIZE_NAME, type=click.IntRange(min=1), help=IAC_MAX_SIZE_DESC)
+@click.option(MAPPING_MAX_SIZE_NAME, type=click.IntRange(min=1), help=MAPPING_MAX_SIZE_DESC)
+@click.option(IAC_STREAMING_NAME, default=None, help=IAC_STREAMING_DESC)
+@click.option(CFT_NESTED_STACKS_NAME, default=None, help=CFT_NESTED_STACKS_DESC)
 @click.argument(SOURCE_FILE_NAME, required=True, nargs=-1)
 def parse_any(iac_type, diagram_type, etm_type, default_mapping_file, custom_mapping_file,
-              output_file, project_name, project_id, source_file):
+              output_file, project_name, project_id, iac_max_size, mapping_max_size, streaming, nested_stacks,
+              source_file):
     """
     Parses source files into Open Threat Model
     """
     logger.info("Parsing source files into OTM")
     if iac_type is not None:
-        parse_iac(iac_type, default_mapping_file, custom_mapping_file, output_file, project_name, project_id, source_file)
+        parse_iac(iac_type, default_mapping_file, custom_mapping_file, output_file, project_name, project_id, source_file,
+                  iac_max_size, mapping_max_size, streaming, nested_stacks)
     elif diagram_type is not None:
         parse_diagram(diagram_type, default_mapping_file, custom_mapping_file, output_file, project_name,
                       project_id, source_file)
@@ -0,0 +1,64 @@
+import os
+from typing import List, Optional, Union
+
+from slp_base import IacType
+
+# Environment variables with the options of the IaC processors, for the REST API and for the options not given in the
+# CLI. The sizes are in bytes
+IAC_MAX_SIZE_ENVVAR = 'STARTLEFT_IAC_MAX_SIZE'
+MAPPING_MAX_SIZE_ENVVAR = 'STARTLEFT_MAPPING_MAX_SIZE'
+IAC_STREAMING_ENVVAR = 'STARTLEFT_IAC_STREAMING'
+CFT_NESTED_STACKS_ENVVAR = 'STARTLEFT_CFT_NESTED_STACKS'
+
+# IaC types whose processors accept these options
+CONFIGURABLE_IAC_TYPES = [IacType.CLOUDFORMATION, IacType.TERRAFORM]
+
+TRUE_VALUES = ['1', 'true', 'yes']
+FALSE_VALUES = ['0', 'false', 'no']
+
+
+def get_iac_processor_options(iac_type: Union[IacType, str], max_size: int = None, mapping_max_size: int = None,
+                              streaming: bool = None, nested_stacks: bool = None,
+                              source_names: List[str] = None) -> dict:
+    """
+    :param source_names: The file names of the sources, which CLOUDFORMATION needs to link its nested stacks
+    :return: The keyword arguments of the processor of the IaC type with the given options. The options that are not
+    given are taken from the environment, and the ones not set there keep the defaults of the processor
+    """
+    iac_type = next((configurable for configurable in CONFIGURABLE_IAC_TYPES
+                     if iac_type in [configurable, configurable.value]), None)
+    if iac_type is None:
+        return {}
+
+    options = {
+        'max_size': max_size if max_size is not None else __get_size(IAC_MAX_SIZE_ENVVAR),
+        'mapping_max_size': mapping_max_size if mapping_max_size is not None else __get_size(MAPPING_MAX_SIZE_ENVVAR),
+        'streaming': streaming if streaming is not None else __get_flag(IAC_STREAMING_ENVVAR)
+    }
+
+    if iac_type == IacType.CLOUDFORMATION and \
+            (nested_stacks if nested_stacks is not None else __get_flag(CFT_NESTED_STACKS_ENVVAR)):
+        options['nested_stacks'] = True
+        options['source_names'] = source_names
+
+    return {name: value for name, value in options.items() if value is not None}
+
+
+def __get_size(envvar: str) -> Optional[int]:
+    value = os.getenv(envvar)
+    if not value:
+        return None
+
+    if not value.strip().isdigit() or int(value) == 0:
+        raise ValueError(f'{envvar} must be a positive number of bytes, not {value}')
+    return int(value)
+
+
+def __get_flag(envvar: str) -> Optional[bool]:
+    value = os.getenv(envvar)
+    if not value:
+        return None
+
+    if value.strip().lower() not in TRUE_VALUES + FALSE_VALUES:
+        raise ValueError(f'{envvar} must be one of {", ".join(TRUE_VALUES + FALSE_VALUES)}, not {value}')
+    return value.strip().lower() in TRUE_VALUES
@@ -64,6 +64,23 @@ PROJECT_ID_NAME = '--project-id'
 PROJECT_ID_SHORTNAME = '-i'
 PROJECT_ID_DESC = 'Project id.'
 
+IAC_MAX_SIZE_NAME = '--iac-max-size'
+IAC_MAX_SIZE_DESC = 'Maximum size in bytes of each CLOUDFORMATION or TERRAFORM file. Defaults to the ' \
+                    'STARTLEFT_IAC_MAX_SIZE environment variable, if set.'
+
+MAPPING_MAX_SIZE_NAME = '--mapping-max-size'
+MAPPING_MAX_SIZE_DESC = 'Maximum size in bytes of each CLOUDFORMATION or TERRAFORM mapping file. Defaults to the ' \
+                        'STARTLEFT_MAPPING_MAX_SIZE environment variable, if set.'
+
+IAC_STREAMING_NAME = '--streaming/--no-streaming'
+IAC_STREAMING_DESC = 'Processes the CLOUDFORMATION or TERRAFORM files one by one to keep the memory bounded. ' \
+                     'Defaults to the STARTLEFT_IAC_STREAMING environment variable, if set.'
+
+CFT_NESTED_STACKS_NAME = '--nested-stacks/--no-nested-stacks'
+CFT_NESTED_STACKS_DESC = 'Links each AWS::CloudFormation::Stack of the CLOUDFORMATION files to the file named in its ' \
+                         'TemplateURL, so its resources get the logical id of the stack in _parentStack. Defaults to ' \
+                         'the STARTLEFT_CFT_NESTED_STACKS environment variable, if set.'
+
 OTM_INPUT_FILE_NAME = '--otm-file'
 OTM_INPUT_FILE_SHORTNAME = '-o'
 OTM_INPUT_FILE_DESC = 'OTM input file.'
@@ -1,3 +1,4 @@
+import os
 import typing
 from unittest.mock import MagicMock
 from unittest.mock import patch
@@ -47,6 +48,46 @@ class TestApiIac:
         # THEN a response with HTTP status 201 is returned
         assert response.status_code == 201
 
+    @patch.dict(os.environ, {'STARTLEFT_IAC_MAX_SIZE': '52428800', 'STARTLEFT_IAC_STREAMING': 'true'})
+    @patch('slp_base.slp_base.otm_processor.OTMProcessor')
+    @patch('slp_base.slp_base.provider_resolver.ProviderResolver.get_processor')
+    def test_api_iac_controller_processor_options(self, mock_get_processor, mock_otm_processor):
+        # GIVEN the options of the IaC processors in the environment
+        # AND a mocked valid file of any provider
+        valid_iac_file = MagicMock(filename='valid_iac_file', content_type='application/json',
+                                   file=MagicMock(spec=typing.BinaryIO))
+
+        # AND any mocked mapping file
+        valid_mapping_file = MagicMock(filename='valid_mapping_file', content_type='application/json',
+                                       file=MagicMock(spec=typing.BinaryIO))
+
+        # WHEN the POST /iac endpoint is called with iac params
+        mock_provider_processor_result(mock_otm_processor, mock_get_processor, OTM_SAMPLE)
+        controller.iac(valid_iac_file, TESTING_IAC_TYPE, 'id', 'name', valid_mapping_file, False, False, None)
+
+        # THEN the processor is created with the options in the environment
+        assert mock_get_processor.call_args.kwargs == {'max_size': 52428800, 'streaming': True}
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch('slp_base.slp_base.otm_processor.OTMProcessor')
+    @patch('slp_base.slp_base.provider_resolver.ProviderResolver.get_processor')
+    def test_api_iac_controller_nested_stacks(self, mock_get_processor, mock_otm_processor):
+        # GIVEN some mocked CloudFormation templates
+        iac_files = [MagicMock(filename=filename, content_type='application/json', file=MagicMock(spec=typing.BinaryIO))
+                     for filename in ['main.yaml', 'network.yaml']]
+
+        # AND any mocked mapping file
+        valid_mapping_file = MagicMock(filename='valid_mapping_file', content_type='application/json',
+                                       file=MagicMock(spec=typing.BinaryIO))
+
+        # WHEN the POST /iac endpoint is called with the nested stacks linked
+        mock_provider_processor_result(mock_otm_processor, mock_get_processor, OTM_SAMPLE)
+        controller.iac(iac_files, TESTING_IAC_TYPE, 'id', 'name', valid_mapping_file, False, False, True)
+
+        # THEN the processor is created with the names of the uploaded templates
+        assert mock_get_processor.call_args.kwargs == {'nested_stacks': True,
+                                                       'source_names': ['main.yaml', 'network.yaml']}
+
     @patch('slp_base.slp_base.otm_processor.OTMProcessor')
     @patch('slp_base.slp_base.provider_resolver.ProviderResolver.get_processor')
     def test_api_iac_controller_on_loading_iac_error(self, mock_get_processor, mock_otm_processor):
@@ -0,0 +1,93 @@
+import os
+from unittest.mock import patch
+
+from pytest import mark, param, raises
+
+from slp_base import IacType
+from startleft.startleft.iac_options import get_iac_processor_options, IAC_MAX_SIZE_ENVVAR, \
+    MAPPING_MAX_SIZE_ENVVAR, IAC_STREAMING_ENVVAR, CFT_NESTED_STACKS_ENVVAR
+
+ENVIRONMENT = {IAC_MAX_SIZE_ENVVAR: '52428800', MAPPING_MAX_SIZE_ENVVAR: '1048576', IAC_STREAMING_ENVVAR: 'true'}
+
+
+class TestIacOptions:
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_no_options(self):
+        # GIVEN no options, neither given nor in the environment
+        # WHEN the options of the processor are got
+        # THEN the processor keeps its defaults
+        assert get_iac_processor_options(IacType.TERRAFORM) == {}
+
+    @mark.parametrize('iac_type', [IacType.CLOUDFORMATION, IacType.TERRAFORM, 'TERRAFORM'])
+    @patch.dict(os.environ, ENVIRONMENT, clear=True)
+    def test_options_from_environment(self, iac_type):
+        # GIVEN the options in the environment
+        # WHEN the options of the processor are got
+        options = get_iac_processor_options(iac_type)
+
+        # THEN they are taken from the environment
+        assert options == {'max_size': 52428800, 'mapping_max_size': 1048576, 'streaming': True}
+
+    @patch.dict(os.environ, ENVIRONMENT, clear=True)
+    def test_given_options_override_environment(self):
+        # GIVEN the options in the environment
+        # WHEN the options of the processor are got with some given options
+        options = get_iac_processor_options(IacType.CLOUDFORMATION, max_size=1024, streaming=False)
+
+        # THEN the given options are used instead of the ones in the environment
+        assert options == {'max_size': 1024, 'mapping_max_size': 1048576, 'streaming': False}
+
+    @patch.dict(os.environ, ENVIRONMENT, clear=True)
+    def test_not_configurable_iac_type(self):
+        # GIVEN an IaC type whose processor does not accept the options
+        # WHEN the options of the processor are got
+        # THEN there are none
+        assert get_iac_processor_options(IacType.TFPLAN, max_size=1024) == {}
+
+    @patch.dict(os.environ, ENVIRONMENT, clear=True)
+    @mark.parametrize('iac_type', ['', 'UNKNOWN'])
+    def test_unknown_iac_type(self, iac_type):
+        # GIVEN an IaC type that is not known, which is left to the provider resolver to reject
+        # WHEN the options of the processor are got
+        # THEN there are none
+        assert get_iac_processor_options(iac_type, max_size=1024) == {}
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_nested_stacks(self):
+        # GIVEN the file names of some CloudFormation templates
+        source_names = ['stacks/main.yaml', 'stacks/network.yaml']
+
+        # WHEN the options of the processor are got with the nested stacks linked
+        options = get_iac_processor_options(IacType.CLOUDFORMATION, nested_stacks=True, source_names=source_names)
+
+        # THEN the processor links them by the file names of the templates
+        assert options == {'nested_stacks': True, 'source_names': source_names}
+
+    @mark.parametrize('iac_type,environment,nested_stacks', [
+        param(IacType.CLOUDFORMATION, {CFT_NESTED_STACKS_ENVVAR: 'true'}, None, id='from environment'),
+        param(IacType.CLOUDFORMATION, {CFT_NESTED_STACKS_ENVVAR: 'true'}, False, id='disabled'),
+        param(IacType.TERRAFORM, {}, True, id='not cloudformation'),
+    ])
+    def test_nested_stacks_environment(self, iac_type, environment, nested_stacks):
+        # GIVEN the nested stacks option in the environment
+        with patch.dict(os.environ, environment, clear=True):
+            # WHEN the options of the processor are got
+            options = get_iac_processor_options(iac_type, nested_stacks=nested_stacks, source_names=['main.yaml'])
+
+        # THEN the nested stacks are linked only for CloudFormation when enabled
+        expected = iac_type == IacType.CLOUDFORMATION and nested_stacks is not False
+        assert options == ({'nested_stacks': True, 'source_names': ['main.yaml']} if expected else {})
+
+    @mark.parametrize('environment', [
+        param({IAC_MAX_SIZE_ENVVAR: '1MB'}, id='size not a number'),
+        param({MAPPING_MAX_SIZE_ENVVAR: '0'}, id='size not positive'),
+        param({IAC_STREAMING_ENVVAR: 'maybe'}, id='streaming not a flag'),
+    ])
+    def test_invalid_environment(self, environment):
+        # GIVEN an invalid option in the environment
+        with patch.dict(os.environ, environment, clear=True):
+            # WHEN the options of the processor are got
+            # THEN a ValueError is raised
+            with raises(ValueError):
+                get_iac_processor_options(IacType.TERRAFORM)
@@ -11,10 +11,13 @@ from tests.resources import test_resource_paths
 # mappings
 CLOUDFORMATION_MAPPING = test_resource_paths.default_cloudformation_mapping
 CLOUDFORMATION_WRONG_MAPPING = test_resource_paths.cloudformation_malformed_mapping_wrong_id
+CLOUDFORMATION_NESTED_STACKS_MAPPING = test_resource_paths.cloudformation_nested_stacks_mapping
 # IaC files
 CLOUDFORMATION_FOR_MAPPING_TESTS = test_resource_paths.cloudformation_for_mappings_tests_json
 CLOUDFORMATION_UNKNOWN_RESOURCE = test_resource_paths.cloudformation_unknown_resource
 CLOUDFORMATION_INVALID_FILE_SIZE = test_resource_paths.cloudformation_invalid_size
+CLOUDFORMATION_NESTED_STACKS_MAIN = test_resource_paths.cloudformation_nested_stacks_main
+CLOUDFORMATION_NESTED_STACKS_NETWORK = test_resource_paths.cloudformation_nested_stacks_network
 # otm
 OTM_CFT_FOR_MAPPING_TESTS = test_resource_paths.cloudformation_for_mappings_tests_json_otm_expected
 OTM_EMPTY_FILE = test_resource_paths.otm_empty_file_cloudformation_example
@@ -58,6 +61,45 @@ class TestCliParseIaCCloudformation:
             result, expected = validate_and_compare_otm(otm, OTM_CFT_FOR_MAPPING_TESTS, excluded_regex)
             assert result == expected
 
+    @mark.parametrize('nested_stacks_option,expected_parent', [
+        ('--nested-stacks', {'component': 'b61d6911-338d-46a8-9f39-8dcd24abfe91.networkstack'}),
+        ('--no-nested-stacks', {'trustZone': 'b61d6911-338d-46a8-9f39-8dcd24abfe91'})])
+    def test_parse_cloudformation_nested_stacks(self, nested_stacks_option, expected_parent):
+        """
+        Parsing a Cloudformation file with a nested stack whose template is another of the parsed files
+        """
+        runner = CliRunner()
+        output_file_name = "output-file.otm"
+
+        with runner.isolated_filesystem():
+            # Given a list of arguments with
+            args = [
+                # a valid IaC type
+                '--iac-type', "CLOUDFORMATION",
+                #   and a mapping file placing the components inside the stack that created them
+                '--default-mapping-file', CLOUDFORMATION_NESTED_STACKS_MAPPING,
+                #   and a valid project name
+                '--project-name', "project-name",
+                #   and a valid project id
+                '--project-id', "project-id",
+                #   and a valid output file name
+                '--output-file', output_file_name,
+                #   and the nested stacks linked or not
+                nested_stacks_option,
+                #   and the main file and the template of its nested stack
+                CLOUDFORMATION_NESTED_STACKS_MAIN, CLOUDFORMATION_NESTED_STACKS_NETWORK]
+
+            # When parsing
+            result = runner.invoke(parse_any, args)
+
+            # Then validator OTM file is generated
+            assert result.exit_code == 0
+            # and the components of the nested template are inside the stack only when the nested stacks are linked
+            otm = OTMFileLoader().load(output_file_name)
+            parents = {component['name']: component['parent'] for component in otm['components']}
+            assert parents['VPC'] == expected_parent
+            assert parents['Bucket'] == expected_parent
+
     def test_parse_cloudformation_unknown_resources(self):
         """
         Parsing Cloudformation file wih unknown resources
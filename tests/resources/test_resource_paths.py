@@ -32,10 +32,13 @@ cloudformation_multiple_files_networks = f'{path}/cloudformation/cloudformation_
 cloudformation_multiple_files_resources = f'{path}/cloudformation/cloudformation_multiple_files_resources.json'
 cloudformation_ref_full_syntax = f'{path}/cloudformation/cloudformation_ref_full_syntax.yaml'
 cloudformation_ref_short_syntax = f'{path}/cloudformation/cloudformation_ref_short_syntax.yaml'
+cloudformation_nested_stacks_main = f'{path}/cloudformation/cloudformation_nested_stacks_main.yaml'
+cloudformation_nested_stacks_network = f'{path}/cloudformation/cloudformation_nested_stacks_network.yaml'
 # mapping
 default_cloudformation_mapping = f'{path}/cloudformation/cloudformation_mapping.yaml'
 cloudformation_mapping_component_without_parent = f'{path}/cloudformation/cloudformation_mapping_component_without_parent.yaml'
 cloudformation_mapping_all_functions = f'{path}/cloudformation/cloudformation_mapping_all_functions.yaml'
+cloudformation_nested_stacks_mapping = f'{path}/cloudformation/cloudformation_nested_stacks_mapping.yaml'
 # expected otm results
 cloudformation_for_mappings_tests_json_otm_expected = f'{path}/cloudformation/cloudformation_for_mappings_tests.otm'
 